@@ -3,16 +3,22 @@ FastAPI application for events and deals
 Provides REST endpoints to access scraped data
 """
 from fastapi import FastAPI, Depends, HTTPException, Query, BackgroundTasks
+from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
+import asyncio
 import json
 
 from database import get_db, Event, Deal, init_db
 from scraper_manager import ScraperManager
 from scheduler import start_scheduler, stop_scheduler, get_scheduler_status
+from image_pipeline import get_image_store
+import config
+import os
+import re
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -305,6 +311,22 @@ async def get_combined_events():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading combined events: {str(e)}")
 
+# Event image thumbnails (content-addressed, so they never change)
+@app.get("/images/{digest}/{width}")
+async def get_image(digest: str, width: int):
+    """Serve a stored thumbnail with long-lived cache headers"""
+    if not re.fullmatch(r'[0-9a-f]{64}', digest) or width not in config.IMAGE_SIZES:
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    store = get_image_store()
+    path = store.path(digest, width)
+    if not await asyncio.to_thread(os.path.exists, path):
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    await asyncio.to_thread(store.touch, digest)
+    return FileResponse(path, media_type='image/jpeg',
+                        headers={'Cache-Control': 'public, max-age=31536000, immutable'})
+
 # Health check
 @app.get("/health")
 async def health_check():
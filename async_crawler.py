@@ -0,0 +1,151 @@
+"""
+Asyncio crawler for detail pages that don't need a browser
+Pages are taken from a priority frontier and fetched concurrently with
+aiohttp, within the per-host budget of the shared rate limiter, with
+timeouts and retries. Each page is parsed by its scraper's
+parse_detail_html(), so records are the same ones fetch_detail() returns.
+"""
+import asyncio
+import itertools
+import config
+from http_fetcher import DEFAULT_HEADERS, LXML_AVAILABLE, parse_html
+from page_cache import body_hash, get_page_cache
+from rate_limiter import get_rate_limiter
+from retry_policy import RETRYABLE_STATUSES, backoff_delay, is_retryable
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except:
+    AIOHTTP_AVAILABLE = False
+
+class AsyncCrawler:
+    """
+    Concurrent HTTP detail-page crawler
+    
+    add() pages with the scraper that parses them, then run() the frontier.
+    Lower priorities are fetched first; pages of equal priority in the order
+    they were added.
+    """
+    
+    def __init__(self, concurrency=None, timeout=config.TIMEOUT, retries=config.RETRY_ATTEMPTS,
+                 throttle=None, cache=None):
+        self.concurrency = concurrency or config.CRAWL_CONCURRENCY
+        self.timeout = timeout
+        self.retries = max(retries, 1)
+        self.throttle = throttle or get_rate_limiter()
+        self.cache = cache if cache is not None else get_page_cache()
+        self._frontier = []
+        self._order = itertools.count()
+        self.errors = {}
+    
+    def add(self, url, scraper, priority=0):
+        """Queue a detail page to be parsed by scraper.parse_detail_html()"""
+        self._frontier.append((priority, next(self._order), url, scraper))
+    
+    def run(self, on_result=None):
+        """
+        Crawl the frontier
+        
+        Args:
+            on_result: Optional callback(url, record), called as each page finishes
+        
+        Returns:
+            Dict of url -> record, with None where the page failed or came up
+            short of its scraper's required fields
+        """
+        return asyncio.run(self._crawl(on_result))
+    
+    async def _crawl(self, on_result):
+        queue = asyncio.PriorityQueue()
+        for item in self._frontier:
+            queue.put_nowait(item)
+        self._frontier = []
+        
+        results = {}
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        
+        async with aiohttp.ClientSession(headers=DEFAULT_HEADERS, connector=connector, timeout=timeout) as session:
+            async def worker():
+                while True:
+                    try:
+                        _, _, url, scraper = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    
+                    results[url] = await self._fetch_record(session, url, scraper)
+                    if on_result:
+                        on_result(url, results[url])
+            
+            workers = min(self.concurrency, queue.qsize())
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        
+        return results
+    
+    async def _fetch_record(self, session, url, scraper):
+        """Fetch and parse one page, reusing the cached record when it's unchanged"""
+        try:
+            entry = self.cache.get(url) if self.cache else None
+            html, status, headers = await self._get(session, url, self.cache.validators(entry) if self.cache else {})
+            
+            if status == 304 and entry:
+                html = entry['body']
+            if html is None:
+                return None
+            
+            if self.cache:
+                if status == 304 or (entry and entry['body_hash'] == body_hash(html)):
+                    self.cache.touch(url)
+                    if entry['record'] is not None and scraper.has_required_fields(entry['record']):
+                        return entry['record']
+                else:
+                    self.cache.store(url, html, etag=headers.get('ETag'), last_modified=headers.get('Last-Modified'))
+            
+            # Parsing runs off the event loop so fetches keep flowing
+            record = await asyncio.to_thread(lambda: scraper.parse_detail_html(url, parse_html(html, base_url=url)))
+            if not scraper.has_required_fields(record):
+                return None
+            
+            if self.cache:
+                self.cache.store_record(url, record)
+            return record
+        except Exception as e:
+            print(f"  ✗ Error crawling {url}: {e}")
+            self.errors[url] = e
+            return None
+    
+    async def _get(self, session, url, headers):
+        """GET within the host's budget, retrying what retry_policy.is_retryable() allows (timeouts, connection errors, 429/5xx)"""
+        for attempt in range(1, self.retries + 1):
+            lease = await self._acquire(url)
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status in RETRYABLE_STATUSES and attempt < self.retries:
+                        raise aiohttp.ClientResponseError(response.request_info, response.history,
+                                                          status=response.status, message=response.reason)
+                    if response.status == 304:
+                        return None, 304, response.headers
+                    response.raise_for_status()
+                    return await response.text(errors='replace'), response.status, response.headers
+            except Exception as e:
+                # 403/404/410 and other final answers are not retried
+                if attempt >= self.retries or not is_retryable(e):
+                    raise
+            finally:
+                await asyncio.to_thread(self.throttle.release, lease)
+            
+            await asyncio.sleep(backoff_delay(attempt))
+    
+    async def _acquire(self, url):
+        # The limiter's SQLite transactions can wait on other processes' locks,
+        # so they run in a thread instead of blocking every fetch on the loop
+        while True:
+            lease, wait = await asyncio.to_thread(self.throttle.try_acquire, url)
+            if lease:
+                return lease
+            await asyncio.sleep(wait)
+
+def crawl_available():
+    """Whether the asyncio crawler can run here"""
+    return config.ASYNC_CRAWL and AIOHTTP_AVAILABLE and LXML_AVAILABLE
@@ -6,6 +6,7 @@ import json
 import os
 from datetime import datetime, timedelta
 import re
+from date_parser import parse_date as parse_date_text
 
 def load_json_file(filepath):
     """Load a JSON file"""
@@ -120,35 +121,9 @@ def parse_date(date_str):
         future_date = datetime.now() + timedelta(days=30)
         return f"new Date('{future_date.strftime('%Y-%m-%d')}')"
     
-    try:
-        # Try to extract year
-        year_match = re.search(r'20\d{2}', str(date_str))
-        if year_match:
-            year = year_match.group()
-            
-            # Try to extract month
-            month_map = {
-                'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04',
-                'may': '05', 'jun': '06', 'jul': '07', 'aug': '08',
-                'sep': '09', 'oct': '10', 'nov': '11', 'dec': '12',
-                'ιαν': '01', 'φεβ': '02', 'μαρ': '03', 'απρ': '04',
-                'μαΐ': '05', 'ιουν': '06', 'ιουλ': '07', 'αυγ': '08',
-                'σεπ': '09', 'οκτ': '10', 'νοε': '11', 'δεκ': '12'
-            }
-            
-            month = '01'
-            for month_name, month_num in month_map.items():
-                if month_name in str(date_str).lower():
-                    month = month_num
-                    break
-            
-            # Try to extract day
-            day_match = re.search(r'\b(\d{1,2})\b', str(date_str))
-            day = day_match.group(1).zfill(2) if day_match else '01'
-            
-            return f"new Date('{year}-{month}-{day}')"
-    except:
-        pass
+    date = parse_date_text(date_str)
+    if date:
+        return f"new Date('{date}')"
     
     # Default to 30 days from now
     future_date = datetime.now() + timedelta(days=30)
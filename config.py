@@ -6,10 +6,67 @@ load_dotenv()
 # Chrome settings
 CHROME_DRIVER_PATH = os.getenv('CHROME_DRIVER_PATH', 'auto')
 HEADLESS_MODE = os.getenv('HEADLESS_MODE', 'False').lower() == 'true'
+# Resolved chromedriver path and versions, reused until a binary changes
+DRIVER_CACHE_FILE = os.getenv('DRIVER_CACHE_FILE', '.chromedriver_cache.json')
+# Profile copied into every session (first-run prompts off, consent cookies); empty for a fresh profile
+CHROME_PROFILE_TEMPLATE = os.getenv('CHROME_PROFILE_TEMPLATE', '.chrome_profile_template')
+DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', 1))
+# Lean mode blocks heavy resources and trackers and uses the 'eager' page-load strategy
+LEAN_MODE = os.getenv('LEAN_MODE', 'False').lower() == 'true'
+LEAN_BLOCK_TYPES = [t.strip() for t in os.getenv('LEAN_BLOCK_TYPES', 'image,font,media,stylesheet').split(',') if t.strip()]
+USER_AGENT = os.getenv('USER_AGENT', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36')
 
 # Scraping settings
 TIMEOUT = int(os.getenv('TIMEOUT', 10))
 RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', 3))
+RETRY_BACKOFF = float(os.getenv('RETRY_BACKOFF', 1.0))  # First retry waits up to this many seconds, doubling after
+RETRY_BACKOFF_MAX = float(os.getenv('RETRY_BACKOFF_MAX', 30))
+# Consecutive failed pages after which the rest of a source is skipped for the run (0 = never)
+CIRCUIT_BREAKER_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_THRESHOLD', 5))
+DETAIL_WORKERS = int(os.getenv('DETAIL_WORKERS', 1))  # Detail pages scraped in parallel per source
+REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', 0.5))  # Minimum seconds between requests to one host
+MAX_REQUESTS_PER_HOST = int(os.getenv('MAX_REQUESTS_PER_HOST', 4))
+# Per-host politeness shared by all threads and processes: requests per second,
+# burst size and requests in flight. Hosts are given without "www.".
+RATE_LIMITS = {
+    'default': {'rate': 1 / max(REQUEST_DELAY, 0.01), 'burst': 1, 'max_in_flight': MAX_REQUESTS_PER_HOST},
+    'allofgreeceone.culture.gov.gr': {'rate': 2, 'burst': 2, 'max_in_flight': 3},
+    'more.com': {'rate': 2, 'burst': 2, 'max_in_flight': 4},
+    'pigolampides.gr': {'rate': 1, 'burst': 2, 'max_in_flight': 2},
+    'visitgreece.gr': {'rate': 2, 'burst': 2, 'max_in_flight': 3},
+}
+# Take detail links from sitemap.xml (new or changed pages only) where a source supports it
+USE_SITEMAPS = os.getenv('USE_SITEMAPS', 'True').lower() == 'true'
+# Page listings through their recorded JSON endpoint over HTTP instead of the browser
+LISTING_REPLAY = os.getenv('LISTING_REPLAY', 'True').lower() == 'true'
+# Stored URLs seen more recently than this are not fetched again
+KNOWN_URL_STALE_DAYS = int(os.getenv('KNOWN_URL_STALE_DAYS', 7))
+# Crawl detail pages that don't need JavaScript concurrently with asyncio (needs aiohttp)
+ASYNC_CRAWL = os.getenv('ASYNC_CRAWL', 'True').lower() == 'true'
+CRAWL_CONCURRENCY = int(os.getenv('CRAWL_CONCURRENCY', 200))  # Fetches in flight across all hosts
+# Queue detail pages in a persistent frontier (scraped_data/frontier.db) so killed runs resume
+FRONTIER = os.getenv('FRONTIER', 'True').lower() == 'true'
+FRONTIER_BATCH = int(os.getenv('FRONTIER_BATCH', 50))  # Pages claimed (and saved) at a time
+# Load WordPress sources (Pigolampides) through their REST API, falling back to the browser
+WP_API = os.getenv('WP_API', 'True').lower() == 'true'
+# Read map markers (event links and coordinates) from the map's data instead of clicking each region
+MAP_DATA = os.getenv('MAP_DATA', 'True').lower() == 'true'
+# Read events from listing cards, opening detail pages only for new events or incomplete cards
+LISTING_FIRST = os.getenv('LISTING_FIRST', 'True').lower() == 'true'
+# Read schema.org JSON-LD / microdata / OpenGraph on detail pages before the selector heuristics
+STRUCTURED_DATA = os.getenv('STRUCTURED_DATA', 'True').lower() == 'true'
+PAGE_DEADLINE = int(os.getenv('PAGE_DEADLINE', 15))  # Hard limit in seconds for one page to become ready
 
 # Output settings
 OUTPUT_DIR = 'scraped_data'
+
+# Image thumbnails (under OUTPUT_DIR/images), served by the API
+IMAGE_PIPELINE = os.getenv('IMAGE_PIPELINE', 'True').lower() == 'true'
+IMAGE_SIZES = [int(w) for w in os.getenv('IMAGE_SIZES', '320,960').split(',') if w.strip()]  # Thumbnail widths
+IMAGE_QUALITY = int(os.getenv('IMAGE_QUALITY', 82))
+IMAGE_STORE_MAX_MB = int(os.getenv('IMAGE_STORE_MAX_MB', 500))
+
+# Page cache (under OUTPUT_DIR): unchanged detail pages of sources that need no JavaScript are revalidated instead of re-scraped
+PAGE_CACHE = os.getenv('PAGE_CACHE', 'True').lower() == 'true'
+PAGE_CACHE_MAX_MB = int(os.getenv('PAGE_CACHE_MAX_MB', 200))
+PAGE_CACHE_MAX_AGE_DAYS = int(os.getenv('PAGE_CACHE_MAX_AGE_DAYS', 14))
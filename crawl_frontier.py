@@ -0,0 +1,188 @@
+"""
+Persistent crawl frontier shared by all scrapers
+Detail pages are queued per source in a SQLite file under OUTPUT_DIR with
+their state (pending, in_progress, done, failed), attempts, last error and
+fetch time; finished pages keep their record. Pages are claimed in batches
+inside IMMEDIATE transactions, so several worker processes can share one
+queue, and a killed run resumes with the pages it hadn't finished while
+the ones it had are returned from the stored records.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import config
+
+FRONTIER_FILE = os.path.join(config.OUTPUT_DIR, 'frontier.db')
+
+# Claims older than this are handed out again (e.g. the worker was killed)
+LEASE_TIMEOUT = 600
+
+class CrawlFrontier:
+    """
+    Queue of detail pages per source, with one open run per source
+    
+    A run starts with begin() and ends with end() once nothing is left to
+    fetch. Pages finished or given up on before the run started are queued
+    again by add(); ones finished within the open run are kept. A failed
+    attempt puts the page back in the queue for the next pass: claim() and
+    end() with since leave out pages attempted after that time.
+    """
+    
+    def __init__(self, path=FRONTIER_FILE, max_attempts=None):
+        self.path = path
+        self.max_attempts = max_attempts or config.RETRY_ATTEMPTS
+        self._local = threading.local()
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT,
+                source TEXT,
+                state TEXT,
+                attempts INTEGER DEFAULT 0,
+                last_error TEXT,
+                fetched_at REAL,
+                lease_until REAL,
+                record TEXT,
+                PRIMARY KEY (source, url)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS frontier_state ON frontier (source, state)")
+        conn.execute("CREATE TABLE IF NOT EXISTS runs (source TEXT PRIMARY KEY, started_at REAL)")
+    
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+    
+    def _transaction(self, statements):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = statements(conn)
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def begin(self, source):
+        """Open a run for the source, or join the one still open; returns its start time"""
+        def statements(conn):
+            conn.execute("INSERT OR IGNORE INTO runs (source, started_at) VALUES (?, ?)", (source, time.time()))
+            return conn.execute("SELECT started_at FROM runs WHERE source = ?", (source,)).fetchone()[0]
+        return self._transaction(statements)
+    
+    def add(self, source, urls):
+        """Queue pages; ones finished or failed before the open run started are queued again"""
+        started_at = self.begin(source)
+        self._transaction(lambda conn: conn.executemany("""
+            INSERT INTO frontier (url, source, state, attempts) VALUES (?, ?, 'pending', 0)
+            ON CONFLICT (source, url) DO UPDATE SET
+                state = 'pending', attempts = 0, last_error = NULL, lease_until = NULL, record = NULL
+            WHERE frontier.state IN ('done', 'failed') AND COALESCE(frontier.fetched_at, 0) < ?
+        """, [(url, source, started_at) for url in urls]))
+    
+    def claim(self, source, limit, since=None):
+        """
+        Take up to limit pending pages (or abandoned claims) of the source
+        
+        With since, pages whose last attempt failed after that time (i.e.
+        in the current pass) are left for the next one.
+        """
+        def statements(conn):
+            now = time.time()
+            urls = [row[0] for row in conn.execute("""
+                SELECT url FROM frontier
+                WHERE source = ? AND ((state = 'pending' AND COALESCE(fetched_at, 0) < ?)
+                                      OR (state = 'in_progress' AND lease_until < ?))
+                ORDER BY rowid LIMIT ?
+            """, (source, since or now, now, limit))]
+            conn.executemany("UPDATE frontier SET state = 'in_progress', lease_until = ? WHERE source = ? AND url = ?",
+                             [(now + LEASE_TIMEOUT, source, url) for url in urls])
+            return urls
+        return self._transaction(statements)
+    
+    def complete(self, source, url, record):
+        """Store a finished page's record"""
+        self._connection().execute(
+            "UPDATE frontier SET state = 'done', fetched_at = ?, lease_until = NULL, last_error = NULL, record = ? "
+            "WHERE source = ? AND url = ?",
+            (time.time(), json.dumps(record, ensure_ascii=False, default=str), source, url)
+        )
+    
+    def fail(self, source, url, error):
+        """Record a failed attempt; the page is retried by later passes until max_attempts"""
+        self._connection().execute("""
+            UPDATE frontier SET
+                attempts = attempts + 1,
+                state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END,
+                last_error = ?, fetched_at = ?, lease_until = NULL
+            WHERE source = ? AND url = ?
+        """, (self.max_attempts, str(error)[:500], time.time(), source, url))
+    
+    def release(self, source, urls):
+        """Hand claimed pages back without counting an attempt"""
+        self._connection().executemany("UPDATE frontier SET state = 'pending', lease_until = NULL WHERE source = ? AND url = ?",
+                                       [(source, url) for url in urls])
+    
+    def records(self, source, urls=None):
+        """Records of pages finished in the open run, as url -> record"""
+        conn = self._connection()
+        row = conn.execute("SELECT started_at FROM runs WHERE source = ?", (source,)).fetchone()
+        if not row:
+            return {}
+        
+        records = {url: json.loads(record) for url, record in conn.execute(
+            "SELECT url, record FROM frontier WHERE source = ? AND state = 'done' AND fetched_at >= ?",
+            (source, row[0])
+        )}
+        if urls is not None:
+            records = {url: records[url] for url in urls if url in records}
+        return records
+    
+    def unfinished(self, source):
+        """URLs of the source still pending or claimed"""
+        return [row[0] for row in self._connection().execute(
+            "SELECT url FROM frontier WHERE source = ? AND state IN ('pending', 'in_progress') ORDER BY rowid",
+            (source,)
+        )]
+    
+    def end(self, source, since=None):
+        """
+        Close the source's run once no page is left to fetch; returns whether it was closed
+        
+        With since, pages that failed after that time don't keep the run
+        open: they stay pending, with their attempts, for the next run.
+        """
+        def statements(conn):
+            left = conn.execute("""
+                SELECT COUNT(*) FROM frontier
+                WHERE source = ? AND (state = 'in_progress' OR (state = 'pending' AND COALESCE(fetched_at, 0) < ?))
+            """, (source, since or time.time())).fetchone()[0]
+            if not left:
+                conn.execute("DELETE FROM runs WHERE source = ?", (source,))
+            return not left
+        return self._transaction(statements)
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_frontier():
+    """The crawl frontier shared by all scrapers in this process, or None when disabled"""
+    global _shared
+    
+    if not config.FRONTIER:
+        return None
+    
+    with _shared_lock:
+        if _shared is None:
+            _shared = CrawlFrontier(path=FRONTIER_FILE)
+        return _shared
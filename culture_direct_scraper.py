@@ -4,6 +4,7 @@ Goes directly to the events listing page
 """
 
 from scraper_base import BaseScraper
+from url_canon import canonical_links
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -86,15 +87,14 @@ class CultureDirectScraper(BaseScraper):
             for idx, link in enumerate(event_links):
                 try:
                     print(f"[{idx + 1}/{len(event_links)}] {link[:70]}...")
-                    event_details = self.scrape_event_detail(link)
+                    with self.throttle.slot(link):
+                        event_details = self.scrape_event_detail(link)
                     
                     if event_details:
                         all_events.append(event_details)
                         self.scraped_urls.add(link)
                         print(f"  ✓ {event_details.get('title', 'N/A')[:60]}")
                     
-                    time.sleep(0.5)
-                    
                 except Exception as e:
                     print(f"  ✗ Error: {e}")
                     continue
@@ -187,7 +187,7 @@ class CultureDirectScraper(BaseScraper):
         except Exception as e:
             print(f"Error finding links: {e}")
         
-        return links
+        return canonical_links(links)
     
     def scroll_and_collect(self, max_additional):
         """Scroll page and collect more event links"""
@@ -357,19 +357,6 @@ class CultureDirectScraper(BaseScraper):
             print(f"    Error details: {e}")
             return None
     
-    def find_text_by_selectors(self, selectors):
-        """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 1:
-                        return text
-            except:
-                continue
-        return None
-    
     def save_events(self, events, filename='culture_gov_direct_events.json'):
         """Save events to JSON file"""
         os.makedirs(config.OUTPUT_DIR, exist_ok=True)
@@ -4,23 +4,42 @@ Properly extracts data from event pages
 """
 
 from scraper_base import BaseScraper
-from selenium.webdriver.common.by import By
+from date_parser import find_date
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import json
 import os
-import time
 import config
 
 class CultureFinalScraper(BaseScraper):
-    def __init__(self, headless=False):
-        super().__init__(headless)
+    # Event pages render their body after load, so also wait for the network to settle
+    ready_selectors = ('h1',)
+    network_idle_ms = 500
+    
+    # The "Read more" button is only clicked when it has layout boxes, which
+    # depends on the stylesheets hiding the controls that aren't shown
+    lean_allow = ('stylesheet',)
+    
+    # On Demand event pages listed in the site's sitemaps
+    sitemap_url_pattern = r'/on-demand/[^/?#]+'
+    
+    detail_spec = {
+        'title': {'selectors': ['h1'], 'min_length': 4},
+        'page_title': {'selectors': ['title']},
+        'content': {'selectors': ['p, div, span, h2, h3, h4'], 'all': True, 'limit': 20, 'min_length': 11},
+        'images': {'selectors': ['img'], 'attr': 'src', 'all': True, 'scan_limit': 10,
+                   'exclude': ['logo', 'icon']},
+        'full_text': {'selectors': ['body']},
+    }
+    
+    def __init__(self, headless=False, driver_pool=None):
+        super().__init__(headless, driver_pool)
         self.base_url = "https://allofgreeceone.culture.gov.gr"
         self.scraped_urls = set()
     
-    def scrape_all_events(self, max_events=968):
-        """Scrape all events"""
-        self.setup_driver()
+    def scrape_all_events(self, max_events=968, known_urls=None):
+        """Scrape all events (stored ones seen recently, per known_urls, are skipped)"""
+        # The browser is started on first use: sitemap or replayed listings need none
         all_events = []
         event_links = set()
         
@@ -28,150 +47,54 @@ class CultureFinalScraper(BaseScraper):
             # Go to On Demand page
             url = f"{self.base_url}/en/on-demand/"
             print(f"Navigating to {url}...")
-            self.driver.get(url)
-            time.sleep(5)
             
-            # Scroll and click "Read more" to load all events
+            # Click "Read more" until no new events appear, collecting links as they load
+            # (or page through the recorded listing endpoint directly)
             print("\nLoading all events...")
-            clicks = 0
-            for i in range(50):  # Try up to 50 times
-                # Scroll down
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                # Count current links before clicking
-                current_links = len(self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/on-demand/"]'))
-                
-                # Try to click "Read more" button
-                try:
-                    # Try multiple selectors for the button
-                    button_found = False
-                    
-                    for selector in [
-                        "//button[contains(text(), 'Read more')]",
-                        "//a[contains(text(), 'Read more')]",
-                        "//button[contains(@class, 'load')]",
-                        "//button[contains(@class, 'more')]",
-                        "//*[contains(text(), 'Read more')]"
-                    ]:
-                        try:
-                            read_more = self.driver.find_element(By.XPATH, selector)
-                            
-                            if read_more.is_displayed() and read_more.is_enabled():
-                                print(f"  Click {clicks + 1}: Found button, clicking...")
-                                
-                                # Try to click
-                                try:
-                                    read_more.click()
-                                except:
-                                    # Try JavaScript click
-                                    self.driver.execute_script("arguments[0].click();", read_more)
-                                
-                                clicks += 1
-                                button_found = True
-                                time.sleep(3)
-                                
-                                # Check if new links appeared
-                                new_links = len(self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/on-demand/"]'))
-                                print(f"    Links: {current_links} -> {new_links}")
-                                
-                                break
-                        except:
-                            continue
-                    
-                    if not button_found:
-                        print(f"  No more 'Read more' button found after {clicks} clicks")
-                        break
-                        
-                except Exception as e:
-                    print(f"  Error clicking button: {e}")
-                    break
-            
-            print(f"\nTotal clicks: {clicks}")
-            
-            # Wait a bit more for final content to load
-            time.sleep(3)
-            
-            # Now collect all event links
-            print("\nCollecting event links...")
-            
-            # Try multiple ways to find links
-            event_links_found = set()
-            
-            # Method 1: Find all links with /on-demand/ in href
-            links_method1 = self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/on-demand/"]')
-            print(f"  Method 1 (CSS selector): {len(links_method1)} links")
-            
-            for link in links_method1:
-                href = link.get_attribute('href')
-                # Event pages have format: .../en/on-demand/event-name
-                # Main page is: .../en/on-demand/
-                if (href and 
-                    href != f"{self.base_url}/en/on-demand/" and
-                    href != f"{self.base_url}/on-demand/" and
-                    not href.endswith('/on-demand/')):
-                    event_links_found.add(href)
-            
-            # Method 2: Get ALL links and filter
-            all_links = self.driver.find_elements(By.TAG_NAME, 'a')
-            print(f"  Method 2 (all links): {len(all_links)} total links on page")
-            
-            for link in all_links:
-                href = link.get_attribute('href')
-                
-                if (href and 
-                    self.base_url in href and
-                    '/on-demand/' in href and
-                    href != f"{self.base_url}/en/on-demand/" and
-                    href != f"{self.base_url}/on-demand/" and
-                    not href.endswith('/on-demand/')):
-                    event_links_found.add(href)
-            
-            event_links = list(event_links_found)
+            event_links = self.collect_listing_links(
+                url,
+                link_selector='a[href*="/on-demand/"]',
+                link_filter=self.is_event_link,
+                ready_selectors=['a[href*="/on-demand/"]'],
+                button_texts=['Read more'],
+                button_selectors=['button[class*="load"]', 'button[class*="more"]'],
+                max_items=max_events
+            )
             print(f"\nTotal unique event links: {len(event_links)}")
             
+            # Nothing new or changed in the sitemaps since the last run
+            if len(event_links) == 0 and self._sitemap:
+                print("No new or changed events in the sitemap")
+                return []
+            
             # If still no links, save page for debugging
             if len(event_links) == 0:
-                print("\n⚠ No links found! Saving page HTML for debugging...")
-                with open('debug_page.html', 'w', encoding='utf-8') as f:
-                    f.write(self.driver.page_source)
-                print("Saved to: debug_page.html")
-                
-                # Print some sample links for debugging
-                print("\nSample of ALL links on page:")
-                for i, link in enumerate(all_links[:20]):
-                    href = link.get_attribute('href')
-                    text = link.text.strip()[:40]
-                    print(f"  {i+1}. {href} | {text}")
+                print("\n⚠ No links found!")
+                if self.driver:
+                    print("Saving page HTML for debugging...")
+                    with open('debug_page.html', 'w', encoding='utf-8') as f:
+                        f.write(self.driver.page_source)
+                    print("Saved to: debug_page.html")
                 
                 return []
             
-            # Limit to max_events
-            event_links = list(event_links)[:max_events]
+            # Limit to max_events, leaving out recently seen events
+            event_links = self.skip_known(event_links, known_urls)[:max_events]
             
-            # Scrape each event
+            # Scrape each event (in parallel when DETAIL_WORKERS > 1)
+            event_links = [link for link in event_links if link not in self.scraped_urls]
             print(f"\nScraping {len(event_links)} events...\n")
             
-            for idx, link in enumerate(event_links):
-                if link in self.scraped_urls:
-                    continue
-                
-                try:
-                    print(f"[{idx + 1}/{len(event_links)}] {link.split('/')[-1][:50]}...")
-                    event = self.scrape_event(link)
-                    
-                    if event and event.get('title'):
-                        all_events.append(event)
-                        self.scraped_urls.add(link)
-                        print(f"  ✓ {event['title'][:60]}")
-                    else:
-                        print(f"  ✗ No data extracted")
-                    
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    print(f"  ✗ Error: {e}")
-                    continue
+            def report(idx, link, event):
+                print(f"[{idx + 1}/{len(event_links)}] {link.split('/')[-1][:50]}...")
+                if event and event.get('title'):
+                    self.scraped_urls.add(link)
+                    print(f"  ✓ {event['title'][:60]}")
+                else:
+                    print(f"  ✗ No data extracted")
+            
+            events = self.fetch_details(event_links, 'scrape_event', on_result=report)
+            all_events.extend(event for event in events if event and event.get('title'))
             
             print(f"\n{'='*60}")
             print(f"Successfully scraped {len(all_events)} events")
@@ -187,74 +110,46 @@ class CultureFinalScraper(BaseScraper):
         
         return all_events
     
+    def is_event_link(self, href):
+        """
+        Event pages have format: .../en/on-demand/event-name
+        Main page is: .../en/on-demand/
+        """
+        return bool(href and
+                    '/on-demand/' in href and
+                    not href.endswith('/on-demand/'))
+    
     def scrape_event(self, url):
         """Scrape a single event page"""
         try:
-            self.driver.get(url)
+            # Wait until the event content is rendered (bounded by the page deadline)
+            self.load_page(url)
             
-            # Wait for page to load
-            time.sleep(4)
+            # Parse one snapshot of the rendered page locally instead of
+            # querying every element over WebDriver
+            data = self.extract_detail_fields(self.detail_spec, doc=self.snapshot())
+            page_text = data.get('full_text') or ''
             
             event = {'url': url}
             
-            # Get the entire page text first
-            page_text = self.driver.find_element(By.TAG_NAME, 'body').text
-            
-            # Extract title - it's usually the first h1
-            try:
-                h1_elements = self.driver.find_elements(By.TAG_NAME, 'h1')
-                for h1 in h1_elements:
-                    text = h1.text.strip()
-                    if text and len(text) > 3:
-                        event['title'] = text
-                        break
-            except:
-                pass
-            
-            # If no title found, try other methods
-            if not event.get('title'):
-                # Try to get from page title
-                page_title = self.driver.title
+            # Title is usually the first h1, otherwise the page title
+            event['title'] = data.get('title')
+            if not event['title']:
+                page_title = data.get('page_title')
                 if page_title and '|' in page_title:
                     event['title'] = page_title.split('|')[0].strip()
                 else:
                     event['title'] = page_title
             
-            # Extract all visible text elements
-            try:
-                # Get all text from divs and paragraphs
-                text_elements = self.driver.find_elements(By.CSS_SELECTOR, 
-                    'p, div, span, h2, h3, h4')
-                
-                all_text = []
-                for elem in text_elements:
-                    text = elem.text.strip()
-                    if text and len(text) > 10 and text not in all_text:
-                        all_text.append(text)
-                
-                event['content'] = all_text[:20]  # First 20 text blocks
-            except:
-                event['content'] = []
+            event['content'] = data.get('content') or []  # First 20 text blocks
             
-            # Try to extract date patterns from text
-            import re
-            date_pattern = r'\d{1,2}[./]\d{1,2}[./]\d{2,4}'
-            dates_found = re.findall(date_pattern, page_text)
-            event['date'] = dates_found[0] if dates_found else None
+            # The structured start date if the page has one, otherwise the first date in the text
+            event['date'] = data.get('date') or find_date(page_text)[0]
+            event['end_date'] = data.get('end_date')
+            event['location'] = data.get('location')
+            event['price'] = data.get('price')
             
-            # Extract images
-            try:
-                images = []
-                img_elements = self.driver.find_elements(By.TAG_NAME, 'img')
-                
-                for img in img_elements[:10]:
-                    src = img.get_attribute('src')
-                    if src and 'logo' not in src.lower() and 'icon' not in src.lower():
-                        images.append(src)
-                
-                event['images'] = images
-            except:
-                event['images'] = []
+            event['images'] = data.get('images') or []
             
             # Store full page text for reference
             event['full_text'] = page_text[:3000]  # First 3000 chars
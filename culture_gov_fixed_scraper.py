@@ -4,6 +4,7 @@ URL: https://allofgreeceone.culture.gov.gr/en/
 """
 
 from scraper_base import BaseScraper
+from url_canon import canonical_links
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -117,15 +118,14 @@ class CultureGovFixedScraper(BaseScraper):
             for idx, link in enumerate(event_links):
                 try:
                     print(f"\n[{idx + 1}/{len(event_links)}] Scraping: {link[:70]}...")
-                    event_details = self.scrape_event_detail(link)
+                    with self.throttle.slot(link):
+                        event_details = self.scrape_event_detail(link)
                     
                     if event_details:
                         all_events.append(event_details)
                         self.scraped_urls.add(link)
                         print(f"  ✓ {event_details.get('title', 'N/A')[:60]}")
                     
-                    time.sleep(0.5)
-                    
                 except Exception as e:
                     print(f"  ✗ Error: {e}")
                     continue
@@ -183,7 +183,7 @@ class CultureGovFixedScraper(BaseScraper):
         except Exception as e:
             print(f"Error finding links: {e}")
         
-        return links
+        return canonical_links(links)
     
     def scrape_event_detail(self, url):
         """Scrape details from an event page"""
@@ -278,17 +278,8 @@ class CultureGovFixedScraper(BaseScraper):
             return None
     
     def find_text_by_selectors(self, selectors):
-        """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 2:
-                        return text
-            except:
-                continue
-        return None
+        """Try multiple selectors to find text (ignoring strings shorter than 3 chars)"""
+        return super().find_text_by_selectors(selectors, min_length=3)
     
     def save_events(self, events, filename='culture_gov_all_events.json'):
         """Save events to JSON file"""
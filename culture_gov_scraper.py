@@ -4,6 +4,7 @@ URL: https://allofgreeceone.culture.gov.gr/en/
 """
 
 from scraper_base import BaseScraper
+from url_canon import canonical_links
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -81,15 +82,14 @@ class CultureGovScraper(BaseScraper):
                 
                 try:
                     print(f"\n[{idx + 1}/{len(event_links)}] Scraping: {link[:80]}...")
-                    event_details = self.scrape_event_detail(link)
+                    with self.throttle.slot(link):
+                        event_details = self.scrape_event_detail(link)
                     
                     if event_details:
                         all_events.append(event_details)
                         self.scraped_urls.add(link)
                         print(f"  ✓ {event_details.get('title', 'N/A')[:60]}")
                     
-                    time.sleep(1)  # Be polite to the server
-                    
                 except Exception as e:
                     print(f"  ✗ Error: {e}")
                     continue
@@ -150,7 +150,7 @@ class CultureGovScraper(BaseScraper):
         except Exception as e:
             print(f"Error finding event links: {e}")
         
-        return links
+        return canonical_links(links)
     
     def load_next_page(self):
         """Try to load the next page of events"""
@@ -321,17 +321,8 @@ class CultureGovScraper(BaseScraper):
             return None
     
     def find_text_by_selectors(self, selectors):
-        """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 2:
-                        return text
-            except:
-                continue
-        return None
+        """Try multiple selectors to find text (ignoring strings shorter than 3 chars)"""
+        return super().find_text_by_selectors(selectors, min_length=3)
     
     def save_page_structure(self):
         """Save page HTML for debugging"""
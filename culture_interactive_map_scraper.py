@@ -1,10 +1,11 @@
 """
 Interactive map scraper for Greek Ministry of Culture
-Clicks on map regions to collect all 968 events
+Reads the map's markers (or clicks its regions) to collect all 968 events
 URL: https://allofgreeceone.culture.gov.gr/en/
 """
 
 from scraper_base import BaseScraper
+from map_markers import extract_markers
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -15,60 +16,58 @@ import time
 import config
 
 class CultureInteractiveMapScraper(BaseScraper):
-    def __init__(self, headless=False):
-        super().__init__(headless)
+    # The map is drawn once one of these exists (a single selector: every entry must match)
+    map_ready_selectors = ('.leaflet-container, .ol-viewport, .gm-style, svg, map area',)
+    
+    # Field spec for event pages, extracted with a single execute_script call
+    detail_spec = {
+        'title': {'selectors': ['h1.entry-title', 'h1', '.title', 'header h1'], 'min_length': 2},
+        'date': {'selectors': ['.event-date', '.date', 'time', '[class*="date"]'], 'min_length': 2},
+        'location': {'selectors': ['.event-location', '.location', '.venue', '[class*="location"]'], 'min_length': 2},
+        'description': {'selectors': ['.entry-content p, article p, .content p'], 'min_length': 51},
+        'category': {'selectors': ['.category a', '[rel="category tag"]', '[class*="category"]'], 'min_length': 2},
+        'organizer': {'selectors': ['.organizer', '.institution', '[class*="organizer"]'], 'min_length': 2},
+        'price': {'selectors': ['.price', '.admission', '[class*="price"]'], 'min_length': 2},
+        'images': {
+            'selectors': ['article img, .entry-content img, .content img'],
+            'attr': 'src', 'all': True, 'scan_limit': 5, 'exclude': ['logo']
+        },
+    }
+    
+    def __init__(self, headless=False, driver_pool=None):
+        super().__init__(headless, driver_pool)
         self.base_url = "https://allofgreeceone.culture.gov.gr/en/"
         self.scraped_urls = set()
         self.all_event_links = set()
+        self.coordinates = {}
     
     def scrape_all_events_from_map(self, max_events=968):
         """
-        Click on each region on the map to collect all events
+        Collect all events on the map, then scrape each one
+        
+        With MAP_DATA, every marker's event links and coordinates are read
+        from the map's data in one call; otherwise, or when that finds
+        nothing, each region on the map is clicked.
         """
         self.setup_driver()
         all_events = []
         
         try:
             print(f"Navigating to {self.base_url}...")
-            self.driver.get(self.base_url)
-            time.sleep(5)
-            
-            print("\nLooking for interactive map regions...")
+            self.load_page(self.base_url, ready_selectors=self.map_ready_selectors, network_idle_ms=500)
             
-            # Find all clickable map markers/regions
-            map_markers = self.find_map_markers()
-            
-            if not map_markers:
-                print("No map markers found. Trying alternative approach...")
-                return self.scrape_from_on_demand_page(max_events)
-            
-            print(f"Found {len(map_markers)} regions on the map")
-            
-            # Click on each marker to reveal events
-            for idx, marker in enumerate(map_markers):
-                try:
-                    print(f"\n{'='*60}")
-                    print(f"Region {idx + 1}/{len(map_markers)}")
-                    print(f"{'='*60}")
-                    
-                    # Click the marker
-                    self.click_marker(marker)
-                    time.sleep(2)
-                    
-                    # Collect event links from this region
-                    region_links = self.collect_visible_event_links()
-                    new_links = [link for link in region_links if link not in self.all_event_links]
-                    
-                    self.all_event_links.update(new_links)
-                    
-                    print(f"  Found {len(new_links)} new events (Total: {len(self.all_event_links)})")
-                    
-                    # Close any popup/modal if it appeared
-                    self.close_popup()
-                    
-                except Exception as e:
-                    print(f"  Error with region {idx + 1}: {e}")
-                    continue
+            if not (config.MAP_DATA and self.read_map_markers()):
+                print("\nLooking for interactive map regions...")
+                
+                # Find all clickable map markers/regions
+                map_markers = self.find_map_markers()
+                
+                if not map_markers:
+                    print("No map markers found. Trying alternative approach...")
+                    return self.scrape_from_on_demand_page(max_events)
+                
+                print(f"Found {len(map_markers)} regions on the map")
+                self.click_map_regions(map_markers)
             
             print(f"\n{'='*60}")
             print(f"Total unique event links: {len(self.all_event_links)}")
@@ -83,15 +82,16 @@ class CultureInteractiveMapScraper(BaseScraper):
             for idx, link in enumerate(event_links):
                 try:
                     print(f"[{idx + 1}/{len(event_links)}] {link[:70]}...")
-                    event_details = self.scrape_event_detail(link)
+                    with self.throttle.slot(link):
+                        event_details = self.scrape_event_detail(link)
                     
                     if event_details:
+                        if link in self.coordinates:
+                            event_details['latitude'], event_details['longitude'] = self.coordinates[link]
                         all_events.append(event_details)
                         self.scraped_urls.add(link)
                         print(f"  ✓ {event_details.get('title', 'N/A')[:60]}")
                     
-                    time.sleep(0.5)
-                    
                 except Exception as e:
                     print(f"  ✗ Error: {e}")
                     continue
@@ -110,6 +110,49 @@ class CultureInteractiveMapScraper(BaseScraper):
         
         return all_events
     
+    def read_map_markers(self):
+        """Add the event links (and coordinates) of every map marker, read in bulk; returns how many were found"""
+        try:
+            markers = extract_markers(self.driver, self.http, self.base_url,
+                                      link_filter=self.is_event_link, throttle=self.throttle)
+        except Exception as e:
+            print(f"  Could not read the map data: {e}")
+            return 0
+        
+        for marker in markers:
+            self.all_event_links.add(marker['url'])
+            self.coordinates.setdefault(marker['url'], (marker['lat'], marker['lng']))
+        
+        print(f"Found {len(markers)} events in the map data")
+        return len(markers)
+    
+    def click_map_regions(self, map_markers):
+        """Click each region on the map and collect the event links it reveals"""
+        for idx, marker in enumerate(map_markers):
+            try:
+                print(f"\n{'='*60}")
+                print(f"Region {idx + 1}/{len(map_markers)}")
+                print(f"{'='*60}")
+                
+                # Click the marker
+                self.click_marker(marker)
+                time.sleep(2)
+                
+                # Collect event links from this region
+                region_links = self.collect_visible_event_links()
+                new_links = [link for link in region_links if link not in self.all_event_links]
+                
+                self.all_event_links.update(new_links)
+                
+                print(f"  Found {len(new_links)} new events (Total: {len(self.all_event_links)})")
+                
+                # Close any popup/modal if it appeared
+                self.close_popup()
+                
+            except Exception as e:
+                print(f"  Error with region {idx + 1}: {e}")
+                continue
+    
     def find_map_markers(self):
         """Find all clickable markers on the map"""
         markers = []
@@ -179,28 +222,27 @@ class CultureInteractiveMapScraper(BaseScraper):
                 '[class*="event"] a'
             ]
             
-            for selector in selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    
-                    for element in elements:
-                        href = element.get_attribute('href')
-                        
-                        if (href and 
-                            self.base_url in href and
-                            '/on-demand/' in href and
-                            href.count('/') > 5):
-                            
-                            if href not in links:
-                                links.append(href)
-                except:
-                    continue
+            # All hrefs in one round-trip
+            hrefs = self.extract_fields({
+                'links': {'selectors': selectors, 'attr': 'href', 'all': True}
+            }).get('links', [])
+            
+            for href in hrefs:
+                if self.is_event_link(href) and href not in links:
+                    links.append(href)
         
         except Exception as e:
             print(f"Error collecting links: {e}")
         
         return links
     
+    def is_event_link(self, href):
+        """Whether a link points to an event page"""
+        return bool(href and
+                    self.base_url in href and
+                    '/on-demand/' in href and
+                    href.count('/') > 5)
+    
     def close_popup(self):
         """Close any popup or modal that might be open"""
         try:
@@ -260,101 +302,22 @@ class CultureInteractiveMapScraper(BaseScraper):
     def scrape_event_detail(self, url):
         """Scrape detailed information from an event page"""
         try:
-            self.driver.get(url)
-            time.sleep(2)
-            
-            event = {'url': url}
-            
-            # Extract title
-            event['title'] = self.find_text_by_selectors([
-                'h1.entry-title',
-                'h1',
-                '.title',
-                'header h1'
-            ])
+            self.load_page(url)
             
-            # Extract date
-            event['date'] = self.find_text_by_selectors([
-                '.event-date',
-                '.date',
-                'time',
-                '[class*="date"]'
-            ])
+            # Structured data first, then the selectors for whatever it didn't have
+            data = self.extract_detail_fields(self.detail_spec)
             
-            # Extract location
-            event['location'] = self.find_text_by_selectors([
-                '.event-location',
-                '.location',
-                '.venue',
-                '[class*="location"]'
-            ])
-            
-            # Extract description
-            desc_elements = self.driver.find_elements(By.CSS_SELECTOR, 
-                '.entry-content p, article p, .content p')
-            
-            description = None
-            for elem in desc_elements:
-                text = elem.text.strip()
-                if text and len(text) > 50:
-                    description = text
-                    break
-            event['description'] = description
-            
-            # Extract category
-            event['category'] = self.find_text_by_selectors([
-                '.category a',
-                '[rel="category tag"]',
-                '[class*="category"]'
-            ])
-            
-            # Extract organizer
-            event['organizer'] = self.find_text_by_selectors([
-                '.organizer',
-                '.institution',
-                '[class*="organizer"]'
-            ])
+            event = {'url': url}
+            for field in ['title', 'date', 'end_date', 'location', 'description', 'category', 'organizer', 'price']:
+                event[field] = data.get(field)
             
-            # Extract price
-            event['price'] = self.find_text_by_selectors([
-                '.price',
-                '.admission',
-                '[class*="price"]'
-            ])
-            
-            # Extract images
-            try:
-                images = []
-                img_elements = self.driver.find_elements(By.CSS_SELECTOR, 
-                    'article img, .entry-content img, .content img')
-                
-                for img in img_elements[:5]:
-                    src = img.get_attribute('src')
-                    if src and 'logo' not in src.lower():
-                        images.append(src)
-                
-                event['images'] = images
-            except:
-                event['images'] = []
+            event['images'] = data.get('images') or []
             
             return event if event['title'] else None
             
         except Exception as e:
             return None
     
-    def find_text_by_selectors(self, selectors):
-        """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 1:
-                        return text
-            except:
-                continue
-        return None
-    
     def save_events(self, events, filename='culture_gov_map_events.json'):
         """Save events to JSON file"""
         os.makedirs(config.OUTPUT_DIR, exist_ok=True)
@@ -4,6 +4,7 @@ URL: https://allofgreeceone.culture.gov.gr/en/
 """
 
 from scraper_base import BaseScraper
+from url_canon import canonical_links
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -111,7 +112,8 @@ class CultureMapScraper(BaseScraper):
             for idx, link in enumerate(event_links):
                 try:
                     print(f"[{idx + 1}/{len(event_links)}] {link[:70]}...")
-                    event_details = self.scrape_event_detail(link)
+                    with self.throttle.slot(link):
+                        event_details = self.scrape_event_detail(link)
                     
                     if event_details:
                         all_events.append(event_details)
@@ -120,8 +122,6 @@ class CultureMapScraper(BaseScraper):
                     else:
                         print(f"  ✗ No data extracted")
                     
-                    time.sleep(0.5)
-                    
                 except Exception as e:
                     print(f"  ✗ Error: {e}")
                     continue
@@ -179,7 +179,7 @@ class CultureMapScraper(BaseScraper):
         except Exception as e:
             print(f"Error getting links: {e}")
         
-        return links
+        return canonical_links(links)
     
     def scrape_event_detail(self, url):
         """Scrape detailed information from an event page"""
@@ -312,19 +312,6 @@ class CultureMapScraper(BaseScraper):
             print(f"Error scraping {url}: {e}")
             return None
     
-    def find_text_by_selectors(self, selectors):
-        """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 1:
-                        return text
-            except:
-                continue
-        return None
-    
     def save_events(self, events, filename='culture_gov_events_complete.json'):
         """Save events to JSON file"""
         os.makedirs(config.OUTPUT_DIR, exist_ok=True)
@@ -5,8 +5,9 @@ Combines data from all scrapers and formats before database storage
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import re
+from date_parser import parse_date_range
 
 class DataTransformer:
     """Transform scraped data into standardized format"""
@@ -69,7 +70,7 @@ class DataTransformer:
             return None
         
         description = self._extract_description(event)
-        date = self._extract_date(event)
+        date, end_date = self._extract_dates(event)
         region = self._extract_region(event)
         category = self._extract_category(event)
         location = self._extract_location(event)
@@ -84,6 +85,7 @@ class DataTransformer:
             'title': title,
             'description': description,
             'date': date,
+            'endDate': end_date,
             'schedule': None,  # Can be enhanced later
             'region': region,
             'category': category,
@@ -103,6 +105,14 @@ class DataTransformer:
             'source': self._format_source_name(source)
         }
         
+        # Map markers come with their position
+        if event.get('latitude') is not None and event.get('longitude') is not None:
+            standardized['coordinates'] = {'lat': event['latitude'], 'lng': event['longitude']}
+        
+        # Read from a listing card only: stored details are kept when saving
+        if event.get('listing_only'):
+            standardized['listingOnly'] = True
+        
         self.next_id += 1
         return standardized
     
@@ -147,41 +157,20 @@ class DataTransformer:
         
         return self._clean_text(desc)
     
-    def _extract_date(self, event: Dict) -> Optional[str]:
-        """Extract and format date"""
+    def _extract_dates(self, event: Dict) -> Tuple[Optional[str], Optional[str]]:
+        """Extract start and end date as YYYY-MM-DD (ranges like "17 Jan - 15 Feb 2026" give both)"""
         date = event.get('date')
         
         if not date:
-            return None
+            return None, None
         
         date = str(date).strip()
-        
-        # Try to parse and standardize date format to YYYY-MM-DD
-        try:
-            # Handle various date formats
-            date_patterns = [
-                r'(\d{4})-(\d{1,2})-(\d{1,2})',  # YYYY-MM-DD
-                r'(\d{1,2})/(\d{1,2})/(\d{4})',  # DD/MM/YYYY
-                r'(\d{1,2})\.(\d{1,2})\.(\d{4})',  # DD.MM.YYYY
-                r'(\d{1,2})-(\d{1,2})-(\d{4})',  # DD-MM-YYYY
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, date)
-                if match:
-                    groups = match.groups()
-                    if len(groups[0]) == 4:  # YYYY-MM-DD format
-                        year, month, day = groups
-                    else:  # DD/MM/YYYY format
-                        day, month, year = groups
-                    
-                    # Ensure proper formatting
-                    return f"{year}-{int(month):02d}-{int(day):02d}"
-        except:
-            pass
+        start, end = parse_date_range(date)
+        if event.get('end_date'):
+            end = parse_date_range(event['end_date'])[0] or end
         
         # Return as-is if can't parse
-        return date
+        return start or date, end
     
     def _extract_region(self, event: Dict) -> str:
         """Extract region from location or venue"""
@@ -289,8 +278,11 @@ class DataTransformer:
         images = event.get('images', [])
         
         if isinstance(images, list) and images:
-            # Return first image
-            return str(images[0]) if images[0] else None
+            # Return first image (pigolampides stores {'src', 'alt'} dicts)
+            first = images[0]
+            if isinstance(first, dict):
+                first = first.get('src')
+            return str(first) if first else None
         elif isinstance(images, str):
             return images
         
@@ -1,10 +1,12 @@
 """
 Database models and connection for events and deals
 """
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON, Float
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON, Float, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+import hashlib
+import json
 import os
 from dotenv import load_dotenv
 
@@ -50,9 +52,31 @@ class Event(Base):
     contact = Column(String(300), nullable=True)
     content = Column(JSON, nullable=True)
     full_text = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # Hash of the fields in EVENT_HASH_FIELDS
+    last_seen_at = Column(DateTime, nullable=True)  # Last scrape that found the event, changed or not
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+# Event fields whose changes count as a content change
+EVENT_HASH_FIELDS = ('title', 'description', 'date', 'location', 'category', 'price',
+                     'source', 'images', 'contact', 'content', 'full_text')
+
+def _normalize(value):
+    """Collapse whitespace so cosmetic differences don't change the hash"""
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    return value
+
+def event_content_hash(fields):
+    """Stable SHA-256 of an event's normalized EVENT_HASH_FIELDS"""
+    normalized = {name: _normalize(fields.get(name)) for name in EVENT_HASH_FIELDS}
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
 class Deal(Base):
     """Deal model"""
     __tablename__ = "deals"
@@ -74,6 +98,15 @@ class Deal(Base):
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    
+    # create_all doesn't add columns to existing tables
+    columns = {col['name'] for col in inspect(engine).get_columns('events')}
+    for name, column_type in (('content_hash', 'VARCHAR(64)'), ('last_seen_at', 'TIMESTAMP')):
+        if name not in columns:
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE events ADD COLUMN {name} {column_type}'))
+            print(f"✓ Added events.{name}")
+    
     print("✓ Database initialized")
 
 def get_db():
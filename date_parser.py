@@ -0,0 +1,163 @@
+"""
+Date parsing shared by the scrapers and the transformer
+English and Greek month names (full, abbreviated and Greek genitive forms,
+with or without accents), numeric dates and ranges such as
+"17 Jan - 15 Feb 2026", "17 - 20 Ιανουαρίου 2026", "17/01 - 15/02/2026" or
+"10 - 12.10.2025".
+All patterns are compiled once; dates come back as YYYY-MM-DD strings, and
+short strings (field values seen again and again) are cached.
+"""
+import re
+import unicodedata
+from datetime import date
+from functools import lru_cache
+
+# Month name forms, lowercased without accents (final sigma as σ)
+MONTH_FORMS = {
+    1: ['january', 'jan', 'ιανουαριος', 'ιανουαριου', 'ιαν'],
+    2: ['february', 'feb', 'φεβρουαριος', 'φεβρουαριου', 'φεβ'],
+    3: ['march', 'mar', 'μαρτιος', 'μαρτιου', 'μαρ'],
+    4: ['april', 'apr', 'απριλιος', 'απριλιου', 'απρ'],
+    5: ['may', 'μαιος', 'μαιου', 'μαι', 'μαη'],
+    6: ['june', 'jun', 'ιουνιος', 'ιουνιου', 'ιουν'],
+    7: ['july', 'jul', 'ιουλιος', 'ιουλιου', 'ιουλ'],
+    8: ['august', 'aug', 'αυγουστος', 'αυγουστου', 'αυγ'],
+    9: ['september', 'sept', 'sep', 'σεπτεμβριος', 'σεπτεμβριου', 'σεπτ', 'σεπ'],
+    10: ['october', 'oct', 'οκτωβριος', 'οκτωβριου', 'οκτ'],
+    11: ['november', 'nov', 'νοεμβριος', 'νοεμβριου', 'νοεμ', 'νοε'],
+    12: ['december', 'dec', 'δεκεμβριος', 'δεκεμβριου', 'δεκ'],
+}
+MONTHS = {form.replace('ς', 'σ'): month for month, forms in MONTH_FORMS.items() for form in forms}
+
+# Longest forms first so "ιουνιου" isn't read as "ιουν" + "ιου"
+_MONTH = r'(?:%s)\.?(?![a-zα-ω])' % '|'.join(sorted(MONTHS, key=len, reverse=True))
+_DAY = r'(?<!\d)\d{1,2}(?:st|nd|rd|th)?(?!\d)'
+_YEAR = r'(?<!\d)(?:\d{4}|\d{2})(?!\d)'
+_SEP = r'\s*(?:-|–|—|to|until|till|εωσ|μεχρι)\s*'
+
+# Candidates in order of preference when several start at the same position
+PATTERNS = [
+    # 17 Jan - 15 Feb 2026, 17 - 20 Ιανουαριου 2026
+    ('dm-dmy', re.compile(rf'(?P<d1>{_DAY})(?:\s+(?P<m1>{_MONTH}))?,?{_SEP}(?P<d2>{_DAY})\s+(?P<m2>{_MONTH}),?\s+(?P<y2>{_YEAR})')),
+    # Jan 17 - Feb 15, 2026
+    ('md-mdy', re.compile(rf'(?P<m1>{_MONTH})\s+(?P<d1>{_DAY}){_SEP}(?:(?P<m2>{_MONTH})\s+)?(?P<d2>{_DAY}),?\s+(?P<y2>{_YEAR})')),
+    # 17/01 - 15/02/2026
+    ('nn-nny', re.compile(rf'(?P<d1>{_DAY})[./](?P<m1>\d{{1,2}}){_SEP}(?P<d2>{_DAY})[./](?P<m2>\d{{1,2}})[./](?P<y2>{_YEAR})')),
+    # 10 - 12.10.2025
+    ('d-dmy', re.compile(rf'(?P<d1>{_DAY}){_SEP}(?P<d2>{_DAY})[./](?P<m2>\d{{1,2}})[./](?P<y2>{_YEAR})')),
+    # 2026-01-17 (with an optional time)
+    ('ymd', re.compile(r'(?<!\d)(?P<y1>\d{4})-(?P<m1>\d{1,2})-(?P<d1>\d{1,2})(?!\d)')),
+    # 17/01/2026, 17.01.2026, 17-01-26
+    ('dmy', re.compile(rf'(?P<d1>{_DAY})[./-](?P<m1>\d{{1,2}})[./-](?P<y1>{_YEAR})')),
+    # 17 January 2026, 17 Ιανουαριου 2026
+    ('d m y', re.compile(rf'(?P<d1>{_DAY})\s+(?P<m1>{_MONTH}),?\s+(?P<y1>{_YEAR})')),
+    # January 17, 2026
+    ('m d y', re.compile(rf'(?P<m1>{_MONTH})\s+(?P<d1>{_DAY}),?\s+(?P<y1>{_YEAR})')),
+]
+
+# A second full date right after the first one makes a range
+RANGE_TAIL = re.compile(_SEP)
+
+# Longer strings (page text) are parsed without caching
+CACHE_MAX_LENGTH = 200
+
+def normalize(text):
+    """Lowercase and strip accents (diacritics), so Greek forms match with or without tonos"""
+    text = unicodedata.normalize('NFD', str(text).lower())
+    return ''.join(c for c in text if not unicodedata.combining(c)).replace('ς', 'σ')
+
+def _month(value):
+    if value is None:
+        return None
+    if value.isdigit():
+        return int(value)
+    return MONTHS.get(value.rstrip('.'))
+
+def _day(value):
+    return int(re.match(r'\d+', value).group()) if value else None
+
+def _year(value):
+    year = int(value)
+    return year + 2000 if year < 100 else year
+
+def _iso(year, month, day):
+    try:
+        return date(year, month, day).isoformat()
+    except (TypeError, ValueError):
+        return None
+
+def _from_match(kind, match):
+    """(start, end) ISO dates of one pattern match; None where invalid"""
+    g = match.groupdict()
+    if 'y1' in g:
+        return _iso(_year(g['y1']), _month(g['m1']), _day(g['d1'])), None
+    
+    year, month2 = _year(g['y2']), _month(g['m2'])
+    month1 = _month(g['m1']) if g.get('m1') else month2
+    month2 = month2 or month1
+    end = _iso(year, month2, _day(g['d2']))
+    # "20 Dec - 5 Jan 2027" starts in the previous year
+    start_year = year - 1 if month1 and month2 and month1 > month2 else year
+    start = _iso(start_year, month1, _day(g['d1']))
+    return (start, end) if start and end else (None, None)
+
+def _scan(text):
+    """(matched text, start, end) of the first date or range in text"""
+    normalized = normalize(text)
+    # Accent stripping keeps positions only when no characters were dropped
+    original = text if len(normalized) == len(text) else normalized
+    
+    best = None
+    for kind, pattern in PATTERNS:
+        for match in pattern.finditer(normalized):
+            start, end = _from_match(kind, match)
+            if start:
+                if best is None or match.start() < best[0].start():
+                    best = (match, start, end)
+                break
+    
+    if not best:
+        return None, None, None
+    
+    match, start, end = best
+    matched = original[match.start():match.end()]
+    
+    # 17/01/2026 - 15/02/2026: a full date right after the first one
+    if end is None:
+        tail = RANGE_TAIL.match(normalized, match.end())
+        if tail:
+            for kind, pattern in PATTERNS[4:]:
+                second = pattern.match(normalized, tail.end())
+                if second:
+                    second_start, _ = _from_match(kind, second)
+                    if second_start and second_start >= start:
+                        end = second_start
+                        matched = original[match.start():second.end()]
+                    break
+    
+    return matched.strip(), start, end
+
+@lru_cache(maxsize=4096)
+def _scan_cached(text):
+    return _scan(text)
+
+def find_date(text):
+    """
+    The first date or date range in a text
+    
+    Returns:
+        (matched text, start, end) with start/end as YYYY-MM-DD, end None
+        for a single date; (None, None, None) when there is no date
+    """
+    text = str(text or '')
+    if not text.strip():
+        return None, None, None
+    return _scan_cached(text) if len(text) <= CACHE_MAX_LENGTH else _scan(text)
+
+def parse_date_range(text):
+    """(start, end) as YYYY-MM-DD of the first date or range in text; None where unknown"""
+    return find_date(text)[1:]
+
+def parse_date(text):
+    """Start date of text as YYYY-MM-DD, or None"""
+    return find_date(text)[1]
@@ -0,0 +1,309 @@
+"""
+Chrome startup helpers
+Resolves chromedriver once and caches the result, validates the Chrome and
+driver versions offline, and gives every session a copy of a prepared
+profile template so Chrome skips its first-run work.
+
+Run directly to prepare the driver cache and profile template, and to accept
+cookie-consent banners once so every later session starts with them:
+
+    python driver_setup.py [url ...]
+"""
+import atexit
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import config
+
+CHROME_BINARY_NAMES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+CHROME_WINDOWS_PATHS = [
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+]
+LOCAL_DRIVER_PATHS = [
+    os.path.join('chromedriver-win64', 'chromedriver.exe'),
+    os.path.join('chromedriver-linux64', 'chromedriver'),
+]
+
+# Source home pages opened when seeding the profile template
+SEED_URLS = [
+    'https://www.culture.gov.gr/',
+    'https://www.more.com/',
+    'https://www.pigolampides.gr/',
+    'https://www.visitgreece.gr/',
+]
+
+# Preferences that turn off first-run, welcome and restore prompts
+TEMPLATE_PREFERENCES = {
+    'browser': {'has_seen_welcome_page': True, 'check_default_browser': False},
+    'distribution': {
+        'skip_first_run_ui': True,
+        'suppress_first_run_default_browser_prompt': True,
+        'import_bookmarks': False,
+        'import_history': False,
+        'import_search_engine': False,
+    },
+    'profile': {
+        'exit_type': 'Normal',
+        'exited_cleanly': True,
+        'default_content_setting_values': {'notifications': 2, 'geolocation': 2},
+    },
+    'credentials_enable_service': False,
+    'translate': {'enabled': False},
+}
+
+# Locks and caches that must not be copied into a session's profile
+PROFILE_SKIP = shutil.ignore_patterns('Singleton*', 'lockfile', 'Cache', 'Code Cache', 'GPUCache',
+                                      'ShaderCache', 'GrShaderCache', 'Crashpad', '*.tmp')
+
+_lock = threading.Lock()
+_resolved = None
+_profile_dirs = set()
+
+def find_chrome_binary():
+    """Locate the installed Chrome binary"""
+    for name in CHROME_BINARY_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+
+    for path in CHROME_WINDOWS_PATHS:
+        if os.path.exists(path):
+            return path
+
+    return None
+
+def find_local_driver():
+    """Locate a chromedriver on PATH or next to the project"""
+    path = shutil.which('chromedriver')
+    if path:
+        return path
+
+    for path in LOCAL_DRIVER_PATHS:
+        if os.path.exists(path):
+            return os.path.abspath(path)
+
+    return None
+
+def binary_version(path):
+    """Read a binary's version from its --version output (no network)"""
+    try:
+        result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10)
+        match = re.search(r'\d+\.\d+\.\d+\.\d+', result.stdout)
+        return match.group(0) if match else None
+    except:
+        return None
+
+def major_version(version):
+    """Major part of a dotted version string"""
+    return version.split('.')[0] if version else None
+
+def file_stamp(path):
+    """Size and mtime of a file, used to tell if a cached binary changed"""
+    try:
+        stat = os.stat(path)
+        return [stat.st_size, int(stat.st_mtime)]
+    except (OSError, TypeError):
+        return None
+
+def load_driver_cache():
+    """Read the cached driver resolution, if any"""
+    try:
+        with open(config.DRIVER_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except:
+        return {}
+
+def save_driver_cache(entry):
+    """Write the driver resolution cache"""
+    try:
+        with open(config.DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+    except Exception as e:
+        print(f"Could not write driver cache: {e}")
+
+def build_cache_entry(driver_path, driver_version=None, chrome_path=None, chrome_version=None):
+    """Describe a driver/Chrome pair together with their file stamps"""
+    chrome_path = chrome_path or find_chrome_binary()
+    return {
+        'driver_path': driver_path,
+        'driver_version': driver_version or binary_version(driver_path),
+        'driver_stamp': file_stamp(driver_path),
+        'chrome_path': chrome_path,
+        'chrome_version': chrome_version or (binary_version(chrome_path) if chrome_path else None),
+        'chrome_stamp': file_stamp(chrome_path),
+    }
+
+def cache_entry_valid(entry):
+    """A cached entry holds while neither binary changed on disk and majors match"""
+    if not entry.get('driver_path') or file_stamp(entry['driver_path']) != entry.get('driver_stamp'):
+        return False
+    if entry.get('chrome_path') and file_stamp(entry['chrome_path']) != entry.get('chrome_stamp'):
+        return False
+    return versions_match(entry)
+
+def versions_match(entry):
+    """Chrome and chromedriver must share a major version (unknown versions pass)"""
+    chrome_major = major_version(entry.get('chrome_version'))
+    driver_major = major_version(entry.get('driver_version'))
+    return not chrome_major or not driver_major or chrome_major == driver_major
+
+def resolve_driver_path():
+    """
+    Return the chromedriver path to start sessions with, or None to let
+    Selenium resolve one (its result is then cached by remember_driver)
+
+    Resolution happens once per process; across processes the cache file is
+    trusted while the driver and Chrome binaries are unchanged on disk, so
+    no version probing or download happens on a normal start.
+    """
+    global _resolved
+
+    with _lock:
+        if _resolved is not None:
+            return _resolved or None
+
+        if config.CHROME_DRIVER_PATH and config.CHROME_DRIVER_PATH != 'auto':
+            entry = load_driver_cache()
+            if entry.get('driver_path') != config.CHROME_DRIVER_PATH or not cache_entry_valid(entry):
+                entry = build_cache_entry(config.CHROME_DRIVER_PATH)
+                save_driver_cache(entry)
+            if not versions_match(entry):
+                print(f"⚠ ChromeDriver {entry['driver_version']} does not match Chrome {entry['chrome_version']}; "
+                      f"run fix_chromedriver.py")
+            _resolved = config.CHROME_DRIVER_PATH
+            return _resolved
+
+        entry = load_driver_cache()
+        if entry and cache_entry_valid(entry):
+            _resolved = entry['driver_path']
+            return _resolved
+
+        driver_path = find_local_driver()
+        if driver_path:
+            entry = build_cache_entry(driver_path)
+            if versions_match(entry):
+                save_driver_cache(entry)
+                _resolved = driver_path
+                return _resolved
+            print(f"⚠ Ignoring ChromeDriver {entry['driver_version']} at {driver_path}: "
+                  f"Chrome is {entry['chrome_version']}")
+
+        _resolved = ''
+        return None
+
+def remember_driver(driver):
+    """Cache the driver Selenium resolved for a session started without a path"""
+    global _resolved
+
+    driver_path = getattr(getattr(driver, 'service', None), 'path', None)
+    if not driver_path or not os.path.exists(driver_path):
+        return
+
+    capabilities = driver.capabilities or {}
+    driver_version = (capabilities.get('chrome', {}).get('chromedriverVersion') or '').split(' ')[0] or None
+    chrome_path = getattr(getattr(driver, 'options', None), 'binary_location', None) or None
+
+    save_driver_cache(build_cache_entry(driver_path, driver_version=driver_version, chrome_path=chrome_path,
+                                        chrome_version=capabilities.get('browserVersion')))
+    with _lock:
+        _resolved = driver_path
+
+def prepare_profile_template(path=None):
+    """Create the profile template with first-run prompts disabled, if missing"""
+    path = path or config.CHROME_PROFILE_TEMPLATE
+    preferences_file = os.path.join(path, 'Default', 'Preferences')
+
+    if not os.path.exists(preferences_file):
+        os.makedirs(os.path.dirname(preferences_file), exist_ok=True)
+        with open(preferences_file, 'w', encoding='utf-8') as f:
+            json.dump(TEMPLATE_PREFERENCES, f)
+
+    # Chrome treats a profile with this sentinel as already set up
+    first_run = os.path.join(path, 'First Run')
+    if not os.path.exists(first_run):
+        open(first_run, 'w').close()
+
+    return path
+
+def new_profile_dir():
+    """Copy the profile template into a fresh user-data-dir for one session"""
+    if not config.CHROME_PROFILE_TEMPLATE:
+        return None
+
+    try:
+        template = prepare_profile_template()
+        profile_dir = tempfile.mkdtemp(prefix='scraper-chrome-')
+        shutil.copytree(template, profile_dir, ignore=PROFILE_SKIP, dirs_exist_ok=True)
+    except Exception as e:
+        print(f"Could not prepare Chrome profile, using a fresh one: {e}")
+        return None
+
+    with _lock:
+        _profile_dirs.add(profile_dir)
+    return profile_dir
+
+def remove_profile_dir(profile_dir):
+    """Delete a session's profile copy"""
+    if not profile_dir:
+        return
+
+    with _lock:
+        _profile_dirs.discard(profile_dir)
+    shutil.rmtree(profile_dir, ignore_errors=True)
+
+def quit_driver(driver):
+    """Quit a driver and delete its profile copy"""
+    try:
+        driver.quit()
+    finally:
+        remove_profile_dir(getattr(driver, 'profile_dir', None))
+
+@atexit.register
+def _remove_leftover_profiles():
+    for profile_dir in list(_profile_dirs):
+        remove_profile_dir(profile_dir)
+
+def seed_profile_template(urls):
+    """Open the template in a visible Chrome so consent banners can be accepted once"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.webdriver.chrome.options import Options
+
+    template = os.path.abspath(prepare_profile_template())
+
+    chrome_options = Options()
+    chrome_options.add_argument(f'--user-data-dir={template}')
+    chrome_options.add_argument('--no-first-run')
+
+    driver_path = resolve_driver_path()
+    if driver_path:
+        driver = webdriver.Chrome(service=ChromeService(executable_path=driver_path), options=chrome_options)
+    else:
+        driver = webdriver.Chrome(options=chrome_options)
+        remember_driver(driver)
+
+    try:
+        for url in urls:
+            driver.get(url)
+            input(f"Accept any cookie banner on {url}, then press Enter...")
+    finally:
+        driver.quit()
+
+    print(f"✓ Profile template saved in {template}")
+
+if __name__ == "__main__":
+    print("Chrome startup setup")
+    print("=" * 60)
+
+    driver_path = resolve_driver_path()
+    entry = load_driver_cache()
+    print(f"ChromeDriver: {driver_path or 'resolved by Selenium on first start'}")
+    print(f"Versions: driver {entry.get('driver_version')}, Chrome {entry.get('chrome_version')}")
+
+    seed_profile_template(sys.argv[1:] or SEED_URLS)
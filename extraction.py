@@ -0,0 +1,193 @@
+"""
+Field-spec extraction engine
+A source describes the fields it wants once, and the whole spec runs inside
+the page as a single execute_script call instead of one WebDriver round-trip
+per find_elements / .text / get_attribute.
+
+Spec format - field name -> options:
+    
+    {
+        'title': {'selectors': ['h1', '.title']},
+        'description': {'selectors': ['article p'], 'all': True, 'scan_limit': 3,
+                        'min_length': 21, 'join': ' '},
+        'images': {'selectors': ['article img', 'img'], 'attr': 'src', 'all': True,
+                   'limit': 3, 'exclude': ['logo', 'icon']},
+    }
+    
+    selectors   CSS selectors tried in order
+    attr        read this attribute (or DOM property, e.g. absolute src/href) instead of the text;
+                'textContent' reads the raw text, including <script> bodies
+    attrs       read several attributes into a dict per element; filters apply to the first one
+    all         collect a list across all selectors instead of the first match
+    limit       maximum number of items for 'all' fields
+    scan_limit  only look at the first N elements matched by each selector
+    min_length  shortest value accepted (default 1)
+    exclude     skip values containing any of these substrings (case-insensitive)
+    join        join an 'all' field into one string (None when empty)
+    fields      a nested spec run inside each matched element, giving one dict per
+                element (e.g. listing cards); filters apply to its first field
+
+The same spec can also be applied offline to a parsed page snapshot with
+apply_field_spec(), which gives the same result without a browser.
+"""
+from http_fetcher import css, element_text
+
+FIELD_SPEC_JS = """
+var spec = arguments[0];
+
+function readAttr(el, attr) {
+    // Prefer the DOM property so src/href come back absolute, like get_attribute()
+    var prop = el[attr];
+    var value = (typeof prop === 'string') ? prop : el.getAttribute(attr);
+    return value ? String(value).trim() : '';
+}
+
+function readValue(el, field) {
+    var value;
+    if (field.attr) {
+        value = readAttr(el, field.attr);
+    } else {
+        value = el.innerText;
+        if (value === undefined) value = el.textContent;
+    }
+    return value ? String(value).trim() : '';
+}
+
+function accepted(value, field) {
+    if (!value || value.length < (field.min_length || 1)) return false;
+    var exclude = field.exclude || [];
+    var lower = value.toLowerCase();
+    for (var i = 0; i < exclude.length; i++) {
+        if (lower.indexOf(exclude[i].toLowerCase()) !== -1) return false;
+    }
+    return true;
+}
+
+function extract(root, spec) {
+    var out = {};
+    
+    Object.keys(spec).forEach(function(name) {
+        var field = spec[name];
+        var values = [];
+        var seen = Object.create(null);
+        
+        outer:
+        for (var s = 0; s < field.selectors.length; s++) {
+            var elements;
+            try {
+                elements = root.querySelectorAll(field.selectors[s]);
+            } catch (e) {
+                continue;
+            }
+            var count = field.scan_limit ? Math.min(elements.length, field.scan_limit) : elements.length;
+            
+            for (var i = 0; i < count; i++) {
+                var value, key;
+                if (field.fields) {
+                    value = extract(elements[i], field.fields);
+                    key = value[Object.keys(field.fields)[0]] || '';
+                } else if (field.attrs) {
+                    value = {};
+                    for (var a = 0; a < field.attrs.length; a++) {
+                        value[field.attrs[a]] = readAttr(elements[i], field.attrs[a]) || null;
+                    }
+                    key = value[field.attrs[0]] || '';
+                } else {
+                    value = key = readValue(elements[i], field);
+                }
+                if (typeof key !== 'string') key = '';
+                if (!accepted(key, field) || seen[key]) continue;
+                
+                seen[key] = true;
+                values.push(value);
+                
+                if (!field.all) break outer;
+                if (field.limit && values.length >= field.limit) break outer;
+            }
+        }
+        
+        if (!field.all) {
+            out[name] = values.length ? values[0] : null;
+        } else if (field.join !== undefined && field.join !== null) {
+            out[name] = values.length ? values.join(field.join) : null;
+        } else {
+            out[name] = values;
+        }
+    });
+    
+    return out;
+}
+
+return extract(document, spec);
+"""
+
+def run_field_spec(driver, spec):
+    """Run a field spec in the current page and return the extracted record"""
+    return driver.execute_script(FIELD_SPEC_JS, spec) or {}
+
+def apply_field_spec(doc, spec):
+    """Apply a field spec to a parsed lxml document (offline counterpart of run_field_spec)"""
+    record = {}
+    
+    for name, field in spec.items():
+        values = []
+        seen = set()
+        done = False
+        
+        for selector in field['selectors']:
+            try:
+                elements = css(doc, selector)
+            except Exception:
+                continue
+            
+            if field.get('scan_limit'):
+                elements = elements[:field['scan_limit']]
+            
+            for element in elements:
+                if field.get('fields'):
+                    value = apply_field_spec(element, field['fields'])
+                    key = value[next(iter(field['fields']))] or ''
+                elif field.get('attrs'):
+                    value = {attr: _read_attr(element, attr) or None for attr in field['attrs']}
+                    key = value[field['attrs'][0]] or ''
+                elif field.get('attr'):
+                    value = key = _read_attr(element, field['attr'])
+                else:
+                    value = key = element_text(element)
+                
+                if not isinstance(key, str):
+                    key = ''
+                if not _accepted(key, field) or key in seen:
+                    continue
+                
+                seen.add(key)
+                values.append(value)
+                
+                if not field.get('all') or (field.get('limit') and len(values) >= field['limit']):
+                    done = True
+                    break
+            
+            if done:
+                break
+        
+        if not field.get('all'):
+            record[name] = values[0] if values else None
+        elif field.get('join') is not None:
+            record[name] = field['join'].join(values) if values else None
+        else:
+            record[name] = values
+    
+    return record
+
+def _read_attr(element, attr):
+    """An attribute of an lxml element, or its raw text for 'textContent' (like the DOM property)"""
+    if attr == 'textContent':
+        return element.text_content().strip()
+    return (element.get(attr) or '').strip()
+
+def _accepted(value, field):
+    """Check a value against a field's min_length and exclude filters"""
+    if not value or len(value) < field.get('min_length', 1):
+        return False
+    lower = value.lower()
+    return not any(word.lower() in lower for word in field.get('exclude', []))
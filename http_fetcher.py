@@ -0,0 +1,133 @@
+"""
+HTTP fetch layer for pages that don't need a browser
+Uses one pooled requests.Session (keep-alive, gzip) and lxml for parsing
+"""
+import re
+from functools import lru_cache
+import requests
+from requests.adapters import HTTPAdapter
+import config
+from retry_policy import call_with_retries
+from page_cache import body_hash
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+    LXML_AVAILABLE = True
+except:
+    LXML_AVAILABLE = False
+
+DEFAULT_HEADERS = {
+    'User-Agent': config.USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+    'Accept-Language': 'en-US,en;q=0.9,el;q=0.8',
+}
+
+# Text nodes that a browser would not render
+VISIBLE_TEXT_XPATH = './/text()[not(ancestor::script) and not(ancestor::style) and not(ancestor::noscript)]'
+
+class HttpFetcher:
+    """Fetch pages over plain HTTP with connection pooling"""
+    
+    def __init__(self, timeout=config.TIMEOUT, pool_size=10, cache=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        
+        # Keep connections to each host open between requests
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def request(self, method, url, **kwargs):
+        """Send a request and raise for HTTP errors, retrying transient ones"""
+        kwargs.setdefault('timeout', self.timeout)
+        
+        def attempt():
+            response = self.session.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+        
+        return call_with_retries(attempt)
+    
+    def get(self, url, **kwargs):
+        """GET a URL and raise for HTTP errors"""
+        return self.request('GET', url, **kwargs)
+    
+    def fetch_html(self, url):
+        """Return the decoded HTML of a page"""
+        return self._decode(self.get(url))
+    
+    def fetch_cached(self, url):
+        """
+        Fetch a page, revalidating against the page cache
+        
+        Returns (html, record). record is the one stored for this page when
+        the server answered 304 or sent the same body as last time, in which
+        case it can be used as is; otherwise it is None and html is current.
+        """
+        if not self.cache:
+            return self.fetch_html(url), None
+        
+        entry = self.cache.get(url)
+        response = self.get(url, headers=self.cache.validators(entry))
+        
+        if response.status_code == 304 and entry and entry['body'] is not None:
+            self.cache.touch(url)
+            return entry['body'], entry['record']
+        
+        html = self._decode(response)
+        if entry and entry['record'] is not None and entry['body_hash'] == body_hash(html):
+            self.cache.touch(url)
+            return html, entry['record']
+        
+        self.cache.store(url, html, etag=response.headers.get('ETag'),
+                         last_modified=response.headers.get('Last-Modified'))
+        return html, None
+    
+    def remember_record(self, url, record):
+        """Store the record extracted from a page fetched with fetch_cached()"""
+        if self.cache and record:
+            self.cache.store_record(url, record)
+    
+    def _decode(self, response):
+        # requests falls back to ISO-8859-1 for text/html without a charset,
+        # which garbles Greek pages
+        if response.encoding and response.encoding.lower() == 'iso-8859-1':
+            response.encoding = response.apparent_encoding
+        
+        return response.text
+    
+    def fetch_document(self, url):
+        """Fetch a page and return its parsed lxml document"""
+        return parse_html(self.fetch_html(url), base_url=url)
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+def parse_html(html, base_url=None):
+    """Parse HTML into an lxml document with absolute links"""
+    if not LXML_AVAILABLE:
+        raise RuntimeError("lxml is not installed")
+    
+    doc = lxml.html.fromstring(html, base_url=base_url)
+    if base_url:
+        doc.make_links_absolute(base_url, resolve_base_href=True)
+    return doc
+
+@lru_cache(maxsize=512)
+def compile_selector(selector):
+    """Compile a CSS selector to XPath once and reuse it"""
+    return CSSSelector(selector)
+
+def css(doc, selector):
+    """All elements matching a CSS selector"""
+    return compile_selector(selector)(doc)
+
+def element_text(element):
+    """Visible text of an element with whitespace collapsed"""
+    text = ' '.join(element.xpath(VISIBLE_TEXT_XPATH))
+    return re.sub(r'\s+', ' ', text).strip()
@@ -0,0 +1,255 @@
+"""
+Image pipeline for standardized events
+After transformation, each event's image is downloaded concurrently
+(within the shared per-host budget), deduplicated by content hash and
+resized into JPEG thumbnails under OUTPUT_DIR/images. The API serves them
+with long-lived cache headers. The store has a disk budget; the least
+recently served images are evicted first, after any no stored event uses.
+"""
+import asyncio
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+import config
+from async_crawler import AIOHTTP_AVAILABLE
+from http_fetcher import DEFAULT_HEADERS
+from rate_limiter import get_rate_limiter
+from retry_policy import RETRYABLE_STATUSES, backoff_delay, is_retryable
+
+if AIOHTTP_AVAILABLE:
+    import aiohttp
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except:
+    PIL_AVAILABLE = False
+
+IMAGE_DIR = os.path.join(config.OUTPUT_DIR, 'images')
+
+# Larger downloads are not images we want to thumbnail
+MAX_DOWNLOAD_BYTES = 15 * 1024 * 1024
+DOWNLOAD_CHUNK = 64 * 1024
+
+class ImageStore:
+    """Thumbnails on disk plus an index of source URLs, sizes and last access"""
+    
+    def __init__(self, directory=IMAGE_DIR, max_bytes=None):
+        self.directory = directory
+        self.max_bytes = max_bytes if max_bytes is not None else config.IMAGE_STORE_MAX_MB * 1024 * 1024
+        self._local = threading.local()
+        
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("CREATE TABLE IF NOT EXISTS sources (url TEXT PRIMARY KEY, digest TEXT)")
+        conn.execute("CREATE TABLE IF NOT EXISTS images (digest TEXT PRIMARY KEY, size INTEGER, accessed_at REAL)")
+    
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.directory, 'index.db'), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+    
+    def path(self, digest, width):
+        return os.path.join(self.directory, f"{digest}_{width}.jpg")
+    
+    def has(self, digest):
+        return all(os.path.exists(self.path(digest, width)) for width in config.IMAGE_SIZES)
+    
+    def digest_for(self, url):
+        """Content hash of an already processed source URL whose thumbnails are still stored"""
+        row = self._connection().execute("SELECT digest FROM sources WHERE url = ?", (url,)).fetchone()
+        return row[0] if row and self.has(row[0]) else None
+    
+    def add(self, url, digest, thumbnails):
+        """Write thumbnails ({width: jpeg bytes}) for a content hash, unless already stored"""
+        if not self.has(digest):
+            for width, data in thumbnails.items():
+                with open(self.path(digest, width), 'wb') as f:
+                    f.write(data)
+        
+        size = sum(os.path.getsize(self.path(digest, width)) for width in config.IMAGE_SIZES)
+        conn = self._connection()
+        conn.execute("INSERT OR REPLACE INTO sources (url, digest) VALUES (?, ?)", (url, digest))
+        conn.execute("INSERT OR REPLACE INTO images (digest, size, accessed_at) VALUES (?, ?, ?)",
+                     (digest, size, time.time()))
+    
+    def touch(self, digest):
+        """Mark an image as recently used"""
+        self._connection().execute("UPDATE images SET accessed_at = ? WHERE digest = ?", (time.time(), digest))
+    
+    def evict(self):
+        """Drop least recently used images until the store is within its budget"""
+        conn = self._connection()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM images").fetchone()[0]
+        if not self.max_bytes or total <= self.max_bytes:
+            return 0
+        
+        evicted = 0
+        for digest, size in conn.execute("SELECT digest, size FROM images ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            for width in config.IMAGE_SIZES:
+                try:
+                    os.remove(self.path(digest, width))
+                except OSError:
+                    pass
+            conn.execute("DELETE FROM images WHERE digest = ?", (digest,))
+            conn.execute("DELETE FROM sources WHERE digest = ?", (digest,))
+            total -= size
+            evicted += 1
+        return evicted
+
+def make_thumbnails(data):
+    """JPEG thumbnails of an image, one per width in IMAGE_SIZES (never upscaled)"""
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        
+        thumbnails = {}
+        for width in config.IMAGE_SIZES:
+            thumb = image.copy()
+            thumb.thumbnail((width, width * 4))
+            out = io.BytesIO()
+            thumb.save(out, 'JPEG', quality=config.IMAGE_QUALITY, optimize=True, progressive=True)
+            thumbnails[width] = out.getvalue()
+        return thumbnails
+
+def thumbnail_urls(digest):
+    """API paths of an image's thumbnails by width"""
+    return {str(width): f"/images/{digest}/{width}" for width in config.IMAGE_SIZES}
+
+class ImagePipeline:
+    """Download, dedupe and thumbnail the images of standardized events"""
+    
+    def __init__(self, store=None, concurrency=None, timeout=config.TIMEOUT, retries=config.RETRY_ATTEMPTS, throttle=None):
+        self.store = store or get_image_store()
+        self.concurrency = concurrency or config.CRAWL_CONCURRENCY
+        self.timeout = timeout
+        self.retries = max(retries, 1)
+        self.throttle = throttle or get_rate_limiter()
+    
+    def process(self, events, keep=()):
+        """
+        Add 'thumbnails' ({width: path}) and 'thumbnailUrl' to events with an image
+        
+        Images already processed are not downloaded again; images with the
+        same content share one set of thumbnails. keep holds the content
+        hashes of images stored events still link to (events not scraped
+        again this run), which are kept ahead of unused ones when evicting.
+        Returns the events.
+        """
+        if not (AIOHTTP_AVAILABLE and PIL_AVAILABLE):
+            print("⚠ Image pipeline needs aiohttp and Pillow, skipping")
+            return events
+        
+        urls = list(dict.fromkeys(event['image'] for event in events
+                                  if str(event.get('image') or '').startswith(('http://', 'https://'))))
+        digests = {url: self.store.digest_for(url) for url in urls}
+        missing = [url for url in urls if not digests[url]]
+        
+        # Images still in use are kept ahead of ones no event shows any more
+        for digest in set(filter(None, digests.values())) | set(keep):
+            self.store.touch(digest)
+        
+        print(f"Processing images: {len(urls) - len(missing)} stored, {len(missing)} to download")
+        if missing:
+            digests.update(asyncio.run(self._download_all(missing)))
+        
+        for event in events:
+            digest = digests.get(event.get('image'))
+            if digest:
+                event['thumbnails'] = thumbnail_urls(digest)
+                event['thumbnailUrl'] = event['thumbnails'][str(config.IMAGE_SIZES[0])]
+        
+        evicted = self.store.evict()
+        if evicted:
+            print(f"  Evicted {evicted} least recently used images")
+        return events
+    
+    async def _download_all(self, urls):
+        digests = {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        
+        async with aiohttp.ClientSession(headers=DEFAULT_HEADERS, connector=connector, timeout=timeout) as session:
+            async def one(url):
+                async with semaphore:
+                    digests[url] = await self._process_one(session, url)
+            
+            await asyncio.gather(*(one(url) for url in urls))
+        
+        return digests
+    
+    async def _process_one(self, session, url):
+        """Download one image and store its thumbnails; returns its content hash or None"""
+        try:
+            data = await self._download(session, url)
+            digest = hashlib.sha256(data).hexdigest()
+            
+            # Decoding, resizing and the store's file and SQLite I/O run off the event loop
+            if await asyncio.to_thread(self.store.has, digest):
+                thumbnails = {}
+            else:
+                thumbnails = await asyncio.to_thread(make_thumbnails, data)
+            
+            await asyncio.to_thread(self.store.add, url, digest, thumbnails)
+            return digest
+        except Exception as e:
+            print(f"  ✗ Image {url}: {e}")
+            return None
+    
+    async def _download(self, session, url):
+        """Image bytes, read in chunks so a body without Content-Length still stops at MAX_DOWNLOAD_BYTES"""
+        for attempt in range(1, self.retries + 1):
+            lease = await self._acquire(url)
+            try:
+                async with session.get(url) as response:
+                    if response.status in RETRYABLE_STATUSES and attempt < self.retries:
+                        raise aiohttp.ClientResponseError(response.request_info, response.history,
+                                                          status=response.status, message=response.reason)
+                    response.raise_for_status()
+                    if (response.content_length or 0) > MAX_DOWNLOAD_BYTES:
+                        raise ValueError("image too large")
+                    
+                    data = bytearray()
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK):
+                        data.extend(chunk)
+                        if len(data) > MAX_DOWNLOAD_BYTES:
+                            raise ValueError("image too large")
+                    return bytes(data)
+            except Exception as e:
+                # Dead image URLs (404, 410) and oversized images are not retried
+                if attempt >= self.retries or not is_retryable(e):
+                    raise
+            finally:
+                await asyncio.to_thread(self.throttle.release, lease)
+            
+            await asyncio.sleep(backoff_delay(attempt))
+    
+    async def _acquire(self, url):
+        while True:
+            lease, wait = await asyncio.to_thread(self.throttle.try_acquire, url)
+            if lease:
+                return lease
+            await asyncio.sleep(wait)
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+def get_image_store():
+    """The image store shared within this process"""
+    global _shared_store
+    
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ImageStore()
+        return _shared_store
@@ -0,0 +1,47 @@
+"""
+URLs already stored in the database
+The scraper manager loads them once per run and hands them to each
+scraper, which then fetches detail pages only for new URLs or ones not
+seen for KNOWN_URL_STALE_DAYS.
+"""
+from datetime import datetime, timedelta
+import config
+from url_canon import canonicalize
+
+class KnownUrls:
+    """
+    Stored URLs with when each was last seen by a scrape
+    
+    Entries map canonical url -> last_seen, which may be None. Lookups
+    accept any variant of a URL.
+    """
+    
+    def __init__(self, entries=None, stale_days=None):
+        self.entries = {canonicalize(url): value for url, value in (entries or {}).items()}
+        stale_days = config.KNOWN_URL_STALE_DAYS if stale_days is None else stale_days
+        self.stale_after = timedelta(days=stale_days)
+    
+    @classmethod
+    def from_rows(cls, rows, stale_days=None):
+        """Build from (url, last_seen) rows"""
+        return cls({url: last_seen for url, last_seen in rows if url}, stale_days)
+    
+    def __contains__(self, url):
+        return canonicalize(url) in self.entries
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def last_seen(self, url):
+        return self.entries.get(canonicalize(url))
+    
+    def is_fresh(self, url):
+        """Known and seen within the staleness threshold"""
+        if url not in self:
+            return False
+        last_seen = self.last_seen(url)
+        return last_seen is not None and datetime.utcnow() - last_seen < self.stale_after
+    
+    def to_fetch(self, urls):
+        """The URLs that are new or stale, in their original order"""
+        return [url for url in urls if not self.is_fresh(url)]
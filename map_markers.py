@@ -0,0 +1,237 @@
+"""
+Map marker extraction
+Reads all markers of a page's map with one execute_script call instead of
+clicking them one by one. Markers are taken from the layers of a Leaflet,
+OpenLayers or Google Maps instance, from marker data kept in page globals,
+or from the JSON/GeoJSON the map loaded; those responses are listed by the
+Performance API and fetched again over HTTP. Each marker comes back with
+its coordinates and the links found in its popup or properties.
+"""
+import json
+from contextlib import nullcontext
+from url_canon import canonicalize
+from xhr_discovery import MAX_RECORDED_CHARS, links_in_payload
+
+MAP_DATA_JS = """
+var maxChars = arguments[0];
+var out = {layers: [], globals: [], resources: []};
+
+function content(value) {
+    if (value === null || value === undefined) return null;
+    if (typeof value === 'string') return value;
+    if (value.outerHTML) return value.outerHTML;
+    if (typeof value === 'function') {
+        try { return content(value()); } catch (e) { return null; }
+    }
+    return null;
+}
+
+function json(value) {
+    try {
+        var text = JSON.stringify(value);
+        return text && text.length <= maxChars ? text : null;
+    } catch (e) {
+        return null;
+    }
+}
+
+function marker(lat, lng, popup, title, properties) {
+    if (typeof lat === 'number' && typeof lng === 'number') {
+        out.layers.push({lat: lat, lng: lng, popup: popup, title: title || null, properties: properties || null});
+    }
+}
+
+// Leaflet: markers, with cluster and feature groups walked for their children
+function leafletLayer(layer, seen) {
+    if (!layer || seen.indexOf(layer) !== -1) return;
+    seen.push(layer);
+    if (typeof layer.getLatLng === 'function') {
+        var latlng = layer.getLatLng();
+        var popup = layer.getPopup && layer.getPopup();
+        var tooltip = layer.getTooltip && layer.getTooltip();
+        marker(latlng.lat, latlng.lng, popup ? content(popup.getContent()) : null,
+               (layer.options && (layer.options.title || layer.options.alt)) || (tooltip ? content(tooltip.getContent()) : null),
+               layer.feature ? json(layer.feature.properties) : json({url: layer.url || (layer.options && layer.options.url)}));
+    }
+    if (typeof layer.getLayers === 'function') {
+        layer.getLayers().forEach(function(child) { leafletLayer(child, seen); });
+    }
+}
+
+// OpenLayers: point features of vector (and cluster) sources
+function olFeature(feature) {
+    var grouped = feature.get && feature.get('features');
+    if (grouped && grouped.length) {
+        grouped.forEach(olFeature);
+        return;
+    }
+    var geometry = feature.getGeometry && feature.getGeometry();
+    if (!geometry || geometry.getType() !== 'Point') return;
+    var lonlat = window.ol.proj.toLonLat(geometry.getCoordinates());
+    var properties = Object.assign({}, feature.getProperties());
+    delete properties[feature.getGeometryName()];
+    marker(lonlat[1], lonlat[0], null, properties.title || properties.name, json(properties));
+}
+
+function inspect(value, seen) {
+    if (!value || typeof value !== 'object') return false;
+    if (window.L && window.L.Map && value instanceof window.L.Map) {
+        value.eachLayer(function(layer) { leafletLayer(layer, seen); });
+        return true;
+    }
+    if (window.ol && window.ol.Map && value instanceof window.ol.Map) {
+        value.getLayers().forEach(function(layer) {
+            var source = layer.getSource && layer.getSource();
+            if (source && source.getSource && !source.getFeatures().length) source = source.getSource();
+            if (source && source.getFeatures) source.getFeatures().forEach(olFeature);
+        });
+        return true;
+    }
+    if (Array.isArray(value) && value.length && value[0] && typeof value[0].getPosition === 'function') {
+        // Google Maps markers kept in an array
+        value.forEach(function(m) {
+            var position = m.getPosition && m.getPosition();
+            if (position) marker(position.lat(), position.lng(), null, m.getTitle && m.getTitle(), json({url: m.url}));
+        });
+        return true;
+    }
+    return false;
+}
+
+var seen = [];
+Object.keys(window).slice(0, 5000).forEach(function(key) {
+    var value;
+    try { value = window[key]; } catch (e) { return; }
+    if (!value || typeof value !== 'object' || value === window || value.nodeType) return;
+    if (inspect(value, seen)) return;
+
+    // Maps kept one level down (e.g. window.app.map), and plain marker data
+    if (!Array.isArray(value)) {
+        Object.keys(value).slice(0, 200).forEach(function(k) {
+            try { inspect(value[k], seen); } catch (e) {}
+        });
+    }
+    var text = json(value);
+    if (text && /"(lat|latitude|lng|lon|longitude|coordinates)"\\s*:/.test(text)) {
+        out.globals.push(text);
+    }
+});
+
+if (window.performance && performance.getEntriesByType) {
+    performance.getEntriesByType('resource').forEach(function(entry) {
+        if (entry.initiatorType === 'fetch' || entry.initiatorType === 'xmlhttprequest' ||
+            /\\.(geo)?json(\\?|$)/i.test(entry.name)) {
+            out.resources.push(entry.name);
+        }
+    });
+}
+
+return out;
+"""
+
+# Key pairs that hold a point's latitude and longitude
+COORDINATE_KEYS = [('lat', 'lng'), ('lat', 'lon'), ('latitude', 'longitude'), ('Lat', 'Lng'), ('Latitude', 'Longitude')]
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def coordinates(node):
+    """(lat, lng) of a dict describing a point (plain keys, GeoJSON or a nested position), or None"""
+    for lat_key, lng_key in COORDINATE_KEYS:
+        if lat_key in node and lng_key in node:
+            lat, lng = _number(node[lat_key]), _number(node[lng_key])
+            if lat is not None and lng is not None and -90 <= lat <= 90 and -180 <= lng <= 180:
+                return lat, lng
+    
+    geometry = node.get('geometry')
+    if isinstance(geometry, dict) and geometry.get('type') == 'Point' and len(geometry.get('coordinates') or []) >= 2:
+        lng, lat = _number(geometry['coordinates'][0]), _number(geometry['coordinates'][1])
+        if lat is not None and lng is not None:
+            return lat, lng
+    
+    for key in ('position', 'latlng', 'latLng', 'coords', 'location'):
+        if isinstance(node.get(key), dict):
+            point = coordinates(node[key])
+            if point:
+                return point
+    return None
+
+def _title(node):
+    properties = node.get('properties') if isinstance(node.get('properties'), dict) else {}
+    for source in (node, properties):
+        for key in ('title', 'name', 'label'):
+            if isinstance(source.get(key), str) and source[key].strip():
+                return source[key].strip()
+    return None
+
+def _links(texts, base_url, link_filter):
+    links = []
+    for text in texts:
+        if text:
+            links.extend(link for link in links_in_payload(text, base_url) if link_filter is None or link_filter(link))
+    return list(dict.fromkeys(links))
+
+def markers_in_layers(layers, base_url, link_filter=None):
+    """Markers from the map layers read by MAP_DATA_JS"""
+    markers = []
+    for layer in layers or []:
+        for link in _links([layer.get('popup'), layer.get('properties')], base_url, link_filter):
+            markers.append({'url': link, 'lat': layer['lat'], 'lng': layer['lng'], 'title': layer.get('title')})
+    return markers
+
+def markers_in_payload(payload, base_url, link_filter=None):
+    """Markers in JSON data: every object with coordinates and at least one matching link"""
+    markers = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            point = coordinates(node)
+            if point:
+                for link in _links([json.dumps(node)], base_url, link_filter):
+                    markers.append({'url': link, 'lat': point[0], 'lng': point[1], 'title': _title(node)})
+                continue
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return markers
+
+def extract_markers(driver, fetcher, base_url, link_filter=None, throttle=None):
+    """
+    All markers of the map in the current page, as dicts with url, lat, lng and title
+    
+    Map layers are used first, then page globals, then the JSON responses
+    the page loaded (fetched again with fetcher). One marker per canonical link.
+    """
+    data = driver.execute_script(MAP_DATA_JS, MAX_RECORDED_CHARS) or {}
+    
+    markers = markers_in_layers(data.get('layers'), base_url, link_filter)
+    if markers:
+        print(f"  Read {len(markers)} markers from the map layers")
+    
+    if not markers:
+        for text in data.get('globals') or []:
+            markers.extend(markers_in_payload(json.loads(text), base_url, link_filter))
+        if markers:
+            print(f"  Read {len(markers)} markers from the page's map data")
+    
+    if not markers:
+        for url in data.get('resources') or []:
+            try:
+                with throttle.slot(url) if throttle else nullcontext():
+                    payload = fetcher.get(url).json()
+            except Exception:
+                continue
+            found = markers_in_payload(payload, base_url, link_filter)
+            if found:
+                print(f"  Read {len(found)} markers from {url}")
+                markers.extend(found)
+    
+    unique = {}
+    for marker in markers:
+        url = canonicalize(marker['url'])
+        unique.setdefault(url, dict(marker, url=url))
+    return list(unique.values())
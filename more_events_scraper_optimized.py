@@ -5,17 +5,68 @@ URL: https://www.more.com/gr-en/tickets/
 """
 
 from scraper_base import BaseScraper
-from selenium.webdriver.common.by import By
+from url_canon import canonical_links
+from date_parser import find_date
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import json
 import os
-import time
+import re
 import config
 
 class MoreEventsScraperOptimized(BaseScraper):
-    def __init__(self, headless=False):
-        super().__init__(headless)
+    ready_selectors = ('h1',)
+    network_idle_ms = 300
+    
+    # Links to event pages on the listing
+    link_selectors = ['a[href*="/tickets/"]', 'a[href*="/event"]', 'article a', '.event a', '.card a']
+    
+    # Field spec for detail pages, extracted with a single execute_script call
+    detail_spec = {
+        'title': {'selectors': ['h1']},
+        'page_title': {'selectors': ['title']},
+        'description': {
+            'selectors': ['article p, .content p, .description p, main p, [class*="description"] p'],
+            'all': True, 'scan_limit': 3, 'min_length': 21, 'join': ' '
+        },
+        'date': {
+            'selectors': ['.event-date', '.date', 'time', '[class*="date"]', '[datetime]',
+                          '.when', '[class*="when"]', '[class*="time"]', '.schedule', '[class*="schedule"]'],
+            'min_length': 2
+        },
+        'body_text': {'selectors': ['body']},
+        'meta_date': {
+            'selectors': ['meta[property="event:start_date"], meta[name="date"]'],
+            'attr': 'content'
+        },
+        'location': {
+            'selectors': ['.location', '.venue', '[class*="location"]', '[class*="venue"]',
+                          '.where', '[class*="where"]', '[class*="place"]'],
+            'min_length': 2
+        },
+        'price': {
+            'selectors': ['.price', '[class*="price"]', '.cost', '[class*="ticket"]', '[class*="admission"]'],
+            'min_length': 2
+        },
+        'category': {
+            'selectors': ['.category', '[class*="category"]', '.tag', '[class*="tag"]', '.genre', '[class*="genre"]'],
+            'min_length': 2
+        },
+        'images': {
+            'selectors': ['img[src*="more.com"]', 'img[src*="jpg"]', 'img[src*="jpeg"]', 'img[src*="png"]',
+                          'img[src*="webp"]', 'article img', '.content img', 'main img',
+                          '[class*="image"] img', '[class*="photo"] img', '[class*="picture"] img', 'img'],
+            'attr': 'src', 'all': True, 'limit': 3,
+            'exclude': ['logo', 'icon', 'avatar', 'sprite']
+        },
+        'background_styles': {
+            'selectors': ['[style*="background-image"], [class*="image"], [class*="photo"]'],
+            'attr': 'style', 'all': True, 'scan_limit': 3
+        },
+    }
+    
+    def __init__(self, headless=False, driver_pool=None):
+        super().__init__(headless, driver_pool)
         self.base_url = "https://www.more.com"
         self.events_url = "https://www.more.com/gr-en/tickets/"
         self.scraped_urls = set()
@@ -71,8 +122,8 @@ class MoreEventsScraperOptimized(BaseScraper):
                 pass
         return set()
     
-    def scrape_all_events(self, max_events=5000, resume=True):
-        """Scrape all events with resume capability"""
+    def scrape_all_events(self, max_events=5000, resume=True, known_urls=None):
+        """Scrape all events with resume capability, skipping stored ones seen recently"""
         # Load previous progress
         all_events, scraped_urls = self.load_progress() if resume else ([], set())
         self.scraped_urls = scraped_urls
@@ -82,37 +133,18 @@ class MoreEventsScraperOptimized(BaseScraper):
         
         # If no links loaded, collect them
         if not event_links:
-            self.setup_driver()
-            
             try:
                 print(f"Navigating to {self.events_url}...")
-                self.driver.get(self.events_url)
-                time.sleep(5)
                 
+                # The browser is only started if the listing endpoint can't be replayed
                 print("\nCollecting event links...")
-                last_count = 0
-                no_change = 0
-                
-                for scroll in range(100):
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-                    
-                    current_links = self.find_event_links()
-                    event_links.update(current_links)
-                    
-                    if len(event_links) == last_count:
-                        no_change += 1
-                        if no_change >= 5:
-                            break
-                    else:
-                        no_change = 0
-                        if scroll % 5 == 0:
-                            print(f"  Scroll {scroll + 1}: {len(event_links)} events found")
-                    
-                    last_count = len(event_links)
-                    
-                    if len(event_links) >= max_events:
-                        break
+                event_links.update(self.collect_listing_links(
+                    self.events_url,
+                    link_selector=', '.join(self.link_selectors),
+                    link_filter=self.is_event_link,
+                    ready_selectors=['a[href*="/tickets/"]'],
+                    max_items=max_events
+                ))
                 
                 self.save_links(event_links)
                 print(f"\n{'='*60}")
@@ -128,6 +160,7 @@ class MoreEventsScraperOptimized(BaseScraper):
         
         # Filter remaining links
         remaining_links = [link for link in event_links if link not in scraped_urls]
+        remaining_links = self.skip_known(remaining_links, known_urls)
         remaining_links = remaining_links[:max_events - len(all_events)]
         
         print(f"\nAlready scraped: {len(all_events)}")
@@ -144,30 +177,23 @@ class MoreEventsScraperOptimized(BaseScraper):
         try:
             print(f"\nScraping events...\n")
             
-            for idx, link in enumerate(remaining_links):
-                try:
-                    current_total = len(all_events) + 1
-                    print(f"[{current_total}/{len(event_links)}] {link.split('/')[-2][:40]}...")
-                    
-                    event = self.scrape_event(link)
-                    
-                    if event and event.get('title'):
-                        self.save_event(event, all_events)
-                        self.scraped_urls.add(link)
-                        print(f"  ✓ {event['title'][:50]}")
-                    else:
-                        print(f"  ✗ No data")
-                    
-                    time.sleep(0.5)
-                    
-                except KeyboardInterrupt:
-                    print(f"\n\n⚠ Interrupted! Progress saved: {len(all_events)} events")
-                    print(f"Run again to resume from event {len(all_events) + 1}")
-                    break
-                    
-                except Exception as e:
-                    print(f"  ✗ Error: {e}")
-                    continue
+            # Each finished event is saved immediately, so an interrupted run can resume
+            def report(idx, link, event):
+                current_total = len(all_events) + 1
+                print(f"[{current_total}/{len(event_links)}] {link.split('/')[-2][:40]}...")
+                
+                if event and event.get('title'):
+                    self.save_event(event, all_events)
+                    self.scraped_urls.add(link)
+                    print(f"  ✓ {event['title'][:50]}")
+                else:
+                    print(f"  ✗ No data")
+            
+            try:
+                self.fetch_details(remaining_links, 'scrape_event', on_result=report)
+            except KeyboardInterrupt:
+                print(f"\n\n⚠ Interrupted! Progress saved: {len(all_events)} events")
+                print(f"Run again to resume from event {len(all_events) + 1}")
             
             print(f"\n{'='*60}")
             print(f"Total: {len(all_events)} events")
@@ -183,214 +209,76 @@ class MoreEventsScraperOptimized(BaseScraper):
         links = set()
         
         try:
-            selectors = [
-                'a[href*="/tickets/"]',
-                'a[href*="/event"]',
-                'article a',
-                '.event a',
-                '.card a'
-            ]
+            # All hrefs in one round-trip
+            hrefs = self.extract_fields({
+                'links': {'selectors': self.link_selectors, 'attr': 'href', 'all': True}
+            }).get('links', [])
             
-            for selector in selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    
-                    for element in elements:
-                        href = element.get_attribute('href')
-                        
-                        if (href and 
-                            self.base_url in href and
-                            ('/tickets/' in href or '/event' in href) and
-                            href != self.events_url and
-                            not href.endswith('/tickets/')):
-                            links.add(href)
-                except:
-                    continue
+            links.update(href for href in hrefs if self.is_event_link(href))
         except:
             pass
         
-        return links
+        return canonical_links(links)
+    
+    def is_event_link(self, href):
+        """Whether a link points to an event page"""
+        return bool(href and
+                    self.base_url in href and
+                    ('/tickets/' in href or '/event' in href) and
+                    href != self.events_url and
+                    not href.endswith('/tickets/'))
     
     def scrape_event(self, url):
         """Scrape ONLY essential data from event"""
         try:
-            self.driver.get(url)
-            time.sleep(3)
+            self.load_page(url)
+            
+            # Structured data first, then the selectors for whatever it didn't have
+            data = self.extract_detail_fields(self.detail_spec)
             
             event = {'url': url}
             
             # Extract title
-            try:
-                h1 = self.driver.find_element(By.TAG_NAME, 'h1')
-                event['title'] = h1.text.strip()
-            except:
-                event['title'] = self.driver.title.split('|')[0].strip()
+            event['title'] = data.get('title') or (data.get('page_title') or '').split('|')[0].strip()
             
             # Extract brief description (first 3 paragraphs only)
-            description_lines = []
-            try:
-                p_elements = self.driver.find_elements(By.CSS_SELECTOR, 
-                    'article p, .content p, .description p, main p, [class*="description"] p')
-                
-                for p in p_elements[:3]:  # Only first 3 paragraphs
-                    text = p.text.strip()
-                    if text and len(text) > 20:
-                        description_lines.append(text)
-                
-                event['description'] = ' '.join(description_lines) if description_lines else None
-            except:
-                event['description'] = None
+            event['description'] = data.get('description')
             
-            # Extract date - try multiple methods
-            date = None
+            # Extract date - specific selectors first, then text patterns, then meta tags
+            date = data.get('date')
             
-            # Method 1: Try specific selectors
-            date = self.find_text_by_selectors([
-                '.event-date', '.date', 'time', '[class*="date"]', '[datetime]',
-                '.when', '[class*="when"]', '[class*="time"]', '.schedule',
-                '[class*="schedule"]'
-            ])
-            
-            # Method 2: If no date found, search in all text for date patterns
             if not date:
-                try:
-                    import re
-                    body_text = self.driver.find_element(By.TAG_NAME, 'body').text
-                    
-                    # Look for date patterns like "17 Jan - 15 Feb 2026" or "1 June 2026"
-                    date_patterns = [
-                        r'\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(?:-\s+\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+)?\d{4}',
-                        r'\d{1,2}/\d{1,2}/\d{4}',
-                        r'\d{1,2}\.\d{1,2}\.\d{4}',
-                        r'\d{1,2}-\d{1,2}-\d{4}',
-                        r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}',
-                        r'\d{1,2}\s+(?:Ιαν|Φεβ|Μαρ|Απρ|Μαΐ|Ιουν|Ιουλ|Αυγ|Σεπ|Οκτ|Νοε|Δεκ)[α-ωά-ώ]*\s+\d{4}'
-                    ]
-                    
-                    for pattern in date_patterns:
-                        matches = re.findall(pattern, body_text, re.IGNORECASE)
-                        if matches:
-                            date = matches[0]
-                            break
-                except:
-                    pass
+                # The first date or range in the text, like "17 Jan - 15 Feb 2026" or "1 Ιουνίου 2026"
+                date = find_date(data.get('body_text'))[0]
             
-            # Method 3: Look in meta tags
             if not date:
-                try:
-                    meta_date = self.driver.find_element(By.CSS_SELECTOR, 
-                        'meta[property="event:start_date"], meta[name="date"]')
-                    date = meta_date.get_attribute('content')
-                except:
-                    pass
+                date = data.get('meta_date')
             
             event['date'] = date
+            event['end_date'] = data.get('end_date')
+            event['location'] = data.get('location')
+            event['price'] = data.get('price')
+            event['category'] = data.get('category')
             
-            # Extract location
-            event['location'] = self.find_text_by_selectors([
-                '.location', '.venue', '[class*="location"]', '[class*="venue"]',
-                '.where', '[class*="where"]', '[class*="place"]'
-            ])
-            
-            # Extract price
-            event['price'] = self.find_text_by_selectors([
-                '.price', '[class*="price"]', '.cost', '[class*="ticket"]',
-                '[class*="admission"]'
-            ])
+            # Extract ONLY 2-3 main images
+            images = data.get('images') or []
             
-            # Extract category
-            event['category'] = self.find_text_by_selectors([
-                '.category', '[class*="category"]', '.tag', '[class*="tag"]',
-                '.genre', '[class*="genre"]'
-            ])
-            
-            # Extract ONLY 2-3 main images - try harder to find them
-            images = []
-            try:
-                # Try multiple strategies to find images
-                img_selectors = [
-                    'img[src*="more.com"]',  # Images from more.com domain
-                    'img[src*="jpg"]',
-                    'img[src*="jpeg"]',
-                    'img[src*="png"]',
-                    'img[src*="webp"]',
-                    'article img',
-                    '.content img',
-                    'main img',
-                    '[class*="image"] img',
-                    '[class*="photo"] img',
-                    '[class*="picture"] img',
-                    'img'  # All images as last resort
-                ]
-                
-                for selector in img_selectors:
+            # If no images, try to get from background-image CSS
+            if not images:
+                for style in data.get('background_styles') or []:
+                    for url_found in re.findall(r'url\(["\']?([^"\']+)["\']?\)', style):
+                        if url_found and url_found not in images:
+                            images.append(url_found)
                     if len(images) >= 3:
                         break
-                    
-                    try:
-                        img_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        
-                        for img in img_elements:
-                            src = img.get_attribute('src')
-                            
-                            # Filter out logos, icons, and small images
-                            if (src and 
-                                'logo' not in src.lower() and 
-                                'icon' not in src.lower() and
-                                'avatar' not in src.lower() and
-                                'sprite' not in src.lower() and
-                                src not in images):
-                                
-                                images.append(src)
-                                
-                                if len(images) >= 3:
-                                    break
-                    except:
-                        continue
-                
-                event['images'] = images
-            except:
-                event['images'] = []
+                images = images[:3]
             
-            # If still no images, try to get from background-image CSS
-            if not images:
-                try:
-                    elements_with_bg = self.driver.find_elements(By.CSS_SELECTOR, 
-                        '[style*="background-image"], [class*="image"], [class*="photo"]')
-                    
-                    for elem in elements_with_bg[:3]:
-                        style = elem.get_attribute('style')
-                        if style and 'url(' in style:
-                            # Extract URL from background-image
-                            import re
-                            urls = re.findall(r'url\(["\']?([^"\']+)["\']?\)', style)
-                            for url_found in urls:
-                                if url_found and url_found not in images:
-                                    images.append(url_found)
-                                    if len(images) >= 3:
-                                        break
-                    
-                    event['images'] = images
-                except:
-                    pass
+            event['images'] = images
             
             return event
             
         except Exception as e:
             return None
-    
-    def find_text_by_selectors(self, selectors):
-        """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 1:
-                        return text
-            except:
-                continue
-        return None
 
 if __name__ == "__main__":
     print("More.com Events Scraper (Optimized & Resumable)")
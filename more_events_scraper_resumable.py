@@ -5,6 +5,7 @@ URL: https://www.more.com/gr-en/tickets/
 """
 
 from scraper_base import BaseScraper
+from url_canon import canonical_links
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -177,7 +178,8 @@ class MoreEventsScraperResumable(BaseScraper):
                     current_total = len(all_events) + 1
                     print(f"[{current_total}/{len(event_links)}] {link.split('/')[-2][:50]}...")
                     
-                    event = self.scrape_event(link)
+                    with self.throttle.slot(link):
+                        event = self.scrape_event(link)
                     
                     if event and event.get('title'):
                         self.save_event(event, all_events)
@@ -186,8 +188,6 @@ class MoreEventsScraperResumable(BaseScraper):
                     else:
                         print(f"  ✗ No data extracted")
                     
-                    time.sleep(0.5)
-                    
                 except KeyboardInterrupt:
                     print(f"\n\n⚠ Interrupted by user!")
                     print(f"✓ Progress saved: {len(all_events)} events")
@@ -246,7 +246,7 @@ class MoreEventsScraperResumable(BaseScraper):
         except Exception as e:
             print(f"Error finding links: {e}")
         
-        return links
+        return canonical_links(links)
     
     def scrape_event(self, url):
         """Scrape ALL data from a single event"""
@@ -307,19 +307,6 @@ class MoreEventsScraperResumable(BaseScraper):
         except Exception as e:
             print(f"    Error scraping {url}: {e}")
             return None
-    
-    def find_text_by_selectors(self, selectors):
-        """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 1:
-                        return text
-            except:
-                continue
-        return None
 
 if __name__ == "__main__":
     print("More.com Events Scraper (Resumable)")
@@ -0,0 +1,155 @@
+"""
+Persistent page cache with conditional revalidation
+Stores each fetched page (body, ETag, Last-Modified, fetch time) and the
+record extracted from it in a SQLite file under OUTPUT_DIR, keyed by the
+same canonical URL as events (url_canon.canonicalize). Later fetches send
+If-None-Match / If-Modified-Since; a 304, or a body identical to the stored
+one, hands back the stored record so the page is neither downloaded nor
+extracted again.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import config
+from url_canon import canonicalize
+
+CACHE_FILE = os.path.join(config.OUTPUT_DIR, 'page_cache.db')
+
+# Run eviction after this many stores
+EVICT_EVERY = 200
+
+def body_hash(body):
+    return hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+class PageCache:
+    """On-disk cache of fetched pages and their extracted records"""
+    
+    def __init__(self, path=CACHE_FILE, max_bytes=None, max_age=None):
+        self.path = path
+        self.max_bytes = max_bytes if max_bytes is not None else config.PAGE_CACHE_MAX_MB * 1024 * 1024
+        self.max_age = max_age if max_age is not None else config.PAGE_CACHE_MAX_AGE_DAYS * 86400
+        self._lock = threading.Lock()
+        self._stores = 0
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                body BLOB,
+                body_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                accessed_at REAL,
+                size INTEGER,
+                record TEXT
+            )
+        """)
+        self._conn.commit()
+        self.evict()
+    
+    def get(self, url):
+        """Stored entry for a URL as a dict, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, body_hash, etag, last_modified, fetched_at, record FROM pages WHERE url = ?",
+                (canonicalize(url),)
+            ).fetchone()
+        
+        if not row:
+            return None
+        
+        body, digest, etag, last_modified, fetched_at, record = row
+        return {
+            'body': zlib.decompress(body).decode('utf-8') if body else None,
+            'body_hash': digest,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': fetched_at,
+            'record': json.loads(record) if record else None,
+        }
+    
+    def validators(self, entry):
+        """Conditional request headers for a stored entry"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def store(self, url, body, etag=None, last_modified=None):
+        """Store a freshly downloaded page; any stored record is dropped"""
+        compressed = zlib.compress(body.encode('utf-8'))
+        now = time.time()
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, body, body_hash, etag, last_modified, fetched_at, accessed_at, size, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL)",
+                (canonicalize(url), compressed, body_hash(body), etag, last_modified, now, now, len(compressed))
+            )
+            self._conn.commit()
+            self._stores += 1
+            evict = self._stores % EVICT_EVERY == 0
+        
+        if evict:
+            self.evict()
+    
+    def touch(self, url):
+        """Mark an entry as revalidated now"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                               (now, now, canonicalize(url)))
+            self._conn.commit()
+    
+    def store_record(self, url, record):
+        """Attach the record extracted from the stored page"""
+        with self._lock:
+            self._conn.execute("UPDATE pages SET record = ? WHERE url = ?",
+                               (json.dumps(record, ensure_ascii=False, default=str), canonicalize(url)))
+            self._conn.commit()
+    
+    def evict(self):
+        """Drop entries older than max_age, then least recently used ones above max_bytes"""
+        with self._lock:
+            if self.max_age:
+                self._conn.execute("DELETE FROM pages WHERE fetched_at < ?", (time.time() - self.max_age,))
+            
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            if self.max_bytes and total > self.max_bytes:
+                rows = self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall()
+                stale = []
+                for url, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((url,))
+                    total -= size
+                self._conn.executemany("DELETE FROM pages WHERE url = ?", stale)
+            
+            self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_page_cache():
+    """The page cache shared by all scrapers, or None when disabled"""
+    global _shared
+    
+    if not config.PAGE_CACHE:
+        return None
+    
+    with _shared_lock:
+        if _shared is None:
+            _shared = PageCache(path=CACHE_FILE)
+        return _shared
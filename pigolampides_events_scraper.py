@@ -4,6 +4,7 @@ URL: https://pigolampides.gr/events/
 """
 
 from scraper_base import BaseScraper
+from url_canon import canonical_links
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -92,7 +93,8 @@ class PigolampidesEventsScraper(BaseScraper):
                 
                 try:
                     print(f"[{idx + 1}/{len(event_links)}] {link.split('/')[-2][:50]}...")
-                    event = self.scrape_event(link)
+                    with self.throttle.slot(link):
+                        event = self.scrape_event(link)
                     
                     if event and event.get('title'):
                         all_events.append(event)
@@ -101,8 +103,6 @@ class PigolampidesEventsScraper(BaseScraper):
                     else:
                         print(f"  ✗ No data extracted")
                     
-                    time.sleep(0.5)
-                    
                 except Exception as e:
                     print(f"  ✗ Error: {e}")
                     continue
@@ -157,7 +157,7 @@ class PigolampidesEventsScraper(BaseScraper):
         except Exception as e:
             print(f"Error finding links: {e}")
         
-        return links
+        return canonical_links(links)
     
     def scrape_event(self, url):
         """Scrape ALL data from a single event in simple format"""
@@ -229,19 +229,6 @@ class PigolampidesEventsScraper(BaseScraper):
             print(f"    Error scraping {url}: {e}")
             return None
     
-    def find_text_by_selectors(self, selectors):
-        """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 1:
-                        return text
-            except:
-                continue
-        return None
-    
     def save_events(self, events, filename='pigolampides_events.json'):
         """Save events to JSON"""
         os.makedirs(config.OUTPUT_DIR, exist_ok=True)
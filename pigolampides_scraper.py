@@ -4,104 +4,121 @@ URL: https://pigolampides.gr/blog/
 """
 
 from scraper_base import BaseScraper
-from selenium.webdriver.common.by import By
+from url_canon import canonical_links, canonicalize
+from wordpress_api import WordPressApi, html_text, paragraphs, images
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import json
 import os
-import time
 import config
 
 class PigolampidesScraper(BaseScraper):
-    def __init__(self, headless=False):
-        super().__init__(headless)
+    ready_selectors = ('h1',)
+    
+    # The "Load More" control is only clicked when visible, which needs CSS
+    lean_allow = ('stylesheet',)
+    
+    # Links to blog posts on the listing, and labels of its "Load More" control
+    link_selectors = ['article a', '.post a', '.blog-post a', '[class*="post"] a', '[class*="article"] a', 'a[href*="/blog/"]']
+    load_more_texts = ['Load more', 'Περισσότερα', 'Φόρτωση']
+    
+    # WordPress renders posts server-side
+    detail_needs_js = False
+    
+    # Field spec for post pages, extracted with a single execute_script call
+    detail_spec = {
+        'title': {'selectors': ['h1']},
+        'page_title': {'selectors': ['title']},
+        'date': {
+            'selectors': ['.date', 'time', '[class*="date"]', '[datetime]', '.published', '[class*="published"]'],
+            'min_length': 2
+        },
+        'author': {
+            'selectors': ['.author', '[class*="author"]', '[rel="author"]', '.byline'],
+            'min_length': 2
+        },
+        'categories': {
+            'selectors': ['.category, .tag, [rel="category"], [rel="tag"]'],
+            'all': True
+        },
+        'content': {
+            'selectors': ['article p, .content p, .post-content p, .entry-content p, main p'],
+            'all': True, 'min_length': 21
+        },
+        'excerpt': {
+            'selectors': ['.excerpt', '.summary', '[class*="excerpt"]', '[class*="summary"]'],
+            'min_length': 2
+        },
+        'images': {
+            'selectors': ['article img, .content img, .post-content img, main img'],
+            'attrs': ['src', 'alt'], 'all': True, 'scan_limit': 10,
+            'exclude': ['logo', 'icon']
+        },
+        'full_text': {'selectors': ['body']},
+    }
+    
+    def __init__(self, headless=False, driver_pool=None):
+        super().__init__(headless, driver_pool)
         self.base_url = "https://pigolampides.gr"
         self.blog_url = "https://pigolampides.gr/blog/"
         self.scraped_urls = set()
+        self._api_posts = None
     
-    def scrape_all_posts(self, max_posts=200):
+    def scrape_all_posts(self, max_posts=200, known_urls=None):
         """
         Scrape all blog posts from Pigolampides
+        
+        Posts come from the WordPress REST API when the site serves it, only
+        asking for posts modified since the last run. Otherwise the blog is
+        scraped in the browser, skipping posts already stored and seen
+        recently (per known_urls).
         """
-        self.setup_driver()
+        if config.WP_API:
+            posts = self.scrape_posts_from_api(max_posts)
+            if posts is not None:
+                return posts
+            print("Scraping the blog in the browser instead")
+        
+        # The browser is started on first use: a replayed listing needs none
         all_posts = []
         post_links = set()
         
         try:
             print(f"Navigating to {self.blog_url}...")
-            self.driver.get(self.blog_url)
-            time.sleep(4)
             
-            # Scroll and load all posts
+            # Scroll and load all posts (or page through the recorded listing endpoint)
             print("\nLoading all blog posts...")
-            last_count = 0
-            no_change = 0
-            
-            for scroll in range(50):
-                # Scroll down
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                # Collect post links
-                current_links = self.find_post_links()
-                post_links.update(current_links)
-                
-                if len(post_links) == last_count:
-                    no_change += 1
-                    if no_change >= 3:
-                        print(f"  No new posts after {no_change} scrolls")
-                        break
-                else:
-                    no_change = 0
-                    print(f"  Scroll {scroll + 1}: {len(post_links)} posts found")
-                
-                last_count = len(post_links)
-                
-                if len(post_links) >= max_posts:
-                    break
-                
-                # Try to click "Load More" or pagination
-                try:
-                    load_more = self.driver.find_element(By.CSS_SELECTOR, 
-                        'button, a[class*="load"], [class*="more"], .pagination a')
-                    
-                    if load_more.is_displayed():
-                        print(f"  Clicking: {load_more.text}")
-                        load_more.click()
-                        time.sleep(2)
-                except:
-                    pass
+            post_links.update(self.collect_listing_links(
+                self.blog_url,
+                link_selector=', '.join(self.link_selectors),
+                link_filter=self.is_post_link,
+                ready_selectors=['a[href*="/blog/"]'],
+                button_texts=self.load_more_texts,
+                button_selectors=['a[class*="load"]', 'button[class*="load"]', '[class*="more"] button'],
+                max_items=max_posts
+            ))
             
             print(f"\n{'='*60}")
             print(f"Total post links collected: {len(post_links)}")
             print(f"{'='*60}")
             
-            # Limit to max_posts
-            post_links = list(post_links)[:max_posts]
+            # Limit to max_posts, leaving out recently seen posts
+            post_links = self.skip_known(post_links, known_urls)[:max_posts]
             
-            # Scrape each post
+            # Scrape each post (crawled concurrently over HTTP, browser fallback in parallel when DETAIL_WORKERS > 1)
+            post_links = [link for link in post_links if link not in self.scraped_urls]
             print(f"\nScraping {len(post_links)} blog posts...\n")
             
-            for idx, link in enumerate(post_links):
-                if link in self.scraped_urls:
-                    continue
-                
-                try:
-                    print(f"[{idx + 1}/{len(post_links)}] {link.split('/')[-2][:50]}...")
-                    post = self.scrape_post(link)
-                    
-                    if post and post.get('title'):
-                        all_posts.append(post)
-                        self.scraped_urls.add(link)
-                        print(f"  ✓ {post['title'][:60]}")
-                    else:
-                        print(f"  ✗ No data extracted")
-                    
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    print(f"  ✗ Error: {e}")
-                    continue
+            def report(idx, link, post):
+                print(f"[{idx + 1}/{len(post_links)}] {link.split('/')[-2][:50]}...")
+                if post and post.get('title'):
+                    self.scraped_urls.add(link)
+                    print(f"  ✓ {post['title'][:60]}")
+                else:
+                    print(f"  ✗ No data extracted")
+            
+            posts = self.fetch_details(post_links, 'scrape_post', on_result=report)
+            all_posts.extend(post for post in posts if post and post.get('title'))
             
             print(f"\n{'='*60}")
             print(f"Successfully scraped {len(all_posts)} posts")
@@ -117,159 +134,114 @@ class PigolampidesScraper(BaseScraper):
         
         return all_posts
     
+    def scrape_posts_from_api(self, max_posts=200):
+        """Posts from the WordPress REST API, or None when it can't be used"""
+        api = WordPressApi(self.http, self.base_url, type(self).__name__, throttle=self.throttle)
+        
+        try:
+            items = api.posts(max_items=max_posts)
+            if items is None:
+                return None
+            
+            posts = [post for post in map(self.build_api_post, items) if post.get('title')]
+            self.scraped_urls.update(post['url'] for post in posts)
+            self._api_posts = (api, items)
+            
+            print(f"\n{'='*60}")
+            print(f"Successfully loaded {len(posts)} posts from the API")
+            print(f"{'='*60}")
+            return posts
+        
+        finally:
+            self.close()
+    
+    def mark_posts_saved(self):
+        """
+        Record that the API posts of the last scrape are saved
+        
+        Call once they are stored; the next run then only asks the API for
+        posts modified after them. Posts that never got saved are asked for again.
+        """
+        if self._api_posts:
+            api, items = self._api_posts
+            api.mark_done(items)
+            self._api_posts = None
+    
+    def build_api_post(self, item):
+        """Build the post dict from a WordPress REST API post, as build_post() does for pages"""
+        url = canonicalize(item.get('link'))
+        content = (item.get('content') or {}).get('rendered') or ''
+        
+        post_images = [item['featured_image']] if item.get('featured_image') else []
+        for image in images(content, url):
+            lower = image['src'].lower()
+            if image['src'] not in {i['src'] for i in post_images} and not any(w in lower for w in ('logo', 'icon')):
+                post_images.append(image)
+        
+        return self.build_post(url, {
+            'title': html_text((item.get('title') or {}).get('rendered')),
+            'date': item.get('date'),
+            'author': item.get('author_name'),
+            'categories': item.get('category_names'),
+            'content': paragraphs(content),
+            'excerpt': html_text((item.get('excerpt') or {}).get('rendered')) or None,
+            'images': post_images[:10],
+            'full_text': html_text(content),
+        })
+    
     def find_post_links(self):
         """Find all blog post links on current page"""
         links = set()
         
         try:
-            # Try multiple selectors for blog posts
-            selectors = [
-                'article a',
-                '.post a',
-                '.blog-post a',
-                '[class*="post"] a',
-                '[class*="article"] a',
-                'a[href*="/blog/"]'
-            ]
+            # All hrefs in one round-trip
+            hrefs = self.extract_fields({
+                'links': {'selectors': self.link_selectors, 'attr': 'href', 'all': True}
+            }).get('links', [])
             
-            for selector in selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    
-                    for element in elements:
-                        href = element.get_attribute('href')
-                        
-                        # Filter for actual blog post pages
-                        if (href and 
-                            self.base_url in href and
-                            '/blog/' in href and
-                            href != self.blog_url and
-                            not href.endswith('/blog/')):
-                            links.add(href)
-                except:
-                    continue
+            links.update(href for href in hrefs if self.is_post_link(href))
         
         except Exception as e:
             print(f"Error finding links: {e}")
         
-        return links
+        return canonical_links(links)
+    
+    def is_post_link(self, href):
+        """Filter for actual blog post pages"""
+        return bool(href and
+                    self.base_url in href and
+                    '/blog/' in href and
+                    href != self.blog_url and
+                    not href.endswith('/blog/'))
     
     def scrape_post(self, url):
         """Scrape a single blog post"""
         try:
-            self.driver.get(url)
-            time.sleep(3)
-            
-            post = {'url': url}
+            self.load_page(url)
             
-            # Extract title
-            try:
-                h1 = self.driver.find_element(By.TAG_NAME, 'h1')
-                post['title'] = h1.text.strip()
-            except:
-                post['title'] = self.driver.title.split('|')[0].strip()
-            
-            # Extract date
-            post['date'] = self.find_text_by_selectors([
-                '.date',
-                'time',
-                '[class*="date"]',
-                '[datetime]',
-                '.published',
-                '[class*="published"]'
-            ])
-            
-            # Extract author
-            post['author'] = self.find_text_by_selectors([
-                '.author',
-                '[class*="author"]',
-                '[rel="author"]',
-                '.byline'
-            ])
-            
-            # Extract category/tags
-            categories = []
-            try:
-                cat_elements = self.driver.find_elements(By.CSS_SELECTOR, 
-                    '.category, .tag, [rel="category"], [rel="tag"]')
-                
-                for cat in cat_elements:
-                    text = cat.text.strip()
-                    if text:
-                        categories.append(text)
-                
-                post['categories'] = categories
-            except:
-                post['categories'] = []
-            
-            # Extract content
-            content_paragraphs = []
-            try:
-                p_elements = self.driver.find_elements(By.CSS_SELECTOR, 
-                    'article p, .content p, .post-content p, .entry-content p, main p')
-                
-                for p in p_elements:
-                    text = p.text.strip()
-                    if text and len(text) > 20:
-                        content_paragraphs.append(text)
-                
-                post['content'] = content_paragraphs
-            except:
-                post['content'] = []
-            
-            # Extract excerpt/summary
-            post['excerpt'] = self.find_text_by_selectors([
-                '.excerpt',
-                '.summary',
-                '[class*="excerpt"]',
-                '[class*="summary"]'
-            ])
-            
-            # Extract images
-            try:
-                images = []
-                img_elements = self.driver.find_elements(By.CSS_SELECTOR, 
-                    'article img, .content img, .post-content img, main img')
-                
-                for img in img_elements[:10]:
-                    src = img.get_attribute('src')
-                    alt = img.get_attribute('alt')
-                    
-                    if src and 'logo' not in src.lower() and 'icon' not in src.lower():
-                        images.append({
-                            'src': src,
-                            'alt': alt
-                        })
-                
-                post['images'] = images
-            except:
-                post['images'] = []
-            
-            # Extract full text as backup
-            try:
-                body = self.driver.find_element(By.TAG_NAME, 'body')
-                post['full_text'] = body.text[:2000]
-            except:
-                post['full_text'] = None
-            
-            return post
+            # Structured data first, then the selectors for whatever it didn't have
+            return self.build_post(url, self.extract_detail_fields(self.detail_spec))
             
         except Exception as e:
             print(f"    Error scraping {url}: {e}")
             return None
     
-    def find_text_by_selectors(self, selectors):
-        """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 1:
-                        return text
-            except:
-                continue
-        return None
+    def build_post(self, url, data):
+        """Build the post dict from extracted detail_spec fields"""
+        post = {'url': url}
+        post['title'] = data.get('title') or (data.get('page_title') or '').split('|')[0].strip()
+        post['date'] = data.get('date')
+        post['author'] = data.get('author')
+        post['categories'] = data.get('categories') or []
+        post['content'] = data.get('content') or []
+        post['excerpt'] = data.get('excerpt')
+        post['images'] = data.get('images') or []
+        post['full_text'] = (data.get('full_text') or '')[:2000] or None
+        return post
+    
+    def parse_detail_html(self, url, doc):
+        """Extract a blog post from server-rendered HTML with the same field spec"""
+        return self.build_post(url, self.extract_detail_fields(self.detail_spec, doc=doc))
     
     def save_posts(self, posts, filename='pigolampides_blog_posts.json'):
         """Save posts to JSON"""
@@ -298,6 +270,7 @@ if __name__ == "__main__":
     
     if posts:
         filepath = scraper.save_posts(posts)
+        scraper.mark_posts_saved()
         print(f"\n✓ Successfully scraped {len(posts)} blog posts!")
         
         # Show statistics
@@ -0,0 +1,133 @@
+"""
+Per-host rate limiting shared by threads and processes
+Each host has a token bucket (requests per second with a small burst) and a
+limit on requests in flight. State lives in a SQLite file under OUTPUT_DIR,
+so parallel workers and separate scraper processes draw from one budget.
+Limits are configured per host in config.RATE_LIMITS.
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from urllib.parse import urlparse
+import config
+
+LIMITS_FILE = os.path.join(config.OUTPUT_DIR, 'rate_limits.db')
+
+# Leases older than this are treated as abandoned (e.g. a crashed process)
+LEASE_TIMEOUT = 300
+
+# Longest single wait before the bucket is checked again
+MAX_POLL = 0.25
+
+def host_of(url):
+    """Host part of a URL without a leading www."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+class RateLimiter:
+    """
+    Token bucket plus in-flight budget per host
+    
+    Use slot(url) around each request; it blocks until the host has a free
+    in-flight slot and a token, and frees the slot on exit.
+    """
+    
+    def __init__(self, path=LIMITS_FILE, limits=None):
+        self.path = path
+        self.limits = limits if limits is not None else config.RATE_LIMITS
+        self._local = threading.local()
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = self._connection()
+        conn.execute("CREATE TABLE IF NOT EXISTS buckets (host TEXT PRIMARY KEY, tokens REAL, updated REAL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS leases (id TEXT PRIMARY KEY, host TEXT, started REAL)")
+    
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+    
+    def limits_for(self, host):
+        """rate, burst and max_in_flight for a host"""
+        limits = dict(self.limits.get('default', {}))
+        limits.update(self.limits.get(host, {}))
+        return (max(limits.get('rate', 1.0), 0.01),
+                max(limits.get('burst', 1), 1),
+                max(limits.get('max_in_flight', 1), 1))
+    
+    def try_acquire(self, url):
+        """
+        Take a request slot for the URL's host if it has budget now
+        
+        Returns (lease, wait): a lease id for release(), or None and the
+        seconds to wait before trying again.
+        """
+        host = host_of(url)
+        rate, burst, max_in_flight = self.limits_for(host)
+        conn = self._connection()
+        
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM leases WHERE started < ?", (now - LEASE_TIMEOUT,))
+            in_flight = conn.execute("SELECT COUNT(*) FROM leases WHERE host = ?", (host,)).fetchone()[0]
+            
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE host = ?", (host,)).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+            
+            if in_flight < max_in_flight and tokens >= 1:
+                lease = uuid.uuid4().hex
+                conn.execute("INSERT OR REPLACE INTO buckets (host, tokens, updated) VALUES (?, ?, ?)",
+                             (host, tokens - 1, now))
+                conn.execute("INSERT INTO leases (id, host, started) VALUES (?, ?, ?)", (lease, host, now))
+                conn.execute("COMMIT")
+                return lease, 0
+            
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        # Wait until the next token is due, re-checking in-flight slots regularly
+        wait = (1 - tokens) / rate if tokens < 1 else MAX_POLL
+        return None, min(max(wait, 0.01), MAX_POLL)
+    
+    def acquire(self, url):
+        """Block until the URL's host has budget; returns a lease id for release()"""
+        while True:
+            lease, wait = self.try_acquire(url)
+            if lease:
+                return lease
+            time.sleep(wait)
+    
+    def release(self, lease):
+        """Free an in-flight slot"""
+        self._connection().execute("DELETE FROM leases WHERE id = ?", (lease,))
+    
+    @contextmanager
+    def slot(self, url):
+        """Hold a request slot for the URL's host"""
+        lease = self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(lease)
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_rate_limiter():
+    """The rate limiter shared by all scrapers in this process"""
+    global _shared
+    
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter(path=LIMITS_FILE)
+        return _shared
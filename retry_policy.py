@@ -0,0 +1,104 @@
+"""
+Retry policy and per-source circuit breaker
+Transient failures (timeouts, dropped connections, 429 and 5xx answers,
+browser network errors) are retried up to RETRY_ATTEMPTS times with
+exponential backoff and full jitter. A source whose pages keep failing
+trips its circuit breaker, and the rest of it is skipped for the run.
+"""
+import asyncio
+import random
+import threading
+import time
+import requests
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import config
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except:
+    AIOHTTP_AVAILABLE = False
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+# Chrome network errors worth another attempt (name resolution, resets, timeouts)
+RETRYABLE_NET_ERRORS = ('net::ERR_CONNECTION', 'net::ERR_TIMED_OUT', 'net::ERR_NETWORK',
+                        'net::ERR_NAME_NOT_RESOLVED', 'net::ERR_EMPTY_RESPONSE', 'net::ERR_INTERNET_DISCONNECTED')
+
+class CircuitOpenError(Exception):
+    """The source's circuit breaker has tripped"""
+
+def is_retryable(error):
+    """Whether an error is likely transient"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUSES
+    if AIOHTTP_AVAILABLE and isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRYABLE_STATUSES
+    if AIOHTTP_AVAILABLE and isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return True
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, TimeoutException, ConnectionError,
+                          TimeoutError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, WebDriverException):
+        return any(code in str(error) for code in RETRYABLE_NET_ERRORS)
+    return False
+
+def backoff_delay(attempt, base=None, cap=None):
+    """Seconds to wait after the given failed attempt (1-based): exponential with full jitter"""
+    base = config.RETRY_BACKOFF if base is None else base
+    cap = config.RETRY_BACKOFF_MAX if cap is None else cap
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+def call_with_retries(fn, *args, attempts=None, retryable=is_retryable, **kwargs):
+    """Call fn, retrying retryable errors with backoff; the last error is raised"""
+    attempts = max(attempts or config.RETRY_ATTEMPTS, 1)
+    
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt >= attempts or not retryable(e):
+                raise
+            delay = backoff_delay(attempt)
+            print(f"    Retrying in {delay:.1f}s ({attempt}/{attempts - 1}): {e}")
+            time.sleep(delay)
+
+class CircuitBreaker:
+    """
+    Trips after threshold consecutive failures of one source
+    
+    Shared by a scraper and its parallel workers; once open it stays open
+    for the rest of the run. A page attempted again (e.g. in the browser
+    after HTTP) counts as one failure, however often it fails.
+    """
+    
+    def __init__(self, name, threshold=None):
+        self.name = name
+        self.threshold = threshold if threshold is not None else config.CIRCUIT_BREAKER_THRESHOLD
+        self.failures = 0
+        self.is_open = False
+        self._failed = set()
+        self._lock = threading.Lock()
+    
+    def record(self, success, key=None):
+        """Count a page's outcome; key (the page URL) counts each page's failures once"""
+        with self._lock:
+            if success:
+                self.failures = 0
+                return
+            
+            if key is not None:
+                if key in self._failed:
+                    return
+                self._failed.add(key)
+            self.failures += 1
+            if self.threshold and self.failures >= self.threshold and not self.is_open:
+                self.is_open = True
+                print(f"⚠ {self.name}: {self.failures} pages failed in a row, skipping the rest of this source")
+    
+    def check(self):
+        """Raise CircuitOpenError once the breaker has tripped"""
+        if self.is_open:
+            raise CircuitOpenError(f"{self.name} circuit is open")
@@ -4,8 +4,26 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import copy
+import queue
+import threading
 import time
 import config
+from http_fetcher import HttpFetcher, LXML_AVAILABLE, parse_html, css
+from page_cache import get_page_cache
+from sitemap_discovery import SitemapDiscovery
+from async_crawler import AsyncCrawler, crawl_available
+from crawl_frontier import get_frontier
+from retry_policy import CircuitBreaker, CircuitOpenError, call_with_retries, is_retryable
+from url_canon import CanonicalIndex, canonical_links
+from rate_limiter import get_rate_limiter
+from extraction import run_field_spec, apply_field_spec
+from structured_data import extract_with_structured
+from xhr_discovery import (install_recorder, recorded_responses, find_pagination_endpoint,
+                           load_endpoint, save_endpoint, replay_listing, page_param_label)
+from driver_setup import resolve_driver_path, remember_driver, new_profile_dir, remove_profile_dir, quit_driver
 
 try:
     from webdriver_manager.chrome import ChromeDriverManager
@@ -13,51 +31,779 @@ try:
 except:
     WEBDRIVER_MANAGER_AVAILABLE = False
 
+# URL patterns blocked in lean mode, by resource type
+LEAN_RESOURCE_PATTERNS = {
+    'image': ['*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.svg*', '*.ico*', '*.avif*'],
+    'font': ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'],
+    'media': ['*.mp4*', '*.webm*', '*.mp3*', '*.m3u8*'],
+    'stylesheet': ['*.css*'],
+}
+
+# Ad, analytics and social hosts blocked in lean mode
+LEAN_BLOCKED_HOSTS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*googlesyndication.com*',
+    '*doubleclick.net*',
+    '*adservice.google.*',
+    '*connect.facebook.net*',
+    '*hotjar.com*',
+    '*clarity.ms*',
+    '*analytics.tiktok.com*',
+]
+
+def lean_blocked_urls(allow=()):
+    """
+    Build the CDP block list for lean mode
+    
+    Args:
+        allow: Resource types (e.g. 'stylesheet') or host patterns that the
+            source needs and must not be blocked
+    """
+    patterns = []
+    
+    for resource_type in config.LEAN_BLOCK_TYPES:
+        if resource_type not in allow:
+            patterns.extend(LEAN_RESOURCE_PATTERNS.get(resource_type, []))
+    
+    patterns.extend(host for host in LEAN_BLOCKED_HOSTS if host not in allow)
+    return patterns
+
+def apply_url_blocking(driver, patterns):
+    """Block (or with an empty list, unblock) URL patterns for a driver session via CDP"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+        return True
+    except Exception as e:
+        print(f"⚠ Could not set blocked URLs: {e}")
+        return False
+
+def create_chrome_driver(headless=config.HEADLESS_MODE, lean=False):
+    """Start a new Chrome WebDriver session with the standard scraper options"""
+    chrome_options = Options()
+    
+    if headless:
+        chrome_options.add_argument('--headless=new')
+    
+    if lean:
+        # Hand control back once the DOM is parsed; readiness checks do the rest
+        chrome_options.page_load_strategy = 'eager'
+        chrome_options.add_experimental_option('prefs', {
+            'profile.default_content_setting_values.notifications': 2,
+            'profile.default_content_setting_values.geolocation': 2,
+            'profile.managed_default_content_settings.plugins': 2,
+        })
+        chrome_options.add_argument('--disable-extensions')
+        chrome_options.add_argument('--mute-audio')
+        chrome_options.add_argument('--disable-background-networking')
+    
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument(f'user-agent={config.USER_AGENT}')
+    
+    # Disable automation flags
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    
+    # Each session gets its own copy of the prepared profile
+    profile_dir = new_profile_dir()
+    if profile_dir:
+        chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+    
+    print("Setting up Chrome driver...")
+    started = time.perf_counter()
+    
+    # Use the configured or cached ChromeDriver; Selenium only resolves one on the first start
+    try:
+        driver_path = resolve_driver_path()
+        if driver_path:
+            service = ChromeService(executable_path=driver_path)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            print(f"✓ Using ChromeDriver from: {driver_path}")
+        else:
+            driver = webdriver.Chrome(options=chrome_options)
+            remember_driver(driver)
+            print("✓ Using system ChromeDriver")
+    except Exception as e:
+        remove_profile_dir(profile_dir)
+        print(f"✗ Failed to initialize Chrome: {e}")
+        raise
+    
+    driver.profile_dir = profile_dir
+    driver.startup_seconds = time.perf_counter() - started
+    print(f"✓ Chrome ready in {driver.startup_seconds:.2f}s")
+    
+    # Try to maximize window, but don't fail if it doesn't work
+    try:
+        driver.maximize_window()
+    except:
+        pass
+    
+    return driver
+
+class DriverPool:
+    """
+    Pool of warm Chrome sessions shared by several scrapers.
+    
+    Scrapers lease a driver with acquire() and hand it back with release().
+    Drivers are health-checked on lease and reset (extra tabs closed, cookies
+    and storage cleared) on return, so the next scraper starts from a clean
+    browser without paying for a Chrome cold start.
+    """
+    
+    def __init__(self, size=config.DRIVER_POOL_SIZE, headless=config.HEADLESS_MODE, lean=config.LEAN_MODE):
+        self.size = max(1, size)
+        self.headless = headless
+        self.lean = lean
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+    
+    def warm_up(self, count=None):
+        """Start drivers ahead of time so the first leases are instant"""
+        count = self.size if count is None else min(count, self.size)
+        
+        while True:
+            with self._lock:
+                if self._created >= count:
+                    break
+                self._created += 1
+            
+            try:
+                self._idle.put(create_chrome_driver(self.headless, self.lean))
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+    
+    def acquire(self, timeout=None):
+        """Lease a healthy driver, starting a new one if the pool has room"""
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+        
+        deadline = time.time() + timeout if timeout else None
+        
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = None
+            
+            if driver is not None:
+                if self._is_healthy(driver):
+                    return driver
+                self._discard(driver)
+                continue
+            
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            
+            if can_create:
+                try:
+                    return create_chrome_driver(self.headless, self.lean)
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            
+            # Pool is at capacity, wait for a lease to come back
+            remaining = deadline - time.time() if deadline else None
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError("Timed out waiting for a free driver")
+            
+            try:
+                driver = self._idle.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError("Timed out waiting for a free driver")
+            
+            if self._is_healthy(driver):
+                return driver
+            self._discard(driver)
+    
+    def release(self, driver):
+        """Return a leased driver to the pool after resetting its state"""
+        if driver is None:
+            return
+        
+        if self._closed or not self._reset(driver):
+            self._discard(driver)
+            return
+        
+        self._idle.put(driver)
+    
+    def close_all(self):
+        """Quit every idle driver and refuse further leases"""
+        self._closed = True
+        
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+    
+    def _is_healthy(self, driver):
+        """Check that the browser session still responds"""
+        try:
+            driver.execute_script("return 1")
+            return True
+        except:
+            return False
+    
+    def _reset(self, driver):
+        """Bring a driver back to a single blank tab with no cookies or storage"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except:
+                pass
+            
+            # delete_all_cookies() only covers the current domain, CDP clears them all
+            try:
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            except:
+                driver.delete_all_cookies()
+            
+            # Block lists are per lease, the next scraper sets its own
+            if self.lean:
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+            
+            driver.get('about:blank')
+            return True
+        except:
+            return False
+    
+    def _discard(self, driver):
+        """Quit a driver and free its slot"""
+        try:
+            quit_driver(driver)
+        except:
+            pass
+        
+        with self._lock:
+            self._created = max(0, self._created - 1)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close_all()
+
+# Returns true once the document is parsed, every ready selector matches and,
+# if requested, no resource has finished loading for the last idle_ms milliseconds
+READY_PROBE_JS = """
+var selectors = arguments[0] || [];
+var idleMs = arguments[1];
+if (document.readyState === 'loading') return false;
+for (var i = 0; i < selectors.length; i++) {
+    if (!document.querySelector(selectors[i])) return false;
+}
+if (idleMs) {
+    var lastEnd = 0;
+    var entries = performance.getEntriesByType('resource');
+    for (var j = 0; j < entries.length; j++) {
+        if (entries[j].responseEnd > lastEnd) lastEnd = entries[j].responseEnd;
+    }
+    if (performance.now() - lastEnd < idleMs) return false;
+}
+return true;
+"""
+
+# One round of listing growth: scroll to the end, click a "load more" control if
+# there is one, then resolve as soon as new nodes have settled (or on timeout).
+# A MutationObserver installed on first use queues added nodes, so links are
+# read from the newly added nodes only instead of rescanning the whole page.
+LOAD_MORE_STEP_JS = """
+var opts = arguments[0];
+var done = arguments[arguments.length - 1];
+var state = window.__scraperLoadMore;
+var fresh = false;
+
+if (!state) {
+    state = window.__scraperLoadMore = {added: [], mutations: 0};
+    new MutationObserver(function(records) {
+        for (var r = 0; r < records.length; r++) {
+            var nodes = records[r].addedNodes;
+            for (var n = 0; n < nodes.length; n++) {
+                if (nodes[n].nodeType === 1) {
+                    state.added.push(nodes[n]);
+                    state.mutations++;
+                }
+            }
+        }
+    }).observe(document.documentElement, {childList: true, subtree: true});
+    fresh = true;
+}
+
+function visible(el) {
+    return !el.disabled && el.getClientRects().length > 0;
+}
+
+function labelled(selector, accept) {
+    var texts = opts.button_texts || [];
+    if (!texts.length) return null;
+    var controls = document.querySelectorAll(selector);
+    for (var i = 0; i < controls.length; i++) {
+        if (accept && !accept(controls[i])) continue;
+        var label = (controls[i].innerText || controls[i].value || '').trim().toLowerCase();
+        for (var t = 0; t < texts.length; t++) {
+            if (label.indexOf(texts[t].toLowerCase()) !== -1 && visible(controls[i])) return controls[i];
+        }
+    }
+    return null;
+}
+
+// Buttons first, so a card's "Read more" link isn't clicked (and followed)
+// before the listing's own control; links only when they don't navigate
+function findButton() {
+    var button = labelled('button, [role="button"], input[type="button"]');
+    if (button) return button;
+    var selectors = opts.button_selectors || [];
+    for (var s = 0; s < selectors.length; s++) {
+        var elements;
+        try {
+            elements = document.querySelectorAll(selectors[s]);
+        } catch (e) {
+            continue;
+        }
+        for (var j = 0; j < elements.length; j++) {
+            if (visible(elements[j])) return elements[j];
+        }
+    }
+    return labelled('a', function(a) {
+        var href = (a.getAttribute('href') || '').trim();
+        return !href || href === '#' || href.indexOf('javascript:') === 0;
+    });
+}
+
+function collect(roots, hrefs) {
+    if (!opts.link_selector) return;
+    for (var i = 0; i < roots.length; i++) {
+        var root = roots[i];
+        if (!root.isConnected) continue;
+        if (root.matches && root.matches(opts.link_selector) && root.href) hrefs.push(root.href);
+        var links = root.querySelectorAll(opts.link_selector);
+        for (var j = 0; j < links.length; j++) {
+            if (links[j].href) hrefs.push(links[j].href);
+        }
+    }
+}
+
+var baseline = state.mutations;
+window.scrollTo(0, document.body.scrollHeight);
+
+var button = findButton();
+if (button) {
+    button.scrollIntoView({block: 'center'});
+    button.click();
+}
+
+var started = Date.now();
+var lastCount = baseline;
+var lastChange = started;
+
+(function poll() {
+    var now = Date.now();
+    if (state.mutations !== lastCount) {
+        lastCount = state.mutations;
+        lastChange = now;
+    }
+    var grew = state.mutations > baseline;
+    if ((grew && now - lastChange >= opts.settle_ms) || now - started >= opts.timeout_ms) {
+        var hrefs = [];
+        collect(fresh ? [document.documentElement] : [], hrefs);
+        collect(state.added, hrefs);
+        state.added = [];
+        done({hrefs: hrefs, clicked: !!button, height: document.body.scrollHeight});
+    } else {
+        setTimeout(poll, 50);
+    }
+})();
+"""
+
 class BaseScraper:
-    def __init__(self, headless=config.HEADLESS_MODE):
+    # Readiness condition for detail pages, overridden per source.
+    # Every selector must match (use "a, b" for alternatives).
+    ready_selectors = ()
+    network_idle_ms = None
+    
+    # Sources whose detail pages are complete without JavaScript set this to
+    # False and implement parse_detail_html(); Chrome is then only used when
+    # the HTTP result lacks one of the required fields.
+    detail_needs_js = True
+    required_fields = ('title',)
+    
+    # Resource types or host patterns this source needs even in lean mode
+    lean_allow = ()
+    
+    # Sitemap link discovery: regex for detail page URLs, plus optionally the
+    # sitemaps to read (default: from robots.txt) and a regex for the child
+    # sitemaps of an index worth following
+    sitemap_url_pattern = None
+    sitemap_urls = ()
+    sitemap_filter = None
+    
+    def __init__(self, headless=config.HEADLESS_MODE, driver_pool=None, lean=None):
         self.driver = None
         self.headless = headless
+        # A pooled driver was created by the pool, so follow its lean setting
+        if lean is None:
+            lean = driver_pool.lean if driver_pool else config.LEAN_MODE
+        self.lean = lean
         self.wait_timeout = config.TIMEOUT
-        
+        self.page_deadline = config.PAGE_DEADLINE
+        self.driver_pool = driver_pool
+        self.throttle = get_rate_limiter()
+        self._http = None
+        self._sitemap = None
+        self._errors = {}
+        self.breaker = CircuitBreaker(type(self).__name__)
+    
     def setup_driver(self):
-        """Initialize Chrome driver with options"""
-        chrome_options = Options()
+        """Initialize Chrome driver, leasing a warm one when a pool is attached"""
+        if self.driver:
+            return
+        
+        if self.driver_pool:
+            self.driver = self.driver_pool.acquire()
+        else:
+            self.driver = create_chrome_driver(self.headless, self.lean)
+        
+        if self.lean:
+            apply_url_blocking(self.driver, lean_blocked_urls(self.lean_allow))
+    
+    @property
+    def http(self):
+        """Pooled HTTP fetcher, created on first use"""
+        if self._http is None:
+            self._http = HttpFetcher(cache=get_page_cache())
+        return self._http
+    
+    def fetch_detail(self, url, scrape_with_driver):
+        """
+        Scrape a detail page over plain HTTP, falling back to the browser
+        
+        With the page cache enabled, pages that don't need JavaScript are
+        first revalidated with a conditional GET, and an unchanged page
+        returns the record stored for it. Pages that need JavaScript always
+        go to the browser: their content can change while the HTML shell
+        the server sends stays the same.
+        
+        Args:
+            url: Detail page URL
+            scrape_with_driver: The source's Selenium scraping method, called
+                when the page needs JavaScript or HTTP extraction came up short
+        """
+        html = None
+        
+        # Revalidate against the page cache first: an unchanged page reuses
+        # the record extracted last time, with no download or rendering
+        if LXML_AVAILABLE and not self.detail_needs_js:
+            try:
+                html, record = self.http.fetch_cached(url)
+                if record is not None and self.has_required_fields(record):
+                    return record
+            except Exception as e:
+                print(f"    HTTP fetch failed, using browser: {e}")
+        
+        if html is not None:
+            try:
+                record = self.parse_detail_html(url, parse_html(html, base_url=url))
+                
+                if self.has_required_fields(record):
+                    self.http.remember_record(url, record)
+                    return record
+                
+                print("    HTTP result incomplete, using browser")
+            except Exception as e:
+                print(f"    HTTP parsing failed, using browser: {e}")
+        
+        if not self.driver:
+            self.setup_driver()
+        
+        record = scrape_with_driver(url)
+        if html is not None and self.has_required_fields(record):
+            self.http.remember_record(url, record)
+        return record
+    
+    def fetch_details(self, urls, driver_method, on_result=None):
+        """
+        fetch_detail() for many pages, through the persistent crawl frontier
         
-        if self.headless:
-            chrome_options.add_argument('--headless=new')
+        The pages are queued for this source and claimed in batches of
+        FRONTIER_BATCH, each page's outcome being stored as it finishes. Pages
+        finished by an earlier, interrupted run (or by another process working
+        the same queue) come back from their stored records, and pages that
+        run left unfinished are added to the end of urls. A page that fails
+        is not claimed again in this call; it stays queued for the next run.
         
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36')
+        Args:
+            urls: Detail page URLs
+            driver_method: Name of the source's Selenium scraping method
+            on_result: Optional callback(index, url, record) as in scrape_details()
         
-        # Disable automation flags
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
+        Returns:
+            Records in the same order as urls (None where scraping failed)
+        """
+        urls = list(dict.fromkeys(urls))
+        frontier = get_frontier()
+        if frontier is None:
+            return self._fetch_batch(urls, driver_method, on_result)
         
-        print("Setting up Chrome driver...")
+        source = type(self).__name__
+        started = time.time()
+        frontier.add(source, urls)
+        queued = set(urls)
+        urls += [url for url in frontier.unfinished(source) if url not in queued]
+        index = {url: idx for idx, url in enumerate(urls)}
+        
+        stored = frontier.records(source, urls)
+        if stored:
+            print(f"  Resuming: {len(stored)} pages already scraped")
+            self._mark_sitemap_done(list(stored), list(stored.values()))
+            if on_result:
+                for url, record in stored.items():
+                    on_result(index[url], url, record)
+        
+        while True:
+            batch = frontier.claim(source, config.FRONTIER_BATCH, since=started)
+            if not batch:
+                break
+            
+            for url in batch:
+                if url not in index:
+                    index[url] = len(urls)
+                    urls.append(url)
+            
+            report = on_result and (lambda i, url, record: on_result(index[url], url, record))
+            for url, record in zip(batch, self._fetch_batch(batch, driver_method, report)):
+                error = self._errors.pop(url, None)
+                if record:
+                    frontier.complete(source, url, record)
+                elif isinstance(error, CircuitOpenError):
+                    # Skipped, not failed: left for the next run
+                    frontier.release(source, [url])
+                else:
+                    frontier.fail(source, url, error or 'No data extracted')
+            
+            if self.breaker.is_open:
+                break
+        
+        records = frontier.records(source, urls)
+        frontier.end(source, since=started)
+        return [records.get(url) for url in urls]
+    
+    def _fetch_batch(self, urls, driver_method, on_result=None):
+        """fetch_detail() for a batch: concurrently over HTTP when possible, then in the browser"""
+        scrape_fn = lambda scraper, link: scraper.fetch_detail(link, getattr(scraper, driver_method))
+        
+        if self.breaker.is_open or self.detail_needs_js or not urls or not crawl_available():
+            return self.scrape_details(urls, scrape_fn, on_result=on_result)
+        
+        index = {url: idx for idx, url in enumerate(urls)}
+        results = [None] * len(urls)
+        
+        def report(url, record):
+            if record and on_result:
+                on_result(index[url], url, record)
+        
+        crawler = AsyncCrawler(throttle=self.throttle, cache=self.http.cache)
+        for url in urls:
+            crawler.add(url, self)
+        for url, record in crawler.run(on_result=report).items():
+            results[index[url]] = record
+        self._errors.update(crawler.errors)
+        self._mark_sitemap_done(urls, results)
+        
+        remaining = [idx for idx, record in enumerate(results) if record is None]
+        if remaining:
+            print(f"  {len(remaining)} pages left for the browser")
+            report_rest = on_result and (lambda i, url, record: on_result(remaining[i], url, record))
+            rest = self.scrape_details([urls[idx] for idx in remaining], scrape_fn, on_result=report_rest)
+            for idx, record in zip(remaining, rest):
+                results[idx] = record
+        
+        return results
+    
+    def skip_known(self, urls, known_urls):
+        """
+        Drop URLs already stored and seen recently
+        
+        Args:
+            urls: Detail page URLs
+            known_urls: KnownUrls loaded by the scraper manager, or None
+        """
+        urls = list(urls)
+        if not known_urls:
+            return urls
+        
+        to_fetch = known_urls.to_fetch(urls)
+        if len(to_fetch) < len(urls):
+            print(f"  Skipping {len(urls) - len(to_fetch)} recently seen pages")
+        return to_fetch
+    
+    def scrape_details(self, urls, scrape_fn, workers=None, on_result=None):
+        """
+        Scrape detail pages, spreading them over parallel workers
+        
+        Args:
+            urls: Detail page URLs
+            scrape_fn: Called as scrape_fn(scraper, url) and returns a record or None.
+                Each worker gets its own copy of this scraper with its own driver.
+            workers: Number of parallel workers (default config.DETAIL_WORKERS)
+            on_result: Optional callback(index, url, record), called in this
+                thread as each page finishes
+        
+        Returns:
+            Records in the same order as urls (None where scraping failed)
+        """
+        urls = list(urls)
+        results = [None] * len(urls)
+        workers = max(1, min(workers or config.DETAIL_WORKERS, len(urls) or 1))
+        
+        if workers == 1:
+            for idx, url in enumerate(urls):
+                results[idx] = self._scrape_one(self, url, scrape_fn)
+                if on_result:
+                    on_result(idx, url, results[idx])
+            self._mark_sitemap_done(urls, results)
+            return results
+        
+        # Workers lease their own drivers; hand ours back so the pool has room
+        pool = self.driver_pool
+        own_pool = None
+        if pool is not None and pool.size >= workers:
+            if self.driver:
+                pool.release(self.driver)
+                self.driver = None
+        else:
+            own_pool = pool = DriverPool(size=workers, headless=self.headless, lean=self.lean)
+        
+        local = threading.local()
+        clones = []
+        clones_lock = threading.Lock()
+        
+        def run(url):
+            worker = getattr(local, 'worker', None)
+            if worker is None:
+                worker = copy.copy(self)
+                worker.driver = None
+                worker._http = None
+                worker.driver_pool = pool
+                local.worker = worker
+                with clones_lock:
+                    clones.append(worker)
+            return self._scrape_one(worker, url, scrape_fn)
         
-        # Use the ChromeDriver from config
         try:
-            if config.CHROME_DRIVER_PATH and config.CHROME_DRIVER_PATH != 'auto':
-                service = ChromeService(executable_path=config.CHROME_DRIVER_PATH)
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                print(f"✓ Using ChromeDriver from: {config.CHROME_DRIVER_PATH}")
-            else:
-                self.driver = webdriver.Chrome(options=chrome_options)
-                print("✓ Using system ChromeDriver")
-        except Exception as e:
-            print(f"✗ Failed to initialize Chrome: {e}")
-            raise
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(run, url): idx for idx, url in enumerate(urls)}
+                
+                for future in as_completed(futures):
+                    idx = futures[future]
+                    results[idx] = future.result()
+                    if on_result:
+                        on_result(idx, urls[idx], results[idx])
+        finally:
+            for worker in clones:
+                worker.close()
+            if own_pool:
+                own_pool.close_all()
+            self._mark_sitemap_done(urls, results)
         
-        # Try to maximize window, but don't fail if it doesn't work
+        return results
+    
+    def _mark_sitemap_done(self, urls, results):
+        """Pages that came from the sitemap are only marked seen once scraped"""
+        if self._sitemap:
+            self._sitemap.mark_done(url for url, record in zip(urls, results) if record)
+    
+    def _scrape_one(self, scraper, url, scrape_fn):
+        """
+        Scrape one page within the host's politeness limits, isolating errors
+        
+        Transient errors are retried with backoff. Every outcome feeds the
+        source's circuit breaker; once it has tripped, pages are skipped.
+        """
         try:
-            self.driver.maximize_window()
-        except:
-            pass
+            self.breaker.check()
+        except CircuitOpenError as e:
+            self._errors[url] = e
+            return None
+        
+        def attempt():
+            with self.throttle.slot(url):
+                return scrape_fn(scraper, url)
+        
+        try:
+            record = call_with_retries(attempt)
+        except Exception as e:
+            print(f"  ✗ Error scraping {url}: {e}")
+            self._errors[url] = e
+            record = None
+        
+        self.breaker.record(bool(record), url)
+        return record
+    
+    def parse_detail_html(self, url, doc):
+        """Extract a detail record from a parsed lxml document"""
+        raise NotImplementedError
+    
+    def has_required_fields(self, record):
+        """Check that a record has a value for every required field"""
+        return bool(record) and all(record.get(field) for field in self.required_fields)
+    
+    def extract_fields(self, spec):
+        """Extract all fields of a field spec from the current page in one round-trip"""
+        return run_field_spec(self.driver, spec)
+    
+    def snapshot(self):
+        """
+        Take the rendered page once and parse it locally
+        
+        Extraction from the returned lxml document runs in this process at
+        parser speed, with no further WebDriver round-trips.
+        """
+        return parse_html(self.driver.page_source, base_url=self.driver.current_url)
+    
+    def extract_snapshot_fields(self, spec):
+        """Apply a field spec to a snapshot of the current page"""
+        return apply_field_spec(self.snapshot(), spec)
+    
+    def extract_detail_fields(self, spec, doc=None):
+        """
+        Extract a detail page's fields, schema.org structured data first
         
+        Fields the page's JSON-LD, microdata or OpenGraph tags answer are
+        taken from there, the rest from the spec's selectors; both are read
+        in one round-trip. With doc, the parsed page is used instead of the
+        browser.
+        """
+        run = (lambda s: apply_field_spec(doc, s)) if doc is not None else self.extract_fields
+        if not config.STRUCTURED_DATA:
+            return run(spec)
+        return extract_with_structured(run, spec)
+    
+    def find_text_by_selectors(self, selectors, min_length=2):
+        """Return the text of the first element matching any selector, in order"""
+        record = self.extract_fields({
+            'text': {'selectors': list(selectors), 'min_length': min_length}
+        })
+        return record.get('text')
+    
     def wait_for_element(self, by, value, timeout=None):
         """Wait for element to be present"""
         timeout = timeout or self.wait_timeout
@@ -72,20 +818,204 @@ class BaseScraper:
             EC.presence_of_all_elements_located((by, value))
         )
     
-    def scroll_to_bottom(self, pause_time=2):
-        """Scroll to bottom of page to load dynamic content"""
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
+    def load_page(self, url, ready_selectors=None, network_idle_ms=None, deadline=None):
+        """
+        Navigate to a page and return as soon as it is ready
         
-        while True:
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(pause_time)
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
+        The whole navigation, including waiting for readiness, is bounded by
+        the per-page deadline. Returns False if the deadline was hit; the page
+        is left as loaded so far and callers can still extract from it.
+        """
+        deadline = deadline or self.page_deadline
+        started = time.time()
+        
+        self.driver.set_page_load_timeout(deadline)
+        try:
+            # Network errors (connection reset, DNS) are retried; a slow page is not
+            call_with_retries(self.driver.get, url,
+                              retryable=lambda e: not isinstance(e, TimeoutException) and is_retryable(e))
+        except TimeoutException:
+            # Stop whatever is still loading and work with what we have
+            try:
+                self.driver.execute_script("window.stop();")
+            except:
+                pass
+            return False
+        
+        remaining = deadline - (time.time() - started)
+        return self.wait_until_ready(ready_selectors, network_idle_ms, timeout=remaining)
+    
+    def wait_until_ready(self, ready_selectors=None, network_idle_ms=None, timeout=None):
+        """Poll the page until the source's ready condition holds or the timeout expires"""
+        if ready_selectors is None:
+            ready_selectors = self.ready_selectors
+        if network_idle_ms is None:
+            network_idle_ms = self.network_idle_ms
+        timeout = timeout if timeout is not None else self.page_deadline
+        
+        if timeout <= 0:
+            return False
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script(READY_PROBE_JS, list(ready_selectors), network_idle_ms)
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    def load_more(self, link_selector=None, link_filter=None, button_texts=(), button_selectors=(),
+                  max_items=None, max_rounds=100, round_timeout=5, settle_ms=300, stall_rounds=2):
+        """
+        Grow an infinite-scroll or "load more" listing until it stops growing
+        
+        Each round scrolls to the end, clicks the first visible button whose
+        text contains one of button_texts, else the first visible element
+        matching button_selectors, else a link with that text that doesn't
+        navigate (no href or "#"),
+        and continues as soon as the new nodes have settled, waiting at most
+        round_timeout seconds. Links matching link_selector are collected from
+        the added nodes only and returned canonicalized, in discovery order.
+        
+        Growth means new links when link_selector is given, otherwise a
+        taller page. Stops after stall_rounds rounds without growth, after
+        max_items links or after max_rounds rounds.
+        """
+        options = {
+            'link_selector': link_selector,
+            'button_texts': list(button_texts),
+            'button_selectors': list(button_selectors),
+            'settle_ms': settle_ms,
+            'timeout_ms': int(round_timeout * 1000),
+        }
+        self.driver.set_script_timeout(round_timeout + 10)
+        
+        links = CanonicalIndex()
+        last_height = None
+        stalled = 0
+        
+        for round_number in range(1, max_rounds + 1):
+            try:
+                step = self.driver.execute_async_script(LOAD_MORE_STEP_JS, options)
+            except Exception:
+                # A click that navigated (e.g. to the next page) ends the script;
+                # the observer is installed again on the new page next round
+                self.wait_until_ready()
+                stalled += 1
+                if stalled >= stall_rounds:
+                    break
+                continue
+            
+            new_links = [link for link in (links.add(href) for href in step['hrefs']
+                                           if href and (link_filter is None or link_filter(href))) if link]
+            
+            if link_selector:
+                grew = bool(new_links)
+            else:
+                grew = last_height is not None and step['height'] > last_height
+                last_height = step['height']
+            
+            if grew:
+                stalled = 0
+                if link_selector:
+                    print(f"  Round {round_number}: {len(links)} links found")
+            else:
+                stalled += 1
+                if stalled >= stall_rounds:
+                    break
             
-            if new_height == last_height:
+            if max_items and len(links) >= max_items:
                 break
-            last_height = new_height
+        
+        return links.urls()
+    
+    def sitemap_links(self, site_url, max_items=None):
+        """
+        New or changed detail page URLs from the source's sitemaps
+        
+        Returns None when the source has no sitemap pattern, sitemaps are
+        turned off or none could be read, so callers fall back to the
+        listing page. An empty list means nothing changed since last run.
+        """
+        if not (config.USE_SITEMAPS and self.sitemap_url_pattern):
+            return None
+        
+        self._sitemap = SitemapDiscovery(self.http, type(self).__name__, site_url, self.sitemap_url_pattern,
+                                         sitemap_urls=self.sitemap_urls, sitemap_pattern=self.sitemap_filter)
+        links = self._sitemap.discover(max_items=max_items)
+        if links is None:
+            self._sitemap = None
+        return links
+    
+    def collect_listing_links(self, url, link_selector, link_filter=None, ready_selectors=None, **load_more_options):
+        """
+        Collect a listing's links, over HTTP when its endpoint is known
+        
+        Sources with a sitemap_url_pattern take their links from the sitemaps.
+        With a saved pagination endpoint for this source, the listing is paged
+        through directly (plus the links in its server-rendered HTML). Otherwise,
+        or when the endpoint no longer yields links, the listing is grown in
+        the browser with load_more() while its XHR traffic is recorded, and
+        the endpoint found there is saved for the next run.
+        """
+        source = type(self).__name__
+        
+        links = self.sitemap_links(url, max_items=load_more_options.get('max_items'))
+        if links is not None:
+            return [href for href in links if link_filter is None or link_filter(href)]
+        
+        if config.LISTING_REPLAY:
+            contract = load_endpoint(source)
+            if contract:
+                links = replay_listing(self.http, contract, link_filter,
+                                       max_items=load_more_options.get('max_items'), throttle=self.throttle)
+                if links:
+                    print(f"✓ Replayed {page_param_label(contract)}: {len(links)} links")
+                    return self._merge_static_links(url, link_selector, link_filter, links)
+                
+                print("⚠ Listing endpoint changed, loading the listing in the browser")
+                save_endpoint(source, None)
+        
+        if not self.driver:
+            self.setup_driver()
+        self.load_page(url, ready_selectors=ready_selectors)
+        
+        if config.LISTING_REPLAY:
+            install_recorder(self.driver)
+        
+        links = self.load_more(link_selector=link_selector, link_filter=link_filter, **load_more_options)
+        
+        if config.LISTING_REPLAY:
+            contract = find_pagination_endpoint(recorded_responses(self.driver), links, self.driver.current_url)
+            if contract:
+                save_endpoint(source, contract)
+                print(f"✓ Recorded listing endpoint {page_param_label(contract)}")
+        
+        return links
+    
+    def _merge_static_links(self, url, link_selector, link_filter, links):
+        """Put the links of the listing's server-rendered HTML in front of replayed ones"""
+        try:
+            doc = self.http.fetch_document(url)
+            static = [element.get('href') for element in css(doc, link_selector)]
+        except Exception:
+            static = []
+        
+        return canonical_links(static + links, link_filter)
+    
+    def scroll_to_bottom(self, pause_time=2):
+        """Scroll to bottom of page to load dynamic content"""
+        self.load_more(round_timeout=pause_time, stall_rounds=2)
     
     def close(self):
-        """Close the browser"""
+        """Close the browser, or hand it back to the pool if it was leased"""
+        if self._http:
+            self._http.close()
+            self._http = None
+        
         if self.driver:
-            self.driver.quit()
+            if self.driver_pool:
+                self.driver_pool.release(self.driver)
+            else:
+                quit_driver(self.driver)
+            self.driver = None
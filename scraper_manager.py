@@ -1,11 +1,16 @@
 """
 Unified scraper manager that runs all scrapers and saves to database
 """
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from database import Event, Deal
+from database import Event, Deal, EVENT_HASH_FIELDS, event_content_hash
 from datetime import datetime
 import json
 import os
+import config
+from scraper_base import DriverPool
+from known_urls import KnownUrls
+from url_canon import canonicalize
 
 # Import all scrapers
 from culture_final_scraper import CultureFinalScraper
@@ -15,12 +20,21 @@ from more_events_scraper_optimized import MoreEventsScraperOptimized
 
 # Import data transformer
 from data_transformer import DataTransformer
+from image_pipeline import ImagePipeline
+
+# URLs per IN (...) query when looking up stored hashes
+HASH_LOOKUP_BATCH = 500
+
+# Columns a listing-only event (read from a listing card) updates; the others keep their stored values,
+# except images and content, which only gain what the card adds (see _merge_listing_rows)
+LISTING_COLUMNS = ('title', 'date', 'location', 'category')
 
 class ScraperManager:
     """Manages all scrapers and database operations"""
     
     def __init__(self, db: Session):
         self.db = db
+        self.failed_saves = 0
         self.scrapers = {
             'culture_gov': CultureFinalScraper,
             'visitgreece': VisitGreeceDetailedScraper,
@@ -43,12 +57,21 @@ class ScraperManager:
         
         # Dictionary to store raw events from each source
         events_by_source = {}
+        pigolampides = None
+        
+        # Warm Chrome sessions shared by every scraper in this run
+        # (each scraper block below catches its own errors, so the pool is always closed)
+        pool_size = max(config.DRIVER_POOL_SIZE, config.DETAIL_WORKERS)
+        driver_pool = DriverPool(size=pool_size, headless=headless, lean=config.LEAN_MODE)
+        
+        # Stored URLs, loaded once: scrapers skip detail pages seen recently
+        known_urls = self.load_known_urls()
         
         # Run Culture.gov scraper
         try:
             print("\n[1/4] Running Culture.gov scraper...")
-            scraper = CultureFinalScraper(headless=headless)
-            events = scraper.scrape_all_events(max_events=max_events_per_source)
+            scraper = CultureFinalScraper(headless=headless, driver_pool=driver_pool)
+            events = scraper.scrape_all_events(max_events=max_events_per_source, known_urls=known_urls)
             events_by_source['culture_gov'] = events
             print(f"✓ Scraped {len(events)} events from Culture.gov")
         except Exception as e:
@@ -58,8 +81,8 @@ class ScraperManager:
         # Run VisitGreece scraper
         try:
             print("\n[2/4] Running VisitGreece scraper...")
-            scraper = VisitGreeceDetailedScraper(headless=headless)
-            events = scraper.scrape_events_with_details(max_events=max_events_per_source)
+            scraper = VisitGreeceDetailedScraper(headless=headless, driver_pool=driver_pool)
+            events = scraper.scrape_events_with_details(max_events=max_events_per_source, known_urls=known_urls)
             events_by_source['visitgreece'] = events
             print(f"✓ Scraped {len(events)} events from VisitGreece")
         except Exception as e:
@@ -69,8 +92,8 @@ class ScraperManager:
         # Run Pigolampides scraper
         try:
             print("\n[3/4] Running Pigolampides scraper...")
-            scraper = PigolampidesScraper(headless=headless)
-            posts = scraper.scrape_all_posts(max_posts=max_events_per_source)
+            pigolampides = PigolampidesScraper(headless=headless, driver_pool=driver_pool)
+            posts = pigolampides.scrape_all_posts(max_posts=max_events_per_source, known_urls=known_urls)
             events_by_source['pigolampides'] = posts
             print(f"✓ Scraped {len(posts)} posts from Pigolampides")
         except Exception as e:
@@ -80,14 +103,16 @@ class ScraperManager:
         # Run More Events scraper
         try:
             print("\n[4/4] Running More Events scraper...")
-            scraper = MoreEventsScraperOptimized(headless=headless)
-            events = scraper.scrape_all_events(max_events=max_events_per_source, resume=False)
+            scraper = MoreEventsScraperOptimized(headless=headless, driver_pool=driver_pool)
+            events = scraper.scrape_all_events(max_events=max_events_per_source, resume=False, known_urls=known_urls)
             events_by_source['more_events'] = events
             print(f"✓ Scraped {len(events)} events from More Events")
         except Exception as e:
             print(f"✗ Error with More Events scraper: {e}")
             events_by_source['more_events'] = []
         
+        driver_pool.close_all()
+        
         # Transform all events to standardized format
         print("\n" + "="*60)
         print("Transforming data to standardized format...")
@@ -96,6 +121,10 @@ class ScraperManager:
         transformer = DataTransformer()
         standardized_events = transformer.transform_all_events(events_by_source)
         
+        # Local thumbnails, so clients don't hot-link full-size originals
+        if config.IMAGE_PIPELINE:
+            ImagePipeline().process(standardized_events, keep=self.stored_image_digests())
+        
         # Save combined JSON file
         combined_json_path = transformer.save_combined_json(standardized_events)
         results['combined_json_path'] = combined_json_path
@@ -108,6 +137,10 @@ class ScraperManager:
         saved_count = self.save_standardized_events(standardized_events)
         results['total_events'] = saved_count
         
+        # Only now is the WordPress API mark moved past the saved posts
+        if pigolampides and not self.failed_saves:
+            pigolampides.mark_posts_saved()
+        
         # Count by source
         for source in events_by_source.keys():
             source_count = sum(1 for e in standardized_events if e.get('source', '').lower().replace('.', '').replace('gr', '').strip() in source)
@@ -122,42 +155,188 @@ class ScraperManager:
         
         return results
     
+    def load_known_urls(self):
+        """URLs of stored events with when each was last seen, in one query"""
+        try:
+            # Rows saved before last_seen_at existed fall back to their last change
+            last_seen = func.coalesce(Event.last_seen_at, Event.updated_at)
+            rows = self.db.query(Event.url, last_seen).filter(Event.url.isnot(None)).all()
+            known_urls = KnownUrls.from_rows(rows)
+            print(f"✓ {len(known_urls)} events already stored")
+            return known_urls
+        except Exception as e:
+            print(f"⚠ Could not load stored event URLs: {e}")
+            return None
+    
     def save_standardized_events(self, events):
-        """Save standardized events to database"""
-        saved_count = 0
+        """
+        Save standardized events to database
         
+        Events are keyed by canonical URL. Stored hashes are fetched in bulk;
+        new URLs are inserted, and existing rows are only updated (bumping
+        updated_at) when their hash changed. Every saved event, unchanged
+        ones included, gets last_seen_at set. Rows saved before content_hash
+        existed have nothing to compare with: their fields and hash are
+        written without bumping updated_at. Rows stored under a raw URL
+        variant are matched too, and move to the canonical URL when updated.
+        Listing-only events only update the columns in LISTING_COLUMNS.
+        Returns the number of rows inserted or updated; rows that couldn't
+        be saved are counted in failed_saves.
+        """
+        self.failed_saves = 0
+        rows = {}
+        aliases = {}
+        unkeyed = []
+        listing_only = set()
         for event_data in events:
+            fields = self._event_fields(event_data)
+            if fields['url']:
+                rows[fields['url']] = fields
+                if event_data.get('listingOnly'):
+                    listing_only.add(fields['url'])
+                aliases[fields['url']] = fields['url']
+                raw_url = event_data.get('url') or event_data.get('eventUrl')
+                aliases.setdefault(raw_url, fields['url'])
+            else:
+                unkeyed.append(fields)
+        
+        stored = {}
+        urls = list(aliases)
+        for start in range(0, len(urls), HASH_LOOKUP_BATCH):
+            batch = urls[start:start + HASH_LOOKUP_BATCH]
+            query = self.db.query(Event.id, Event.url, Event.content_hash, Event.updated_at).filter(Event.url.in_(batch))
+            for row_id, url, content_hash, updated_at in query:
+                # A row under the canonical URL wins over a legacy variant
+                if url == aliases[url] or aliases[url] not in stored:
+                    stored[aliases[url]] = (row_id, content_hash, updated_at)
+        
+        merge = {stored[url][0]: url for url in listing_only if url in stored}
+        if merge:
+            self._merge_listing_rows(rows, merge)
+        
+        now = datetime.utcnow()
+        inserts = [dict(fields, last_seen_at=now) for fields in unkeyed] + \
+                  [dict(fields, last_seen_at=now) for url, fields in rows.items() if url not in stored]
+        updates = [dict(fields, id=stored[url][0], updated_at=now, last_seen_at=now)
+                   for url, fields in rows.items()
+                   if url in stored and stored[url][1] not in (None, fields['content_hash'])]
+        # updated_at passed as stored, or its onupdate default would bump it
+        hashed = [dict(fields, id=stored[url][0], updated_at=stored[url][2], last_seen_at=now)
+                  for url, fields in rows.items()
+                  if url in stored and stored[url][1] is None]
+        written_ids = {fields['id'] for fields in updates + hashed}
+        unchanged_ids = [row[0] for row in stored.values() if row[0] not in written_ids]
+        unchanged = len(unchanged_ids) + len(hashed)
+        
+        try:
+            self.db.bulk_insert_mappings(Event, inserts)
+            self.db.bulk_update_mappings(Event, updates + hashed)
+            self._mark_seen(unchanged_ids, now)
+            self.db.commit()
+        except Exception as e:
+            print(f"  Bulk save failed, saving one by one: {e}")
+            self.db.rollback()
+            saved_count = self._save_rows_individually(inserts, updates)
+            self._save_rows_individually([], hashed)
             try:
-                # Check if event already exists by URL
-                url = event_data.get('url') or event_data.get('eventUrl')
-                if url:
-                    existing = self.db.query(Event).filter(Event.url == url).first()
-                    if existing:
-                        continue
-                
-                # Create new event from standardized format
-                event = Event(
-                    title=event_data.get('title', 'Untitled'),
-                    description=event_data.get('description'),
-                    date=event_data.get('date'),
-                    location=event_data.get('location') or event_data.get('venue'),
-                    category=event_data.get('category'),
-                    price=str(event_data.get('price', 0)),
-                    url=url,
-                    source=event_data.get('source', 'Unknown'),
-                    images=[event_data.get('image')] if event_data.get('image') else [],
-                    contact=None,
-                    content={'region': event_data.get('region'), 'venue': event_data.get('venue')},
-                    full_text=None
-                )
+                self._mark_seen(unchanged_ids, now)
+                self.db.commit()
+            except Exception as e:
+                print(f"  Could not mark unchanged events as seen: {e}")
+                self.db.rollback()
+            return saved_count
+        
+        print(f"  {len(inserts)} new, {len(updates)} updated, {unchanged} unchanged")
+        return len(inserts) + len(updates)
+    
+    def _event_fields(self, event_data):
+        """Event column values for a standardized event, with their content hash"""
+        fields = {
+            'title': event_data.get('title', 'Untitled'),
+            'description': event_data.get('description'),
+            'date': event_data.get('date'),
+            'location': event_data.get('location') or event_data.get('venue'),
+            'category': event_data.get('category'),
+            'price': str(event_data.get('price', 0)),
+            'url': canonicalize(event_data.get('url') or event_data.get('eventUrl')),
+            'source': event_data.get('source', 'Unknown'),
+            'images': [event_data.get('image')] if event_data.get('image') else [],
+            'contact': None,
+            'content': {'region': event_data.get('region'), 'venue': event_data.get('venue')},
+            'full_text': None
+        }
+        # Only set when present, so rows without them keep their content hash
+        if event_data.get('coordinates'):
+            fields['content']['coordinates'] = event_data['coordinates']
+        if event_data.get('endDate'):
+            fields['content']['endDate'] = event_data['endDate']
+        if event_data.get('thumbnails'):
+            fields['content']['thumbnails'] = event_data['thumbnails']
+        fields['content_hash'] = event_content_hash(fields)
+        return fields
+    
+    def stored_image_digests(self):
+        """Content hashes of the thumbnails stored events link to, so they aren't evicted"""
+        digests = set()
+        try:
+            for (content,) in self.db.query(Event.content):
+                # Thumbnail paths are /images/{digest}/{width}
+                for path in ((content or {}).get('thumbnails') or {}).values():
+                    digests.add(path.split('/')[2])
+        except Exception as e:
+            print(f"⚠ Could not load stored thumbnails: {e}")
+        return digests
+    
+    def _mark_seen(self, row_ids, seen_at):
+        """Set last_seen_at of unchanged rows, one UPDATE per HASH_LOOKUP_BATCH ids"""
+        for start in range(0, len(row_ids), HASH_LOOKUP_BATCH):
+            self.db.query(Event).filter(Event.id.in_(row_ids[start:start + HASH_LOOKUP_BATCH])).update(
+                # updated_at set to itself, or its onupdate default would bump it
+                {Event.last_seen_at: seen_at, Event.updated_at: Event.updated_at}, synchronize_session=False)
+    
+    def _merge_listing_rows(self, rows, ids):
+        """
+        Take the columns a listing card can't update from the stored rows (ids: row id -> url)
+        
+        The detail page's images and content stay as stored: the card's
+        image is only appended when it's missing, and card content keys
+        only fill ones the stored content doesn't have.
+        """
+        row_ids = list(ids)
+        for start in range(0, len(row_ids), HASH_LOOKUP_BATCH):
+            for event in self.db.query(Event).filter(Event.id.in_(row_ids[start:start + HASH_LOOKUP_BATCH])):
+                fields = rows[ids[event.id]]
+                card_images, card_content = fields.get('images') or [], fields.get('content') or {}
+                for column in EVENT_HASH_FIELDS:
+                    if column not in LISTING_COLUMNS or not fields.get(column):
+                        fields[column] = getattr(event, column)
                 
-                self.db.add(event)
+                new_images = [image for image in card_images if image not in (fields.get('images') or [])]
+                if new_images:
+                    fields['images'] = list(fields.get('images') or []) + new_images
+                new_content = {key: value for key, value in card_content.items()
+                               if value is not None and (fields.get('content') or {}).get(key) is None}
+                if new_content:
+                    fields['content'] = dict(fields.get('content') or {}, **new_content)
+                fields['content_hash'] = event_content_hash(fields)
+    
+    def _save_rows_individually(self, inserts, updates):
+        """Fallback when a bulk write fails, so one bad row doesn't lose the rest"""
+        saved_count = 0
+        
+        for fields in inserts + updates:
+            try:
+                if 'id' in fields:
+                    self.db.query(Event).filter(Event.id == fields['id']).update(
+                        {k: v for k, v in fields.items() if k != 'id'}, synchronize_session=False)
+                else:
+                    self.db.add(Event(**fields))
                 self.db.commit()
                 saved_count += 1
-                
             except Exception as e:
                 print(f"  Error saving event: {e}")
                 self.db.rollback()
+                self.failed_saves += 1
                 continue
         
         return saved_count
@@ -0,0 +1,202 @@
+"""
+Sitemap-driven link discovery
+Reads a site's sitemap.xml (found through robots.txt or the usual
+locations), following sitemap indexes, as a stream and with .xml.gz support.
+Page URLs are filtered by a regex and canonicalized, and <lastmod> is compared with the
+previous run so only new or changed pages are queued. State is kept per
+source in OUTPUT_DIR/sitemap_state.json.
+"""
+import gzip
+import io
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin
+import config
+from url_canon import canonicalize
+
+STATE_FILE = os.path.join(config.OUTPUT_DIR, 'sitemap_state.json')
+
+# Tried when robots.txt doesn't list any sitemap
+DEFAULT_SITEMAP_PATHS = ['/sitemap.xml', '/sitemap_index.xml']
+
+# Sitemap indexes nested deeper than this are not followed
+MAX_DEPTH = 3
+
+def load_state():
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except:
+        return {}
+
+def save_state(state):
+    os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+
+def find_sitemaps(fetcher, site_url):
+    """Sitemap URLs listed in robots.txt, or the default locations"""
+    try:
+        robots = fetcher.get(urljoin(site_url, '/robots.txt')).text
+        sitemaps = re.findall(r'^\s*sitemap:\s*(\S+)', robots, re.I | re.M)
+        if sitemaps:
+            return sitemaps
+    except Exception:
+        pass
+    
+    return [urljoin(site_url, path) for path in DEFAULT_SITEMAP_PATHS]
+
+def iter_sitemap(fetcher, sitemap_url):
+    """
+    Stream the entries of one sitemap file
+    
+    Yields (kind, loc, lastmod) with kind 'sitemap' for index entries and
+    'url' for pages. Elements are cleared as they are read, so large
+    sitemaps are never held in memory.
+    """
+    response = fetcher.get(sitemap_url, stream=True)
+    try:
+        response.raw.decode_content = True
+        stream = io.BufferedReader(response.raw)
+        
+        # .xml.gz files are served as gzip data, not with Content-Encoding
+        if stream.peek(2)[:2] == b'\x1f\x8b':
+            stream = gzip.GzipFile(fileobj=stream)
+        
+        loc = lastmod = None
+        for event, element in ET.iterparse(stream, events=('end',)):
+            tag = element.tag.rsplit('}', 1)[-1]
+            if tag == 'loc':
+                loc = (element.text or '').strip()
+            elif tag == 'lastmod':
+                lastmod = (element.text or '').strip() or None
+            elif tag in ('url', 'sitemap'):
+                if loc:
+                    yield tag, loc, lastmod
+                loc = lastmod = None
+                element.clear()
+    finally:
+        response.close()
+
+class SitemapDiscovery:
+    """
+    New and changed page URLs of one source, from its sitemaps
+    
+    discover() returns the pages to scrape; mark_done() records the lastmod
+    of pages that were scraped, so pages that failed are offered again.
+    """
+    
+    def __init__(self, fetcher, source, site_url, url_pattern, sitemap_urls=None, sitemap_pattern=None):
+        self.fetcher = fetcher
+        self.source = source
+        self.site_url = site_url
+        self.url_pattern = re.compile(url_pattern)
+        self.sitemap_urls = list(sitemap_urls or [])
+        self.sitemap_pattern = re.compile(sitemap_pattern) if sitemap_pattern else None
+        self._pending = {}
+        self._pending_sitemaps = {}
+    
+    def discover(self, changed_only=True, max_items=None):
+        """
+        Page URLs matching url_pattern, in sitemap order
+        
+        With changed_only, pages whose lastmod is unchanged since they were
+        last scraped are skipped, as are child sitemaps whose own lastmod is
+        unchanged. Scraped pages without a lastmod can't be known unchanged:
+        they come after the new and changed ones, and the caller's
+        skip_known decides when they are due. Returns None when no sitemap
+        could be read.
+        """
+        state = load_state().get(self.source, {})
+        seen_pages = state.get('pages', {}) if changed_only else {}
+        seen_sitemaps = state.get('sitemaps', {}) if changed_only else {}
+        
+        queue = [(url, None, 0) for url in (self.sitemap_urls or find_sitemaps(self.fetcher, self.site_url))]
+        read_any = False
+        links = []
+        revisit = {}
+        
+        while queue and not (max_items and len(links) >= max_items):
+            sitemap_url, sitemap_lastmod, depth = queue.pop(0)
+            pending = set()
+            complete = True
+            undated = False
+            
+            try:
+                for kind, loc, lastmod in iter_sitemap(self.fetcher, sitemap_url):
+                    read_any = True
+                    if kind == 'sitemap':
+                        if depth >= MAX_DEPTH:
+                            continue
+                        if self.sitemap_pattern and not self.sitemap_pattern.search(loc):
+                            continue
+                        if lastmod and seen_sitemaps.get(loc) == lastmod:
+                            continue
+                        queue.append((loc, lastmod, depth + 1))
+                        continue
+                    
+                    if not self.url_pattern.search(loc):
+                        continue
+                    loc = canonicalize(loc)
+                    if loc in self._pending or loc in pending:
+                        continue
+                    if lastmod and seen_pages.get(loc) == lastmod:
+                        continue
+                    if not lastmod:
+                        undated = True
+                        if loc in seen_pages:
+                            revisit.setdefault(loc, sitemap_url)
+                            continue
+                    
+                    pending.add(loc)
+                    self._pending[loc] = (lastmod, sitemap_url)
+                    links.append(loc)
+                    if max_items and len(links) >= max_items:
+                        complete = False
+                        break
+            except Exception as e:
+                print(f"  Could not read sitemap {sitemap_url}: {e}")
+                continue
+            
+            # A child sitemap counts as done once all its pages are scraped,
+            # unless some have no lastmod and must be looked at again
+            if sitemap_lastmod and complete and not undated:
+                self._pending_sitemaps[sitemap_url] = (sitemap_lastmod, pending)
+        
+        if not read_any:
+            return None
+        
+        for loc, sitemap_url in revisit.items():
+            if max_items and len(links) >= max_items:
+                break
+            if loc not in self._pending:
+                self._pending[loc] = (None, sitemap_url)
+                links.append(loc)
+        
+        print(f"✓ Sitemaps: {len(links)} new, changed or undated pages")
+        return links
+    
+    def mark_done(self, urls):
+        """Record the lastmod of scraped pages (and of sitemaps that are fully scraped)"""
+        state = load_state()
+        source_state = state.setdefault(self.source, {})
+        pages = source_state.setdefault('pages', {})
+        sitemaps = source_state.setdefault('sitemaps', {})
+        
+        for url in urls:
+            if url not in self._pending:
+                continue
+            lastmod, sitemap_url = self._pending.pop(url)
+            pages[url] = lastmod
+            
+            if sitemap_url in self._pending_sitemaps:
+                self._pending_sitemaps[sitemap_url][1].discard(url)
+        
+        for sitemap_url, (sitemap_lastmod, remaining) in list(self._pending_sitemaps.items()):
+            if not remaining:
+                sitemaps[sitemap_url] = sitemap_lastmod
+                del self._pending_sitemaps[sitemap_url]
+        
+        save_state(state)
@@ -0,0 +1,228 @@
+"""
+Structured-data extraction (schema.org JSON-LD, microdata, OpenGraph)
+Many event pages describe themselves as a schema.org Event. Those values
+are read first, with one small field spec, and a source's selector
+heuristics only run for the fields that are still missing.
+
+Normalized fields: title, description, date (= start_date), start_date,
+end_date, location, price, price_currency, images. JSON-LD wins over
+microdata, which wins over OpenGraph.
+"""
+import json
+import re
+
+# Raw structured data, read with the field-spec engine (live or offline)
+STRUCTURED_DATA_SPEC = {
+    'jsonld': {'selectors': ['script[type="application/ld+json"]'], 'attr': 'textContent', 'all': True},
+    'og': {'selectors': ['meta[property^="og:"], meta[property^="event:"]'], 'attrs': ['property', 'content'], 'all': True},
+    'microdata': {
+        'selectors': ['[itemscope][itemtype*="Event"] [itemprop], [itemscope][itemtype*="Event"][itemprop]'],
+        'attrs': ['itemprop', 'content', 'datetime', 'src', 'textContent'], 'all': True, 'scan_limit': 60
+    },
+}
+
+# Keeps the structured data fields apart from a spec's own when both run together
+STRUCTURED_PREFIX = '_structured_'
+
+EVENT_TYPE = re.compile(r'(Event|Festival)$')
+
+# Spec fields a structured field can stand in for (images are merged instead)
+FIELD_ALIASES = {
+    'title': ('title',),
+    'description': ('description',),
+    'date': ('date', 'meta_date'),
+    'location': ('location',),
+    'price': ('price',),
+}
+
+def _first(value):
+    return value[0] if isinstance(value, list) and value else value
+
+def _text(value):
+    value = _first(value)
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('@value')
+    return ' '.join(str(value).split()) if value else None
+
+def _event_nodes(node):
+    """schema.org Event nodes in a JSON-LD document, outermost first"""
+    if isinstance(node, list):
+        for item in node:
+            yield from _event_nodes(item)
+    elif isinstance(node, dict):
+        types = node.get('@type') or []
+        types = types if isinstance(types, list) else [types]
+        if any(EVENT_TYPE.search(str(t)) for t in types):
+            yield node
+        for key in ('@graph', 'subEvent', 'mainEntity', 'itemListElement', 'item'):
+            if key in node:
+                yield from _event_nodes(node[key])
+
+def _location(value):
+    value = _first(value)
+    if not isinstance(value, dict):
+        return _text(value)
+    
+    address = value.get('address')
+    if isinstance(address, dict):
+        address = ', '.join(str(address[k]) for k in ('streetAddress', 'addressLocality', 'addressRegion')
+                            if address.get(k))
+    parts = [p for p in (_text(value.get('name')), _text(address)) if p]
+    return ', '.join(dict.fromkeys(parts)) or None
+
+def _offer(value):
+    """(price, currency) of the first offer with a price"""
+    offers = value if isinstance(value, list) else [value]
+    for offer in offers:
+        if not isinstance(offer, dict):
+            continue
+        price = offer.get('price', offer.get('lowPrice'))
+        if price not in (None, ''):
+            return str(price), offer.get('priceCurrency')
+    return None, None
+
+def _images(value):
+    values = value if isinstance(value, list) else [value]
+    images = []
+    for item in values:
+        url = item.get('url') or item.get('contentUrl') if isinstance(item, dict) else item
+        if url and isinstance(url, str) and url not in images:
+            images.append(url)
+    return images
+
+def from_jsonld(texts):
+    """Fields of the first schema.org Event in a page's JSON-LD blocks"""
+    for text in texts or []:
+        # Some CMSs wrap the JSON in comments or CDATA
+        text = re.sub(r'^\s*(<!--|/\*<!\[CDATA\[\*/)|(-->|/\*\]\]>\*/)\s*$', '', text or '')
+        try:
+            document = json.loads(text)
+        except ValueError:
+            continue
+        
+        for node in _event_nodes(document):
+            price, currency = _offer(node.get('offers'))
+            return {
+                'title': _text(node.get('name')),
+                'description': _text(node.get('description')),
+                'start_date': _text(node.get('startDate')),
+                'end_date': _text(node.get('endDate')),
+                'location': _location(node.get('location')),
+                'price': price,
+                'price_currency': currency,
+                'images': _images(node.get('image')),
+            }
+    return {}
+
+def from_microdata(props):
+    """Fields of a schema.org Event marked up with itemprop attributes"""
+    values = {}
+    for prop in props or []:
+        name = prop.get('itemprop')
+        value = prop.get('content') or prop.get('datetime') or prop.get('src') or _text(prop.get('textContent'))
+        if name and value and name not in values:
+            values[name] = value
+    
+    return {
+        'title': values.get('name'),
+        'description': values.get('description'),
+        'start_date': values.get('startDate'),
+        'end_date': values.get('endDate'),
+        'location': values.get('location') or values.get('address'),
+        'price': values.get('price') or values.get('lowPrice'),
+        'price_currency': values.get('priceCurrency'),
+        'images': [values['image']] if values.get('image') else [],
+    }
+
+def from_opengraph(metas):
+    """Fields from og:* (and the non-standard event:*) meta tags"""
+    values = {}
+    for meta in metas or []:
+        if meta.get('property') and meta.get('content'):
+            values.setdefault(meta['property'], meta['content'])
+    
+    # og:title often carries the site name ("Event | Site")
+    title = values.get('og:title')
+    site = values.get('og:site_name')
+    if title and site:
+        title = re.sub(r'\s*[|\-–]\s*' + re.escape(site) + r'\s*$', '', title) or title
+    
+    return {
+        'title': title,
+        'description': values.get('og:description'),
+        'start_date': values.get('event:start_time'),
+        'end_date': values.get('event:end_time'),
+        'location': values.get('event:location'),
+        'images': [values['og:image']] if values.get('og:image') else [],
+    }
+
+def structured_fields(raw):
+    """Normalized fields from the output of STRUCTURED_DATA_SPEC, dropping empty ones"""
+    fields = {}
+    for source in (from_jsonld(raw.get('jsonld')), from_microdata(raw.get('microdata')), from_opengraph(raw.get('og'))):
+        for name, value in source.items():
+            if value and not fields.get(name):
+                fields[name] = value
+    
+    if fields.get('start_date'):
+        fields['date'] = fields['start_date']
+    if fields.get('price') and fields.get('price_currency'):
+        fields['price'] = f"{fields['price']} {fields['price_currency']}"
+    return fields
+
+def extract_with_structured(run, spec):
+    """
+    Extract a spec's fields, structured data first
+    
+    run(spec) applies a field spec (in the browser or to a parsed page).
+    It is called once, with STRUCTURED_DATA_SPEC merged into spec, so the
+    browser path stays a single round-trip. Spec fields the structured
+    data answers take its values; extra structured fields (start_date,
+    end_date, ...) are added to the record when the spec doesn't fill them.
+    """
+    combined = dict(spec)
+    combined.update({STRUCTURED_PREFIX + name: field for name, field in STRUCTURED_DATA_SPEC.items()})
+    record = run(combined)
+    structured = structured_fields({name: record.pop(STRUCTURED_PREFIX + name, None) for name in STRUCTURED_DATA_SPEC})
+    
+    for name, aliases in FIELD_ALIASES.items():
+        if not structured.get(name):
+            continue
+        for alias in aliases:
+            if alias in spec:
+                record[alias] = _as_spec_value(structured[name], spec[alias])
+    
+    # Structured images (usually the event's main picture) go ahead of the ones found on the page
+    if structured.get('images') and 'images' in spec:
+        record['images'] = _merge_images(structured['images'], record.get('images'), spec['images'])
+    
+    for name, value in structured.items():
+        if not record.get(name):
+            record[name] = value
+    return record
+
+def _merge_images(urls, found, field):
+    if field.get('join') is not None or not field.get('all'):
+        return found or _as_spec_value(urls, field)
+    
+    key = field['attrs'][0] if field.get('attrs') else None
+    images = []
+    seen = set()
+    for image in _as_spec_value(urls, field) + list(found or []):
+        url = image.get(key) if key else image
+        if url not in seen:
+            seen.add(url)
+            images.append(image)
+    return images[:field['limit']] if field.get('limit') else images
+
+def _as_spec_value(value, field):
+    """Shape a structured value like the spec field would have"""
+    if isinstance(value, list):
+        if field.get('attrs'):
+            value = [{field['attrs'][0]: v, **{a: None for a in field['attrs'][1:]}} for v in value]
+        if field.get('limit'):
+            value = value[:field['limit']]
+        if not field.get('all'):
+            return value[0] if value else None
+        return value
+    return [value] if field.get('all') and field.get('join') is None else value
@@ -0,0 +1,94 @@
+"""
+Test the crawl frontier: claiming, failing and resuming pages
+Uses a frontier and rate limiter in a temp directory, and a scraper whose
+detail pages are answered without a browser.
+"""
+import os
+import tempfile
+import config
+import crawl_frontier
+import rate_limiter
+from crawl_frontier import CrawlFrontier
+from scraper_base import BaseScraper
+
+class StubScraper(BaseScraper):
+    """Detail pages answered from a dict; missing ones come back empty"""
+    
+    def __init__(self, pages):
+        super().__init__(headless=True)
+        self.pages = pages
+        self.calls = []
+    
+    def fetch_detail(self, url, scrape_with_driver):
+        self.calls.append(url)
+        return self.pages.get(url)
+    
+    def scrape_detail(self, url):
+        return None
+
+def test_claim_fail_resume():
+    """Claims, per-pass failures and resuming an interrupted run"""
+    frontier = CrawlFrontier(path=os.path.join(tempfile.mkdtemp(), 'frontier.db'), max_attempts=2)
+    urls = ['https://example.com/a', 'https://example.com/b', 'https://example.com/c']
+    
+    frontier.add('S', urls)
+    started = frontier.begin('S')
+    assert frontier.claim('S', 2, since=started) == urls[:2]
+    assert frontier.claim('S', 10, since=started) == urls[2:]
+    assert frontier.claim('S', 10) == []
+    
+    # A failure is not claimed again in the same pass, only in a later one
+    frontier.complete('S', urls[0], {'title': 'A'})
+    frontier.fail('S', urls[1], 'No data extracted')
+    assert frontier.claim('S', 10, since=started) == []
+    
+    # c is still claimed: the run was interrupted and stays open
+    assert frontier.end('S', since=started) is False
+    assert frontier.records('S') == {urls[0]: {'title': 'A'}}
+    assert frontier.unfinished('S') == urls[1:]
+    
+    # The next pass picks up the failed page; a second failure gives up on it
+    assert frontier.claim('S', 10) == [urls[1]]
+    frontier.fail('S', urls[1], 'No data extracted')
+    frontier.release('S', [urls[2]])
+    assert frontier.claim('S', 10) == [urls[2]]
+    frontier.complete('S', urls[2], {'title': 'C'})
+    assert frontier.end('S') is True
+    assert frontier.records('S') == {}
+    
+    print("✓ Frontier claim/fail/resume test passed")
+
+def test_failed_pages_not_reclaimed(monkeypatch):
+    """Pages without data are scraped once per run and don't trip the breaker"""
+    tmp = tempfile.mkdtemp()
+    monkeypatch.setattr(crawl_frontier, '_shared', CrawlFrontier(path=os.path.join(tmp, 'frontier.db')))
+    monkeypatch.setattr(rate_limiter, '_shared', rate_limiter.RateLimiter(
+        path=os.path.join(tmp, 'rate_limits.db'),
+        limits={'default': {'rate': 1000, 'burst': 100, 'max_in_flight': 10}}
+    ))
+    monkeypatch.setattr(config, 'FRONTIER', True)
+    monkeypatch.setattr(config, 'DETAIL_WORKERS', 1)
+    
+    good = {f'https://example.com/event/{i}': {'title': f'Event {i}'} for i in range(3)}
+    urls = list(good) + ['https://example.com/event/empty-1', 'https://example.com/event/empty-2']
+    
+    scraper = StubScraper(good)
+    records = scraper.fetch_details(urls, 'scrape_detail')
+    
+    assert records == [good.get(url) for url in urls]
+    assert sorted(scraper.calls) == sorted(urls), scraper.calls
+    assert not scraper.breaker.is_open
+    
+    # The next run fetches every page again, the failed ones included
+    scraper = StubScraper(good)
+    scraper.fetch_details(urls, 'scrape_detail')
+    assert sorted(scraper.calls) == sorted(urls)
+    
+    print("✓ Frontier failure test passed")
+
+if __name__ == "__main__":
+    import pytest
+    
+    test_claim_fail_resume()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_failed_pages_not_reclaimed(monkeypatch)
@@ -0,0 +1,49 @@
+"""
+Test date and date range parsing
+English and Greek month names, numeric dates and ranges across a year end.
+"""
+from date_parser import find_date, parse_date, parse_date_range
+
+def test_ranges():
+    """Ranges with month names, in English and Greek"""
+    assert parse_date_range('17 Jan - 15 Feb 2026') == ('2026-01-17', '2026-02-15')
+    assert parse_date_range('Jan 17 - Feb 15, 2026') == ('2026-01-17', '2026-02-15')
+    assert parse_date_range('March 3 to 9, 2026') == ('2026-03-03', '2026-03-09')
+    assert parse_date_range('17 - 20 Ιανουαρίου 2026') == ('2026-01-17', '2026-01-20')
+    assert parse_date_range('Από 2 Μαΐου έως 14 Ιουνίου 2026') == ('2026-05-02', '2026-06-14')
+    assert parse_date_range('5 Σεπτ. - 12 Οκτ. 2026') == ('2026-09-05', '2026-10-12')
+    
+    # A range ending in January starts in the previous year
+    assert parse_date_range('20 Dec - 5 Jan 2027') == ('2026-12-20', '2027-01-05')
+    assert parse_date_range('28 Δεκεμβρίου - 6 Ιανουαρίου 2027') == ('2026-12-28', '2027-01-06')
+    
+    print("✓ Date range test passed")
+
+def test_numeric():
+    """Numeric dates and ranges"""
+    assert parse_date_range('17/01 - 15/02/2026') == ('2026-01-17', '2026-02-15')
+    assert parse_date_range('10 - 12.10.2025') == ('2025-10-10', '2025-10-12')
+    assert parse_date_range('17/01/2026 - 15/02/2026') == ('2026-01-17', '2026-02-15')
+    assert parse_date_range('17-01-26') == ('2026-01-17', None)
+    assert parse_date_range('2026-01-17T20:00:00') == ('2026-01-17', None)
+    
+    # Invalid dates are skipped for the next candidate
+    assert parse_date('31/02/2026 or 03/03/2026') == '2026-03-03'
+    
+    print("✓ Numeric date test passed")
+
+def test_single_dates():
+    """Single dates, the matched text and texts without a date"""
+    assert parse_date('17 January 2026') == '2026-01-17'
+    assert parse_date('January 17th, 2026') == '2026-01-17'
+    assert parse_date('Σάββατο 7 Μαρτίου 2026, 21:00') == '2026-03-07'
+    assert find_date('Doors open: Sat 7 March 2026, 21:00') == ('7 March 2026', '2026-03-07', None)
+    assert find_date('Every Friday') == (None, None, None)
+    assert find_date(None) == (None, None, None)
+    
+    print("✓ Single date test passed")
+
+if __name__ == "__main__":
+    test_ranges()
+    test_numeric()
+    test_single_dates()
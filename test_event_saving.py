@@ -0,0 +1,132 @@
+"""
+Test saving standardized events: hashes, last seen times and known URLs
+Runs against an in-memory SQLite database.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database import Base, Event
+from scraper_manager import ScraperManager
+
+def new_session():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def sample_event(slug, **fields):
+    event = {
+        'title': f'Event {slug}',
+        'description': 'An evening of music',
+        'date': '2026-05-01',
+        'location': 'Athens',
+        'source': 'More.com',
+        'url': f'https://www.more.com/gr-en/tickets/music/{slug}/',
+        'image': f'https://www.more.com/images/{slug}.jpg',
+    }
+    event.update(fields)
+    return event
+
+def test_last_seen():
+    """Unchanged events count as seen, so they aren't fetched again as stale"""
+    db = new_session()
+    manager = ScraperManager(db)
+    
+    assert manager.save_standardized_events([sample_event('a'), sample_event('b')]) == 2
+    
+    # A month later both are stale; a scrape finds a unchanged and b changed
+    month_ago = datetime.utcnow() - timedelta(days=30)
+    db.query(Event).update({Event.last_seen_at: month_ago, Event.updated_at: month_ago})
+    db.commit()
+    known = manager.load_known_urls()
+    assert known.to_fetch([sample_event('a')['url'], sample_event('b')['url']]) == [
+        sample_event('a')['url'], sample_event('b')['url']]
+    
+    assert manager.save_standardized_events([sample_event('a'), sample_event('b', description='Sold out')]) == 1
+    
+    a, b = db.query(Event).order_by(Event.id).all()
+    assert a.updated_at == month_ago and a.last_seen_at > month_ago
+    assert b.updated_at > month_ago and b.last_seen_at == b.updated_at
+    
+    known = manager.load_known_urls()
+    assert known.to_fetch([sample_event('a')['url'], sample_event('b')['url'], sample_event('c')['url']]) == [
+        sample_event('c')['url']]
+    
+    # Rows saved before last_seen_at existed use their last change
+    db.query(Event).update({Event.last_seen_at: None, Event.updated_at: month_ago})
+    db.commit()
+    assert manager.load_known_urls().to_fetch([sample_event('a')['url']]) == [sample_event('a')['url']]
+    
+    print("✓ Last seen test passed")
+
+def test_rows_without_hash():
+    """Rows saved before content_hash existed get a hash without counting as changed"""
+    db = new_session()
+    manager = ScraperManager(db)
+    
+    manager.save_standardized_events([sample_event('f')])
+    month_ago = datetime.utcnow() - timedelta(days=30)
+    db.query(Event).update({Event.content_hash: None, Event.updated_at: month_ago, Event.last_seen_at: None})
+    db.commit()
+    
+    assert manager.save_standardized_events([sample_event('f')]) == 0
+    event = db.query(Event).one()
+    assert event.content_hash == manager._event_fields(sample_event('f'))['content_hash']
+    assert event.updated_at == month_ago and event.last_seen_at > month_ago
+    
+    # From then on changes are detected as usual
+    assert manager.save_standardized_events([sample_event('f', description='Sold out')]) == 1
+    assert db.query(Event).one().updated_at > month_ago
+    
+    print("✓ Rows without hash test passed")
+
+def test_listing_only():
+    """A listing card refreshes title/date/location but keeps the detail page's images and content"""
+    db = new_session()
+    manager = ScraperManager(db)
+    
+    detail = sample_event('c', venue='Odeon of Herodes Atticus', region='Attica',
+                          coordinates={'lat': 37.97, 'lng': 23.72})
+    manager.save_standardized_events([detail])
+    stored_hash = db.query(Event).one().content_hash
+    
+    # Same card as the detail page: nothing to update
+    card = sample_event('c', description=None, listingOnly=True)
+    assert manager.save_standardized_events([card]) == 0
+    assert db.query(Event).one().content_hash == stored_hash
+    
+    # New title and another card image: the title changes, the image is added
+    card = sample_event('c', title='Event c (extra date)', description=None, listingOnly=True,
+                        image='https://www.more.com/images/c-card.jpg')
+    assert manager.save_standardized_events([card]) == 1
+    event = db.query(Event).one()
+    assert event.title == 'Event c (extra date)'
+    assert event.description == 'An evening of music'
+    assert event.images == ['https://www.more.com/images/c.jpg', 'https://www.more.com/images/c-card.jpg']
+    assert event.content['venue'] == 'Odeon of Herodes Atticus'
+    assert event.content['coordinates'] == {'lat': 37.97, 'lng': 23.72}
+    
+    print("✓ Listing-only save test passed")
+
+def test_optional_content():
+    """End dates and thumbnails are only stored when present, so other events keep their hash"""
+    db = new_session()
+    manager = ScraperManager(db)
+    
+    digest = 'ab' * 32
+    thumbnails = {'320': f'/images/{digest}/320', '960': f'/images/{digest}/960'}
+    manager.save_standardized_events([sample_event('d', endDate='2026-05-03', thumbnails=thumbnails),
+                                      sample_event('e', endDate=None, thumbnails=None)])
+    d, e = db.query(Event).order_by(Event.id).all()
+    assert d.content['endDate'] == '2026-05-03' and d.content['thumbnails'] == thumbnails
+    assert e.content == {'region': None, 'venue': None}
+    
+    # Stored events' thumbnails are kept when the image store evicts
+    assert manager.stored_image_digests() == {digest}
+    
+    print("✓ Optional content save test passed")
+
+if __name__ == "__main__":
+    test_last_seen()
+    test_rows_without_hash()
+    test_listing_only()
+    test_optional_content()
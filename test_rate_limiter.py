@@ -0,0 +1,71 @@
+"""
+Test the per-host token bucket and in-flight leases
+Uses a limiter in a temp directory with a fake clock.
+"""
+import os
+import tempfile
+import rate_limiter
+from rate_limiter import RateLimiter, host_of
+
+class Clock:
+    """Stands in for time.time() in rate_limiter"""
+    
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def time(self):
+        return self.now
+
+def test_rate_limiter():
+    """Burst, refill at the host's rate, in-flight limit and abandoned leases"""
+    clock = Clock()
+    real_time = rate_limiter.time
+    rate_limiter.time = clock
+    
+    try:
+        limiter = RateLimiter(path=os.path.join(tempfile.mkdtemp(), 'rate_limits.db'), limits={
+            'default': {'rate': 2.0, 'burst': 2, 'max_in_flight': 5},
+            'example.com': {'rate': 1.0, 'burst': 3, 'max_in_flight': 2},
+        })
+        
+        assert host_of('https://www.Example.com/a') == 'example.com'
+        assert limiter.limits_for('other.org') == (2.0, 2, 5)
+        assert limiter.limits_for('example.com') == (1.0, 3, 2)
+        
+        # Two in flight at most, though the bucket has a third token
+        first, _ = limiter.try_acquire('https://example.com/1')
+        second, _ = limiter.try_acquire('https://www.example.com/2')
+        assert first and second
+        lease, wait = limiter.try_acquire('https://example.com/3')
+        assert lease is None and wait == rate_limiter.MAX_POLL
+        
+        # A released slot can use the last token; then the bucket is empty
+        limiter.release(first)
+        third, _ = limiter.try_acquire('https://example.com/3')
+        assert third
+        limiter.release(second)
+        lease, wait = limiter.try_acquire('https://example.com/4')
+        assert lease is None and 0 < wait <= rate_limiter.MAX_POLL
+        
+        # Refilled at one token per second
+        clock.now += 0.5
+        assert limiter.try_acquire('https://example.com/4')[0] is None
+        clock.now += 0.5
+        fourth, _ = limiter.try_acquire('https://example.com/4')
+        assert fourth
+        
+        # Other hosts have their own bucket
+        assert limiter.try_acquire('https://other.org/a')[0]
+        
+        # Leases of a crashed worker expire after LEASE_TIMEOUT
+        clock.now += 10
+        assert limiter.try_acquire('https://example.com/5')[0] is None
+        clock.now += rate_limiter.LEASE_TIMEOUT
+        assert limiter.try_acquire('https://example.com/5')[0]
+    finally:
+        rate_limiter.time = real_time
+    
+    print("✓ Rate limiter test passed")
+
+if __name__ == "__main__":
+    test_rate_limiter()
@@ -0,0 +1,117 @@
+"""
+Test sitemap discovery with recorded sitemaps
+A sitemap index with a plain and a gzipped child sitemap is served by a
+stand-in fetcher; state is kept in a temp directory.
+"""
+import gzip
+import io
+import os
+import tempfile
+import sitemap_discovery
+from sitemap_discovery import SitemapDiscovery
+
+SITE = 'https://allofgreeceone.culture.gov.gr'
+
+def urlset(pages):
+    entries = ''.join(f'<url><loc>{loc}</loc>' + (f'<lastmod>{lastmod}</lastmod>' if lastmod else '') + '</url>'
+                      for loc, lastmod in pages)
+    return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'
+
+class FakeResponse:
+    def __init__(self, body):
+        self.text = body.decode('utf-8', 'replace')
+        self.raw = io.BytesIO(body)
+    
+    def close(self):
+        pass
+
+class FakeFetcher:
+    """Serves the sitemaps from a dict, recording the URLs asked for"""
+    
+    def __init__(self, files):
+        self.files = files
+        self.requested = []
+    
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        if url not in self.files:
+            raise IOError(f"404 for {url}")
+        return FakeResponse(self.files[url])
+
+def sitemap_files(pages, events_lastmod='2026-03-01'):
+    return {
+        f'{SITE}/robots.txt': f'User-agent: *\nSitemap: {SITE}/sitemap_index.xml\n'.encode(),
+        f'{SITE}/sitemap_index.xml': (
+            '<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f'<sitemap><loc>{SITE}/events-sitemap.xml.gz</loc><lastmod>{events_lastmod}</lastmod></sitemap>'
+            f'<sitemap><loc>{SITE}/pages-sitemap.xml</loc></sitemap>'
+            '</sitemapindex>'
+        ).encode(),
+        f'{SITE}/events-sitemap.xml.gz': gzip.compress(urlset(pages).encode()),
+        f'{SITE}/pages-sitemap.xml': urlset([(f'{SITE}/en/about/', '2025-01-01'),
+                                             (f'{SITE}/en/on-demand/extra/?utm_source=x', '2026-01-01')]).encode(),
+    }
+
+def test_sitemap_discovery():
+    """Only new pages or pages with a changed lastmod are returned after the first run"""
+    sitemap_discovery.STATE_FILE = os.path.join(tempfile.mkdtemp(), 'sitemap_state.json')
+    pages = [(f'{SITE}/en/on-demand/event-{i}', '2026-02-0%d' % (i + 1)) for i in range(3)]
+    pattern = r'/on-demand/[^/?#]+'
+    
+    # First run: every matching page, canonicalized, from both child sitemaps
+    fetcher = FakeFetcher(sitemap_files(pages))
+    discovery = SitemapDiscovery(fetcher, 'S', SITE, pattern)
+    links = discovery.discover()
+    assert links == [loc for loc, _ in pages] + [f'{SITE}/en/on-demand/extra'], links
+    
+    # Only event-0 and event-1 were scraped: event-2 is offered again
+    discovery.mark_done(links[:2])
+    discovery = SitemapDiscovery(FakeFetcher(sitemap_files(pages)), 'S', SITE, pattern)
+    assert discovery.discover() == [pages[2][0], f'{SITE}/en/on-demand/extra']
+    discovery.mark_done([pages[2][0], f'{SITE}/en/on-demand/extra'])
+    
+    # Nothing changed: the events sitemap (same lastmod) isn't even fetched
+    fetcher = FakeFetcher(sitemap_files(pages))
+    assert SitemapDiscovery(fetcher, 'S', SITE, pattern).discover() == []
+    assert f'{SITE}/events-sitemap.xml.gz' not in fetcher.requested
+    
+    # event-1 changed and event-3 is new
+    pages[1] = (pages[1][0], '2026-03-05')
+    pages.append((f'{SITE}/en/on-demand/event-3', '2026-03-06'))
+    discovery = SitemapDiscovery(FakeFetcher(sitemap_files(pages, '2026-03-06')), 'S', SITE, pattern)
+    assert discovery.discover() == [pages[1][0], pages[3][0]]
+    
+    # changed_only=False ignores the stored state; max_items stops early
+    discovery = SitemapDiscovery(FakeFetcher(sitemap_files(pages)), 'S', SITE, pattern)
+    assert discovery.discover(changed_only=False, max_items=2) == [pages[0][0], pages[1][0]]
+    
+    # No sitemap at all: None, so the caller falls back to the listing
+    assert SitemapDiscovery(FakeFetcher({}), 'S', SITE, pattern).discover() is None
+    
+    print("✓ Sitemap discovery test passed")
+
+def test_pages_without_lastmod():
+    """Scraped pages without a lastmod are offered again, after new and changed ones"""
+    sitemap_discovery.STATE_FILE = os.path.join(tempfile.mkdtemp(), 'sitemap_state.json')
+    pages = [(f'{SITE}/en/on-demand/undated', None), (f'{SITE}/en/on-demand/dated', '2026-02-01')]
+    pattern = r'/on-demand/[^/?#]+'
+    
+    discovery = SitemapDiscovery(FakeFetcher(sitemap_files(pages)), 'S', SITE, pattern)
+    assert discovery.discover() == [pages[0][0], pages[1][0], f'{SITE}/en/on-demand/extra']
+    discovery.mark_done([pages[0][0], pages[1][0], f'{SITE}/en/on-demand/extra'])
+    
+    # The events sitemap is read again, though its lastmod is unchanged
+    fetcher = FakeFetcher(sitemap_files(pages))
+    assert SitemapDiscovery(fetcher, 'S', SITE, pattern).discover() == [pages[0][0]]
+    assert f'{SITE}/events-sitemap.xml.gz' in fetcher.requested
+    
+    # A new page comes first; max_items leaves the undated one for later
+    pages.append((f'{SITE}/en/on-demand/new', '2026-03-01'))
+    discovery = SitemapDiscovery(FakeFetcher(sitemap_files(pages, '2026-03-06')), 'S', SITE, pattern)
+    assert discovery.discover(max_items=1) == [pages[2][0]]
+    
+    print("✓ Sitemap pages without lastmod test passed")
+
+if __name__ == "__main__":
+    test_sitemap_discovery()
+    test_pages_without_lastmod()
@@ -0,0 +1,73 @@
+"""
+Test URL canonicalization and matching listing endpoints on canonical links
+"""
+import json
+from url_canon import CanonicalIndex, canonical_links, canonicalize
+from xhr_discovery import find_pagination_endpoint, replay_listing
+
+def test_canonicalize():
+    """Per-host rules, plus the rules every host gets"""
+    cases = [
+        # Any host: lowercase scheme/host, default port, fragment, tracking parameters, sorted query
+        ('HTTPS://Example.COM:443/a//b?utm_source=x&b=2&a=1#top', 'https://example.com/a/b?a=1&b=2'),
+        ('http://example.com:80/path/', 'http://example.com/path/'),
+        ('https://example.com', 'https://example.com/'),
+        ('mailto:info@example.com', 'mailto:info@example.com'),
+        # culture.gov: no trailing slash, no query, Greek pages under /en/
+        ('https://allofgreeceone.culture.gov.gr/el/on-demand/event-1/?lang=el',
+         'https://allofgreeceone.culture.gov.gr/en/on-demand/event-1'),
+        # more.com (www. only dropped for matching rules): trailing slash, query kept, /gr-el/ -> /gr-en/
+        ('https://www.more.com/gr-el/tickets/music/show?date=2026-05-01&fbclid=abc',
+         'https://www.more.com/gr-en/tickets/music/show/?date=2026-05-01'),
+        ('https://www.more.com/images/poster.jpg', 'https://www.more.com/images/poster.jpg'),
+        # pigolampides: trailing slash, no query
+        ('https://pigolampides.gr/blog/post?replytocom=5', 'https://pigolampides.gr/blog/post/'),
+        # visitgreece: language prefixes of event pages dropped, no trailing slash
+        ('https://www.visitgreece.gr/el/events/carnival/', 'https://www.visitgreece.gr/events/carnival'),
+    ]
+    for url, expected in cases:
+        assert canonicalize(url) == expected, (url, canonicalize(url))
+    
+    # Every variant of a page is kept once, under its first-seen canonical form
+    index = CanonicalIndex()
+    assert index.add('https://pigolampides.gr/blog/post') == 'https://pigolampides.gr/blog/post/'
+    assert index.add('https://pigolampides.gr/blog/post/?utm_source=rss#comments') is None
+    assert 'https://pigolampides.gr/blog/post' in index and len(index) == 1
+    
+    assert canonical_links(['/relative', 'https://www.more.com/gr-el/a', 'https://www.more.com/gr-en/a/', None],
+                           lambda href: 'more.com' in href) == ['https://www.more.com/gr-en/a/']
+    
+    print("✓ URL canonicalization test passed")
+
+def test_endpoint_on_canonical_links():
+    """An endpoint returning raw links matches the canonical links load_more() collected"""
+    page_url = 'https://www.more.com/gr-en/tickets/music/'
+    api = 'https://www.more.com/api/events'
+    
+    def response(page):
+        return json.dumps({'items': [{'url': f'/gr-en/tickets/music/show-{page}-{i}'} for i in range(3)]})
+    
+    records = [{'url': f'{api}?page={page}', 'method': 'GET', 'status': 200, 'body': None,
+                'content_type': 'application/json', 'text': response(page)} for page in (2, 3)]
+    links = canonical_links(f'https://www.more.com/gr-en/tickets/music/show-{page}-{i}'
+                            for page in (1, 2, 3) for i in range(3))
+    assert links[0].endswith('/show-1-0/')
+    
+    contract = find_pagination_endpoint(records, links, page_url)
+    assert contract and contract['url'] == api and contract['page_param'] == 'page'
+    assert (contract['start'], contract['step']) == (2, 1)
+    
+    # Replayed links come back canonical too
+    class Fetcher:
+        def request(self, method, url, params=None, **kwargs):
+            page = int(params['page'])
+            return type('Response', (), {'text': response(page) if page <= 3 else '{"items": []}'})()
+    
+    replayed = replay_listing(Fetcher(), contract)
+    assert replayed == links, replayed
+    
+    print("✓ Listing endpoint matching test passed")
+
+if __name__ == "__main__":
+    test_canonicalize()
+    test_endpoint_on_canonical_links()
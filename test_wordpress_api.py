@@ -0,0 +1,164 @@
+"""
+Test the WordPress REST API adapter against a local stand-in server
+The server answers /wp-json/wp/v2/{posts,categories,media,users} with
+recorded Pigolampides JSON, paging posts and honouring modified_after.
+"""
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import crawl_frontier
+import page_cache
+import rate_limiter
+import wordpress_api
+from http_fetcher import HttpFetcher
+from pigolampides_scraper import PigolampidesScraper
+
+# Recorded post, repeated below to fill more than one page
+RECORDED_POST = {
+    "id": 4812,
+    "date": "2026-03-10T09:30:00",
+    "modified_gmt": "2026-03-11T08:00:00",
+    "link": "https://pigolampides.gr/blog/athens-street-food-tour/?utm_source=rss",
+    "title": {"rendered": "Athens Street Food &#8211; Tour"},
+    "content": {"rendered": "<p>Discover the best street food in Athens with the kids.</p>\n"
+                            "<p>Short.</p>\n<p><img src=\"/wp-content/uploads/2026/03/souvlaki.jpg\" alt=\"Souvlaki\"></p>\n"
+                            "<p>Meeting point: Monastiraki square, every Saturday morning.</p>"},
+    "excerpt": {"rendered": "<p>Street food for the whole family&hellip;</p>"},
+    "author": 3,
+    "categories": [12, 7],
+    "featured_media": 901,
+}
+
+CATEGORIES = [{"id": 7, "name": "Φαγητό"}, {"id": 12, "name": "Εκδρομές"}]
+MEDIA = [{"id": 901, "source_url": "https://pigolampides.gr/wp-content/uploads/2026/03/food.jpg", "alt_text": "Street food"}]
+USERS = [{"id": 3, "name": "Pigolampides"}]
+
+def recorded_posts(count=130):
+    posts = []
+    for i in range(count):
+        post = json.loads(json.dumps(RECORDED_POST))
+        post['id'] += i
+        post['link'] = post['link'].replace('tour/', f'tour-{i}/')
+        post['modified_gmt'] = f"2026-03-11T08:{i // 60:02d}:{i % 60:02d}"
+        posts.append(post)
+    return posts
+
+class StandInHandler(BaseHTTPRequestHandler):
+    posts = recorded_posts()
+    requests_seen = []
+    
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        self.requests_seen.append((parts.path, query))
+        endpoint = parts.path.rsplit('/', 1)[-1]
+        
+        if not parts.path.startswith('/wp-json/wp/v2/'):
+            self.send_error(404)
+            return
+        if endpoint == 'posts':
+            items = [p for p in self.posts if p['modified_gmt'] + 'Z' > query.get('modified_after', '')]
+            if query.get('orderby') == 'modified':
+                items.sort(key=lambda p: p['modified_gmt'], reverse=query.get('order') != 'asc')
+            per_page, page = int(query['per_page']), int(query.get('page', 1))
+            total_pages = max(1, -(-len(items) // per_page))
+            body, headers = items[(page - 1) * per_page:page * per_page], {'X-WP-TotalPages': str(total_pages)}
+        else:
+            ids = {int(i) for i in query.get('include', '').split(',') if i}
+            collection = {'categories': CATEGORIES, 'media': MEDIA, 'users': USERS}.get(endpoint, [])
+            body, headers = [item for item in collection if item['id'] in ids], {}
+        
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, *args):
+        pass
+
+def test_wordpress_api(monkeypatch):
+    """Page the stand-in API, map its posts and run again incrementally"""
+    # The test changes the served posts; start each run from the recorded ones
+    monkeypatch.setattr(StandInHandler, 'posts', recorded_posts())
+    monkeypatch.setattr(StandInHandler, 'requests_seen', [])
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    site_url = f"http://127.0.0.1:{server.server_address[1]}"
+    # Keep the run's state, cache and rate limits out of OUTPUT_DIR
+    tmp = tempfile.mkdtemp()
+    monkeypatch.setattr(wordpress_api, 'STATE_FILE', os.path.join(tmp, 'wp_api_state.json'))
+    for module, name, filename in ((page_cache, 'CACHE_FILE', 'page_cache.db'),
+                                   (rate_limiter, 'LIMITS_FILE', 'rate_limits.db'),
+                                   (crawl_frontier, 'FRONTIER_FILE', 'frontier.db')):
+        monkeypatch.setattr(module, name, os.path.join(tmp, filename))
+        # Shared instances built during the test use the temp files, and are dropped after it
+        monkeypatch.setattr(module, '_shared', None)
+    
+    try:
+        # Paged with per_page=100 and mapped into the scraper's post dict
+        scraper = PigolampidesScraper(headless=True)
+        scraper.base_url = site_url
+        posts = scraper.scrape_posts_from_api(max_posts=500)
+        scraper.mark_posts_saved()
+        
+        assert len(posts) == 130, len(posts)
+        post_pages = [q for path, q in StandInHandler.requests_seen if path.endswith('/posts')]
+        assert [q['page'] for q in post_pages] == ['1', '2'] and post_pages[0]['per_page'] == '100'
+        
+        post = posts[0]
+        assert post['url'] == 'https://pigolampides.gr/blog/athens-street-food-tour-0/', post['url']
+        assert post['title'] == 'Athens Street Food – Tour'
+        assert post['date'] == '2026-03-10T09:30:00'
+        assert post['author'] == 'Pigolampides'
+        assert post['categories'] == ['Εκδρομές', 'Φαγητό']
+        assert post['content'] == ['Discover the best street food in Athens with the kids.',
+                                   'Meeting point: Monastiraki square, every Saturday morning.']
+        assert post['excerpt'] == 'Street food for the whole family…'
+        assert post['images'] == [
+            {'src': 'https://pigolampides.gr/wp-content/uploads/2026/03/food.jpg', 'alt': 'Street food'},
+            {'src': 'https://pigolampides.gr/wp-content/uploads/2026/03/souvlaki.jpg', 'alt': 'Souvlaki'},
+        ]
+        
+        # A second run only asks for posts modified since the first, oldest change first
+        StandInHandler.posts[5]['modified_gmt'] = '2026-04-01T10:00:00'
+        StandInHandler.requests_seen.clear()
+        posts = scraper.scrape_posts_from_api(max_posts=500)
+        
+        assert [p['url'] for p in posts] == ['https://pigolampides.gr/blog/athens-street-food-tour-5/']
+        query = StandInHandler.requests_seen[0][1]
+        assert query['modified_after'] == '2026-03-11T08:02:09Z'
+        assert (query['orderby'], query['order']) == ('modified', 'asc')
+        
+        # Not saved yet: the next run asks for the same change again
+        assert len(scraper.scrape_posts_from_api(max_posts=500)) == 1
+        scraper.mark_posts_saved()
+        
+        # A run cut short by max_posts still moves the mark, and the next run goes on from there
+        for i, minute in ((9, 30), (7, 10), (8, 20)):
+            StandInHandler.posts[i]['modified_gmt'] = f'2026-04-02T10:{minute}:00'
+        posts = scraper.scrape_posts_from_api(max_posts=2)
+        scraper.mark_posts_saved()
+        assert [p['url'][-3:-1] for p in posts] == ['-7', '-8']
+        posts = scraper.scrape_posts_from_api(max_posts=2)
+        assert [p['url'][-3:-1] for p in posts] == ['-9']
+        
+        # No API there: posts() returns None so the scraper falls back to the browser
+        api = wordpress_api.WordPressApi(HttpFetcher(), f"{site_url}/not-wordpress", 'missing')
+        assert api.posts() is None
+    finally:
+        server.shutdown()
+    
+    print("✓ WordPress API adapter test passed")
+
+if __name__ == "__main__":
+    import pytest
+    
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_wordpress_api(monkeypatch)
@@ -0,0 +1,108 @@
+"""
+URL canonicalization
+Every link collector and the events table go through canonicalize(), so
+the same page reached through a trailing slash, a fragment, tracking
+parameters or another language prefix is fetched and stored once.
+Rules are set per host (without "www.") in URL_RULES.
+"""
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from rate_limiter import host_of
+
+# Query parameters that never change the page
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|dclid|msclkid|mc_cid|mc_eid|_ga|_gl|ref|igshid)$', re.I)
+
+# Per-host rules:
+#   trailing_slash: True to always end paths with "/", False to strip it, None to leave as is
+#   drop_query: drop the whole query string (detail pages don't depend on it)
+#   languages: path prefixes mapped to the canonical language variant
+URL_RULES = {
+    'default': {'trailing_slash': None, 'drop_query': False, 'languages': {}},
+    'allofgreeceone.culture.gov.gr': {'trailing_slash': False, 'drop_query': True, 'languages': {'/el/': '/en/'}},
+    'more.com': {'trailing_slash': True, 'languages': {'/gr-el/': '/gr-en/'}},
+    'pigolampides.gr': {'trailing_slash': True, 'drop_query': True},
+    'visitgreece.gr': {'trailing_slash': False, 'drop_query': True, 'languages': {'/el/events/': '/events/', '/en/events/': '/events/'}},
+}
+
+def rules_for(url):
+    rules = dict(URL_RULES['default'])
+    rules.update(URL_RULES.get(host_of(url), {}))
+    return rules
+
+def canonicalize(url):
+    """
+    Canonical form of an absolute URL
+    
+    Scheme and host are lowercased, default ports, fragments and tracking
+    parameters dropped and the remaining query sorted, then the host's
+    rules are applied. Anything that isn't an http(s) URL is returned as is.
+    """
+    if not url:
+        return url
+    
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https'):
+        return url
+    
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rsplit(':', 1)[-1]) in (('http', '80'), ('https', '443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    
+    rules = rules_for(urlunsplit((scheme, netloc, '', '', '')))
+    path = re.sub(r'/{2,}', '/', parts.path) or '/'
+    
+    for prefix, canonical in rules['languages'].items():
+        if path.startswith(prefix):
+            path = canonical + path[len(prefix):]
+            break
+    
+    if path != '/':
+        if rules['trailing_slash'] is True and not path.endswith('/') and '.' not in path.rsplit('/', 1)[-1]:
+            path += '/'
+        elif rules['trailing_slash'] is False:
+            path = path.rstrip('/') or '/'
+    
+    query = ''
+    if not rules['drop_query']:
+        params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not TRACKING_PARAMS.match(k)]
+        query = urlencode(sorted(params))
+    
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+class CanonicalIndex:
+    """
+    Canonical URLs seen so far, in discovery order
+    
+    add() returns the canonical URL the first time a page is seen and None
+    for every later variant of it.
+    """
+    
+    def __init__(self, urls=()):
+        self._seen = {}
+        for url in urls:
+            self.add(url)
+    
+    def add(self, url):
+        canonical = canonicalize(url)
+        if not canonical or canonical in self._seen:
+            return None
+        self._seen[canonical] = True
+        return canonical
+    
+    def __contains__(self, url):
+        return canonicalize(url) in self._seen
+    
+    def __len__(self):
+        return len(self._seen)
+    
+    def urls(self):
+        return list(self._seen)
+
+def canonical_links(hrefs, link_filter=None):
+    """Canonical, de-duplicated hrefs that pass link_filter, in order"""
+    index = CanonicalIndex()
+    for href in hrefs:
+        if href and (link_filter is None or link_filter(href)):
+            index.add(href)
+    return index.urls()
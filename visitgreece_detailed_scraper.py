@@ -4,40 +4,94 @@ Clicks into each event to get full details
 """
 
 from scraper_base import BaseScraper
+from url_canon import canonical_links, canonicalize
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import json
 import os
-import time
 import config
 
 class VisitGreeceDetailedScraper(BaseScraper):
-    def __init__(self, headless=False):
-        super().__init__(headless)
+    ready_selectors = ('h1',)
+    
+    # Event detail pages are server-rendered
+    detail_needs_js = False
+    
+    # Event pages listed in the site's sitemaps
+    sitemap_url_pattern = r'visitgreece\.gr/(?:[a-z]{2}/)?events/[^?#]+'
+    sitemap_filter = r'event|page|node'
+    
+    # Field spec for event pages, extracted with a single execute_script call
+    detail_spec = {
+        'title': {'selectors': ['h1', '.event-title', '[class*="title"]']},
+        'date': {'selectors': ['.event-date', '[class*="date"]', 'time', '.date']},
+        'location': {'selectors': ['.event-location', '[class*="location"]', '.location', '[class*="place"]']},
+        'description': {'selectors': ['.event-description', '[class*="description"]', '.description', 'article p']},
+        'category': {'selectors': ['.category', '[class*="category"]', '.tag']},
+        'price': {'selectors': ['.price', '[class*="price"]', '.cost', '[class*="cost"]']},
+        'contact': {'selectors': ['.contact', '[class*="contact"]', '.phone', '[class*="phone"]']},
+        'images': {'selectors': ['img'], 'attr': 'src', 'all': True, 'scan_limit': 3},
+        'full_text': {'selectors': ['body']},
+    }
+    
+    # Event cards on the listing page, one record per card (keyed by its link)
+    listing_card_spec = {
+        'cards': {
+            'selectors': ['[class*="event"][class*="card"]', '[class*="event-item"]', 'li[class*="event"]', 'article', '.card'],
+            'all': True,
+            'fields': {
+                'url': {'selectors': ['a[href*="/events/"]'], 'attr': 'href'},
+                'title': {'selectors': ['h2', 'h3', 'h4', '[class*="title"]']},
+                'category': {'selectors': ['[class*="category"]', '[class*="tag"]']},
+                'date': {'selectors': ['time', '[class*="date"]']},
+                'location': {'selectors': ['[class*="venue"]', '[class*="location"]', '[class*="place"]']},
+                'image': {'selectors': ['img'], 'attr': 'src'},
+            },
+        },
+    }
+    
+    # Card fields a known event needs for its detail page to be skipped
+    card_fields = ('title', 'date', 'location')
+    
+    def __init__(self, headless=False, driver_pool=None):
+        super().__init__(headless, driver_pool)
         self.base_url = "https://www.visitgreece.gr/events"
     
-    def scrape_events_with_details(self, max_events=20):
+    def scrape_events_with_details(self, max_events=20, known_urls=None):
         """
         Scrape events and click into each for detailed information
         
         Args:
             max_events: Maximum number of events to scrape in detail
+            known_urls: Stored URLs; those seen recently are not fetched again
         """
-        self.setup_driver()
         all_events = []
         
         try:
-            print(f"Navigating to {self.base_url}...")
-            self.driver.get(self.base_url)
-            time.sleep(4)
+            # Events from the listing cards, opening detail pages only where needed
+            if config.LISTING_FIRST:
+                events = self.scrape_events_from_listing(max_events, known_urls)
+                if events is not None:
+                    return events
+                print("No event cards on the listing, following event links instead")
             
-            # Scroll to load content
-            print("Loading events...")
-            self.scroll_to_bottom(pause_time=2)
+            # New or changed events from the sitemap, without loading the listing
+            event_links = self.sitemap_links(self.base_url, max_items=max_events)
             
-            # Get all event links
-            event_links = self.get_event_links()
+            if event_links is None:
+                print(f"Navigating to {self.base_url}...")
+                self.load_page(self.base_url, ready_selectors=['a[href*="/events/"]'])
+                
+                # Scroll to load content
+                print("Loading events...")
+                self.scroll_to_bottom(pause_time=2)
+                
+                # Get all event links
+                event_links = self.get_event_links()
+            elif not event_links:
+                print("No new or changed events in the sitemap")
+                return all_events
             
             if not event_links:
                 print("No event links found. Trying alternative approach...")
@@ -45,24 +99,17 @@ class VisitGreeceDetailedScraper(BaseScraper):
             
             print(f"Found {len(event_links)} event links")
             
-            # Limit to max_events
-            event_links = event_links[:max_events]
+            # Limit to max_events, leaving out recently seen events
+            event_links = self.skip_known(event_links, known_urls)[:max_events]
             
-            # Visit each event page for details
-            for idx, link in enumerate(event_links):
-                try:
-                    print(f"\nScraping event {idx + 1}/{len(event_links)}: {link}")
-                    event_details = self.scrape_event_detail_page(link)
-                    
-                    if event_details:
-                        all_events.append(event_details)
-                        print(f"✓ Scraped: {event_details.get('title', 'N/A')[:60]}")
-                    
-                    time.sleep(1)  # Be polite to the server
-                    
-                except Exception as e:
-                    print(f"✗ Error scraping event {idx + 1}: {e}")
-                    continue
+            # Visit each event page for details (crawled concurrently over HTTP, browser fallback in parallel when DETAIL_WORKERS > 1)
+            def report(idx, link, event_details):
+                print(f"\nScraping event {idx + 1}/{len(event_links)}: {link}")
+                if event_details:
+                    print(f"✓ Scraped: {(event_details.get('title') or 'N/A')[:60]}")
+            
+            events = self.fetch_details(event_links, 'scrape_event_detail_page', on_result=report)
+            all_events.extend(event for event in events if event)
             
             print(f"\n{'='*60}")
             print(f"Total events scraped: {len(all_events)}")
@@ -77,16 +124,97 @@ class VisitGreeceDetailedScraper(BaseScraper):
         
         return all_events
     
+    def scrape_events_from_listing(self, max_events=20, known_urls=None):
+        """
+        Listing-first scrape: events are read from the cards of the listing page
+        
+        Known events whose card has every field in card_fields are refreshed
+        from the card alone (marked listing_only, so stored details are kept).
+        Detail pages are only opened for new events and for cards missing one
+        of those fields, and card values fill what the detail page lacks.
+        
+        Returns:
+            List of events, or None when the listing showed no cards
+        """
+        print(f"Navigating to {self.base_url}...")
+        self.load_page(self.base_url, ready_selectors=['a[href*="/events/"]'])
+        
+        print("Loading events...")
+        self.scroll_to_bottom(pause_time=2)
+        
+        cards = self.get_listing_cards()[:max_events]
+        if not cards:
+            return None
+        
+        known_urls = known_urls or ()
+        to_detail = [card['url'] for card in cards
+                     if card['url'] not in known_urls or not all(card.get(field) for field in self.card_fields)]
+        print(f"Found {len(cards)} event cards: {len(cards) - len(to_detail)} refreshed from the listing, "
+              f"{len(to_detail)} detail pages to open")
+        
+        def report(idx, link, event_details):
+            print(f"\nScraping event {idx + 1}/{len(to_detail)}: {link}")
+            if event_details:
+                print(f"✓ Scraped: {(event_details.get('title') or 'N/A')[:60]}")
+        
+        records = self.fetch_details(to_detail, 'scrape_event_detail_page', on_result=report) if to_detail else []
+        details = dict(zip(to_detail, records))
+        
+        events = []
+        for card in cards:
+            url = card['url']
+            event = details.get(url)
+            if event:
+                # The card fills in what the detail page didn't have
+                for field, value in self.card_event(card).items():
+                    if not event.get(field):
+                        event[field] = value
+            else:
+                # Known and complete on the card, or the detail page failed
+                event = self.card_event(card, listing_only=url in known_urls)
+            if event.get('title'):
+                events.append(event)
+        
+        # Pages an interrupted run left in the frontier come after the cards
+        events.extend(record for record in records[len(to_detail):] if record)
+        
+        print(f"\n{'='*60}")
+        print(f"Total events scraped: {len(events)}")
+        return events
+    
+    def get_listing_cards(self):
+        """Card records of the loaded listing page, by canonical URL, in one round-trip"""
+        cards = {}
+        for card in self.extract_fields(self.listing_card_spec).get('cards') or []:
+            url = canonicalize(card.get('url'))
+            if url and url not in cards:
+                cards[url] = dict(card, url=url)
+        return list(cards.values())
+    
+    def card_event(self, card, listing_only=False):
+        """Build an event dict, shaped like build_event(), from a listing card"""
+        event = {'url': card['url']}
+        for field in ['title', 'date', 'end_date', 'location', 'description', 'category', 'price', 'contact']:
+            event[field] = card.get(field)
+        
+        event['images'] = [card['image']] if card.get('image') else []
+        event['full_text'] = None
+        
+        if listing_only:
+            event['listing_only'] = True
+        return event
+    
     def get_event_links(self):
         """Extract all event links from the main page"""
         links = []
         
         try:
-            # Try to find all links that might be events
-            all_links = self.driver.find_elements(By.TAG_NAME, 'a')
+            # All hrefs on the page in one round-trip
+            hrefs = self.extract_fields({
+                'links': {'selectors': ['a'], 'attr': 'href', 'all': True}
+            }).get('links', [])
             
-            for link in all_links:
-                href = link.get_attribute('href')
+            for href in hrefs:
                 if href and '/events/' in href and href != self.base_url:
                     if href not in links:
                         links.append(href)
@@ -94,76 +222,36 @@ class VisitGreeceDetailedScraper(BaseScraper):
         except Exception as e:
             print(f"Error getting event links: {e}")
         
-        return links
+        return canonical_links(links)
     
     def scrape_event_detail_page(self, url):
         """Scrape detailed information from an individual event page"""
         try:
-            self.driver.get(url)
-            time.sleep(2)
-            
-            event = {'url': url}
-            
-            # Extract title
-            title_selectors = ['h1', '.event-title', '[class*="title"]']
-            event['title'] = self.find_text_by_selectors(title_selectors)
-            
-            # Extract date/time
-            date_selectors = ['.event-date', '[class*="date"]', 'time', '.date']
-            event['date'] = self.find_text_by_selectors(date_selectors)
-            
-            # Extract location
-            location_selectors = ['.event-location', '[class*="location"]', '.location', '[class*="place"]']
-            event['location'] = self.find_text_by_selectors(location_selectors)
+            self.load_page(url)
             
-            # Extract description
-            desc_selectors = ['.event-description', '[class*="description"]', '.description', 'article p']
-            event['description'] = self.find_text_by_selectors(desc_selectors)
-            
-            # Extract category
-            category_selectors = ['.category', '[class*="category"]', '.tag']
-            event['category'] = self.find_text_by_selectors(category_selectors)
-            
-            # Extract price/cost
-            price_selectors = ['.price', '[class*="price"]', '.cost', '[class*="cost"]']
-            event['price'] = self.find_text_by_selectors(price_selectors)
-            
-            # Extract contact info
-            contact_selectors = ['.contact', '[class*="contact"]', '.phone', '[class*="phone"]']
-            event['contact'] = self.find_text_by_selectors(contact_selectors)
-            
-            # Extract images
-            try:
-                images = self.driver.find_elements(By.TAG_NAME, 'img')
-                event['images'] = [img.get_attribute('src') for img in images[:3] if img.get_attribute('src')]
-            except:
-                event['images'] = []
-            
-            # Get all text content as backup
-            try:
-                body = self.driver.find_element(By.TAG_NAME, 'body')
-                event['full_text'] = body.text[:1000]  # First 1000 chars
-            except:
-                event['full_text'] = None
-            
-            return event
+            # Structured data first, then the selectors for whatever it didn't have
+            return self.build_event(url, self.extract_detail_fields(self.detail_spec))
             
         except Exception as e:
             print(f"Error scraping detail page {url}: {e}")
             return None
     
-    def find_text_by_selectors(self, selectors):
-        """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text:
-                        return text
-            except:
-                continue
-        return None
+    def build_event(self, url, data):
+        """Build the event dict from extracted detail_spec fields"""
+        event = {'url': url}
+        for field in ['title', 'date', 'end_date', 'location', 'description', 'category', 'price', 'contact']:
+            event[field] = data.get(field)
+        
+        event['images'] = data.get('images') or []
+        
+        # All text content as backup
+        event['full_text'] = (data.get('full_text') or '')[:1000] or None
+        
+        return event
+    
+    def parse_detail_html(self, url, doc):
+        """Extract event details from server-rendered HTML with the same field spec"""
+        return self.build_event(url, self.extract_detail_fields(self.detail_spec, doc=doc))
     
     def scrape_events_simple(self):
         """Fallback: Simple scraping without clicking into details"""
@@ -3,6 +3,7 @@ Improved scraper for Visit Greece events with pagination support
 """
 
 from scraper_base import BaseScraper
+from url_canon import canonical_links
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -12,6 +13,10 @@ import time
 import config
 
 class VisitGreeceImprovedScraper(BaseScraper):
+    # English event pages (category/event) listed in the site's sitemaps
+    sitemap_url_pattern = r'visitgreece\.gr/(?:en/)?events/[^/?#]+/[^?#]+'
+    sitemap_filter = r'event|page|node'
+    
     def __init__(self, headless=False):
         super().__init__(headless)
         self.base_url = "https://www.visitgreece.gr/events"
@@ -29,6 +34,21 @@ class VisitGreeceImprovedScraper(BaseScraper):
         page = 1
         
         try:
+            # New or changed events from the sitemap replace paging through ?pg=N
+            sitemap_links = self.sitemap_links(self.base_url, max_items=max_events)
+            if sitemap_links is not None:
+                sitemap_links = [link for link in sitemap_links if link not in self.scraped_urls]
+                print(f"Scraping {len(sitemap_links)} new or changed events from the sitemap...")
+                
+                events = self.scrape_details(sitemap_links, lambda scraper, link: scraper.scrape_event_detail_page(link))
+                for link, event in zip(sitemap_links, events):
+                    if event:
+                        all_events.append(event)
+                        self.scraped_urls.add(link)
+                        print(f"  [{len(all_events)}/{max_events}] ✓ {event.get('title', 'N/A')[:50]}")
+                
+                return all_events
+            
             while len(all_events) < max_events:
                 print(f"\n{'='*60}")
                 print(f"Scraping page {page}...")
@@ -65,15 +85,14 @@ class VisitGreeceImprovedScraper(BaseScraper):
                         continue
                     
                     try:
-                        event_details = self.scrape_event_detail_page(link)
+                        with self.throttle.slot(link):
+                            event_details = self.scrape_event_detail_page(link)
                         if event_details:
                             all_events.append(event_details)
                             self.scraped_urls.add(link)
                             events_scraped_this_page += 1
                             print(f"  [{len(all_events)}/{max_events}] ✓ {event_details.get('title', 'N/A')[:50]}")
                         
-                        time.sleep(0.5)  # Be polite
-                        
                     except Exception as e:
                         print(f"  ✗ Error scraping {link}: {e}")
                         continue
@@ -130,7 +149,7 @@ class VisitGreeceImprovedScraper(BaseScraper):
         except Exception as e:
             print(f"Error getting event links: {e}")
         
-        return links
+        return canonical_links(links)
     
     def scrape_event_detail_page(self, url):
         """Scrape detailed information from an individual event page"""
@@ -223,17 +242,8 @@ class VisitGreeceImprovedScraper(BaseScraper):
             return None
     
     def find_text_by_selectors(self, selectors):
-        """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 2:  # Avoid empty or very short strings
-                        return text
-            except:
-                continue
-        return None
+        """Try multiple selectors to find text (ignoring strings shorter than 3 chars)"""
+        return super().find_text_by_selectors(selectors, min_length=3)
     
     def find_attribute_by_selectors(self, selectors, attribute):
         """Try multiple selectors to find an attribute"""
@@ -0,0 +1,342 @@
+"""
+Listing endpoint discovery and replay
+While a listing is grown in the browser ("Read more" clicks, infinite scroll),
+an injected recorder keeps the fetch/XHR responses the page receives. The
+request whose responses contain the collected links is the listing's
+pagination endpoint; its contract (URL, method, parameters and which one
+pages) is saved under OUTPUT_DIR so later runs can page through it over
+plain HTTP. When a replay stops yielding links the contract is dropped and
+the scraper falls back to the browser.
+"""
+import json
+import os
+from contextlib import nullcontext
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl
+import config
+from http_fetcher import LXML_AVAILABLE
+from url_canon import canonical_links
+
+if LXML_AVAILABLE:
+    import lxml.html
+
+ENDPOINTS_FILE = os.path.join(config.OUTPUT_DIR, 'listing_endpoints.json')
+
+# Parameter names that usually carry the page number or offset
+PAGE_PARAM_NAMES = ['page', 'paged', 'p', 'pg', 'pageNumber', 'page_number', 'pageIndex',
+                    'offset', 'start', 'skip', 'from']
+OFFSET_PARAM_NAMES = ['offset', 'start', 'skip', 'from']
+
+# Responses larger than this are not kept by the recorder
+MAX_RECORDED_CHARS = 500000
+
+# Wraps fetch() and XMLHttpRequest so text responses are kept in window.__scraperXhr
+XHR_RECORDER_JS = """
+if (window.__scraperXhr) return;
+var log = window.__scraperXhr = [];
+var maxChars = arguments[0];
+
+function bodyText(body) {
+    if (typeof body === 'string') return body;
+    if (typeof URLSearchParams !== 'undefined' && body instanceof URLSearchParams) return body.toString();
+    if (typeof FormData !== 'undefined' && body instanceof FormData) {
+        var params = new URLSearchParams();
+        body.forEach(function(value, key) {
+            if (typeof value === 'string') params.append(key, value);
+        });
+        return params.toString();
+    }
+    return null;
+}
+
+function record(url, method, body, status, type, text) {
+    if (!text || text.length > maxChars) return;
+    log.push({
+        url: new URL(url, location.href).href,
+        method: (method || 'GET').toUpperCase(),
+        body: bodyText(body),
+        status: status,
+        content_type: type || '',
+        text: text
+    });
+}
+
+if (window.fetch) {
+    var originalFetch = window.fetch;
+    window.fetch = function(input, init) {
+        var url = (typeof input === 'string') ? input : input.url;
+        var method = (init && init.method) || (input && input.method) || 'GET';
+        var body = init && init.body;
+        return originalFetch.apply(this, arguments).then(function(response) {
+            var type = response.headers.get('content-type') || '';
+            if (/json|html|text/.test(type)) {
+                response.clone().text().then(function(text) {
+                    record(url, method, body, response.status, type, text);
+                }).catch(function() {});
+            }
+            return response;
+        });
+    };
+}
+
+var originalOpen = XMLHttpRequest.prototype.open;
+var originalSend = XMLHttpRequest.prototype.send;
+XMLHttpRequest.prototype.open = function(method, url) {
+    this.__scraperRequest = {method: method, url: url};
+    return originalOpen.apply(this, arguments);
+};
+XMLHttpRequest.prototype.send = function(body) {
+    var xhr = this;
+    var request = xhr.__scraperRequest;
+    if (request) {
+        xhr.addEventListener('load', function() {
+            var text = '';
+            try {
+                if (xhr.responseType === '' || xhr.responseType === 'text') text = xhr.responseText;
+                else if (xhr.responseType === 'json') text = JSON.stringify(xhr.response);
+            } catch (e) {}
+            record(request.url, request.method, body, xhr.status, xhr.getResponseHeader('content-type'), text);
+        });
+    }
+    return originalSend.apply(this, arguments);
+};
+"""
+
+XHR_RECORDS_JS = "return window.__scraperXhr || [];"
+
+def install_recorder(driver):
+    """Start recording fetch/XHR responses in the current page"""
+    driver.execute_script(XHR_RECORDER_JS, MAX_RECORDED_CHARS)
+
+def recorded_responses(driver):
+    """Responses recorded since install_recorder()"""
+    return driver.execute_script(XHR_RECORDS_JS) or []
+
+def links_in_payload(text, base_url):
+    """
+    All links in a JSON or HTML response
+    
+    JSON is walked for strings that are URLs, site-relative paths or HTML
+    fragments (common for "load more" endpoints that return rendered cards).
+    """
+    try:
+        payload = json.loads(text)
+    except (ValueError, TypeError):
+        return _links_in_html(text, base_url) if text and '<' in text else []
+    
+    links = []
+    stack = [payload]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(reversed(list(value.values())))
+        elif isinstance(value, list):
+            stack.extend(reversed(value))
+        elif isinstance(value, str):
+            if '<' in value and '>' in value:
+                links.extend(_links_in_html(value, base_url))
+            elif value.startswith(('http://', 'https://', '/')) and ' ' not in value:
+                links.append(urljoin(base_url, value))
+    return links
+
+def _links_in_html(html, base_url):
+    if not LXML_AVAILABLE:
+        return []
+    try:
+        fragment = lxml.html.fragment_fromstring(html, create_parent='div')
+    except Exception:
+        return []
+    return [urljoin(base_url, href) for href in fragment.xpath('.//a/@href')]
+
+def _request_params(record):
+    """Query and body parameters of a recorded request"""
+    parts = urlsplit(record['url'])
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    
+    body, body_format = None, None
+    raw = record.get('body')
+    if raw:
+        try:
+            body = json.loads(raw)
+            body_format = 'json' if isinstance(body, dict) else None
+        except ValueError:
+            body = dict(parse_qsl(raw, keep_blank_values=True))
+            body_format = 'form' if body else None
+        if not body_format:
+            body = None
+    
+    return query, body, body_format
+
+def _int_value(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _find_page_param(records, link_counts):
+    """Pick the parameter that pages, with its first value and step"""
+    params = []
+    for record in records:
+        query, body, _ = _request_params(record)
+        params.append({('query', k): v for k, v in query.items()})
+        params[-1].update({('body', k): v for k, v in (body or {}).items()})
+    
+    # Seen several times: the integer parameter that changes between requests
+    if len(params) > 1:
+        for key in params[0]:
+            values = [_int_value(p.get(key)) for p in params]
+            if None in values or len(set(values)) < 2:
+                continue
+            steps = {b - a for a, b in zip(values, values[1:])}
+            if len(steps) == 1 and steps.pop() > 0:
+                return key, values[0], values[1] - values[0]
+    
+    # Seen once: go by the parameter name
+    for name in PAGE_PARAM_NAMES:
+        for location in ('query', 'body'):
+            value = _int_value(params[0].get((location, name)))
+            if value is not None:
+                step = link_counts[0] if name in OFFSET_PARAM_NAMES else 1
+                return (location, name), value, max(step, 1)
+    
+    return None
+
+def find_pagination_endpoint(records, links, page_url):
+    """
+    Identify the listing's pagination endpoint from recorded responses
+    
+    Returns a replayable contract, or None when no successful request
+    returned any of the collected links or its paging parameter is unclear.
+    Links are compared in canonical form, as load_more() returns them.
+    """
+    wanted = set(canonical_links(links))
+    groups = {}
+    
+    for record in records:
+        if record.get('status') != 200:
+            continue
+        found = wanted.intersection(canonical_links(links_in_payload(record.get('text'), page_url)))
+        if not found:
+            continue
+        parts = urlsplit(record['url'])
+        key = (record['method'], urlunsplit((parts.scheme, parts.netloc, parts.path, '', '')))
+        groups.setdefault(key, []).append((record, len(found)))
+    
+    if not groups:
+        return None
+    
+    (method, endpoint), matches = max(groups.items(), key=lambda item: (len(item[1]), sum(n for _, n in item[1])))
+    records = [record for record, _ in matches]
+    page = _find_page_param(records, [n for _, n in matches])
+    if not page:
+        return None
+    
+    (page_in, page_param), start, step = page
+    query, body, body_format = _request_params(records[0])
+    
+    return {
+        'method': method,
+        'url': endpoint,
+        'query': query,
+        'body': body,
+        'body_format': body_format,
+        'page_param': page_param,
+        'page_in': page_in,
+        'start': start,
+        'step': step,
+        'referer': page_url,
+        'json': 'json' in (records[0].get('content_type') or ''),
+    }
+
+def load_endpoints():
+    """All saved endpoint contracts, by source"""
+    try:
+        with open(ENDPOINTS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except:
+        return {}
+
+def load_endpoint(source):
+    """The saved contract of one source, if any"""
+    return load_endpoints().get(source)
+
+def save_endpoint(source, contract):
+    """Save or, with contract=None, forget a source's contract"""
+    endpoints = load_endpoints()
+    if contract:
+        endpoints[source] = contract
+    else:
+        endpoints.pop(source, None)
+    
+    os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+    with open(ENDPOINTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(endpoints, f, ensure_ascii=False, indent=2)
+
+def request_page(fetcher, contract, value):
+    """Request one page of a recorded endpoint"""
+    query = dict(contract['query'])
+    body = dict(contract['body']) if contract.get('body') else None
+    
+    if contract['page_in'] == 'query':
+        query[contract['page_param']] = str(value)
+    else:
+        body[contract['page_param']] = value if contract['body_format'] == 'json' else str(value)
+    
+    kwargs = {
+        'params': query,
+        'headers': {'X-Requested-With': 'XMLHttpRequest', 'Referer': contract['referer']},
+    }
+    if contract['body_format'] == 'json':
+        kwargs['json'] = body
+    elif body is not None:
+        kwargs['data'] = body
+    if contract.get('json'):
+        kwargs['headers']['Accept'] = 'application/json, text/plain, */*'
+    
+    return fetcher.request(contract['method'], contract['url'], **kwargs)
+
+def replay_listing(fetcher, contract, link_filter=None, max_items=None, max_pages=500, throttle=None):
+    """
+    Page through a recorded endpoint over HTTP
+    
+    Starts one step before the first recorded request (the page the browser
+    rendered itself) and stops at the first page without new links. Returns
+    the canonical links in order, or None if the recorded page no longer
+    yields links, i.e. the contract has changed.
+    """
+    links = {}
+    step = contract['step']
+    value = contract['start'] - step if contract['start'] - step >= 0 else contract['start']
+    
+    for _ in range(max_pages):
+        try:
+            with throttle.slot(contract['url']) if throttle else nullcontext():
+                response = request_page(fetcher, contract, value)
+            found = canonical_links(links_in_payload(response.text, contract['referer']), link_filter)
+        except Exception as e:
+            if value < contract['start']:
+                value += step
+                continue
+            print(f"  Listing endpoint failed: {e}")
+            found = []
+        
+        new_links = [link for link in found if link not in links]
+        
+        if not new_links:
+            # Nothing on the recorded page itself means the contract changed
+            if value == contract['start'] and not links:
+                return None
+            if value >= contract['start']:
+                break
+        
+        for link in new_links:
+            links[link] = True
+        if max_items and len(links) >= max_items:
+            break
+        
+        value += step
+    
+    return list(links)[:max_items] if max_items else list(links)
+
+def page_param_label(contract):
+    """Short description of a contract for log output"""
+    return f"{contract['method']} {contract['url']} ({contract['page_param']} += {contract['step']})"